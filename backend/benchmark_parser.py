@@ -0,0 +1,320 @@
+"""
+Benchmarks for ResumeParser
+
+    extraction - replicates the bundled sample PDF into a large bundle and
+                 reports pages/sec for different worker counts
+    skills     - compares the compiled skill matcher with the old
+                 per-skill substring loop at several taxonomy sizes
+    fields     - compares the precompiled field extraction engine with the
+                 old per-call regex extraction over 10k sample pages
+    cache      - uploads the same bundle twice through a parsed-resume cache
+    profiles   - pages/sec and skill/experience parity of each text
+                 extraction profile against the default one
+
+Usage:
+    python benchmark_parser.py extraction --pages 2000 --workers 1,2,4,8
+    python benchmark_parser.py skills --sizes 60,1000,5000
+    python benchmark_parser.py fields --pages 10000
+    python benchmark_parser.py cache --pages 3000
+    python benchmark_parser.py profiles --pages 2000
+"""
+
+import os
+import re
+import random
+import argparse
+import tempfile
+import time
+
+import fitz  # PyMuPDF
+
+from resume_parser import ResumeParser, EXTRACTION_PROFILES
+from resume_cache import ParsedResumeCache
+from skill_matcher import SkillMatcher, load_taxonomy, DEFAULT_TAXONOMY_PATH
+
+SAMPLE_PDF = os.path.join(os.path.dirname(__file__), "..", "data", "full_stack_resumes.pdf")
+
+
+def build_bundle(pages: int, output_path: str, unique: bool = False) -> str:
+    """Replicate the sample PDF until the bundle has the requested page count"""
+    with fitz.open(SAMPLE_PDF) as sample:
+        bundle = fitz.open()
+        while len(bundle) < pages:
+            remaining = pages - len(bundle)
+            bundle.insert_pdf(sample, to_page=min(len(sample), remaining) - 1)
+
+        if unique:
+            # Stamp every page so no two pages share content
+            for page in bundle:
+                page.insert_text((20, 20), f"Ref {page.number + 1}", fontsize=6)
+
+        bundle.save(output_path)
+        bundle.close()
+
+    return output_path
+
+
+def benchmark_workers(pdf_path: str, worker_counts, work_dir: str):
+    """Time a full extraction for each worker count"""
+    print(f"\n{'workers':>8} {'pages':>8} {'resumes':>8} {'seconds':>9} {'pages/sec':>10}")
+
+    for workers in worker_counts:
+        parser = ResumeParser(
+            os.path.join(work_dir, "uploads"),
+            os.path.join(work_dir, f"resumes_{workers}"),
+            workers=workers
+        )
+        parser.start_workers()
+        parser.extract_resumes_from_pdf(pdf_path)
+        parser.close()
+        stats = parser.last_extraction_stats
+
+        print(
+            f"{stats['workers']:>8} {stats['pages']:>8} {stats['resumes']:>8} "
+            f"{stats['seconds']:>9.2f} {stats['pages_per_second']:>10.1f}"
+        )
+
+
+def synthetic_taxonomy(size: int, seed: int = 42):
+    """Pad the real taxonomy with made-up skill names up to the given size"""
+    taxonomy = load_taxonomy(DEFAULT_TAXONOMY_PATH)[:size]
+    rng = random.Random(seed)
+    syllables = ["ka", "lo", "ri", "zen", "tra", "mo", "vex", "qu", "dor", "pli", "sta", "nu"]
+    seen = {canonical.lower() for canonical, _ in taxonomy}
+
+    while len(taxonomy) < size:
+        words = [
+            "".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))).capitalize()
+            for _ in range(rng.randint(1, 2))
+        ]
+        name = " ".join(words)
+        if name.lower() not in seen:
+            seen.add(name.lower())
+            taxonomy.append((name, []))
+
+    return taxonomy
+
+
+def legacy_extract_skills(skills, text: str):
+    """The per-skill substring loop ResumeParser used before SkillMatcher"""
+    text_lower = text.lower()
+    return [skill for skill in skills if skill.lower() in text_lower]
+
+
+def benchmark_skills(sizes, repeat: int):
+    """Time both skill extractors over the sample pages"""
+    with fitz.open(SAMPLE_PDF) as doc:
+        pages = [page.get_text() for page in doc] * repeat
+
+    print(f"\n{'skills':>8} {'build ms':>9} {'loop pages/s':>13} {'matcher pages/s':>16} {'speedup':>8}")
+
+    for size in sizes:
+        taxonomy = synthetic_taxonomy(size)
+        names = [canonical for canonical, _ in taxonomy]
+
+        start = time.perf_counter()
+        matcher = SkillMatcher(taxonomy)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        for text in pages:
+            legacy_extract_skills(names, text)
+        loop_rate = len(pages) / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for text in pages:
+            matcher.find_skills(text)
+        matcher_rate = len(pages) / (time.perf_counter() - start)
+
+        print(
+            f"{size:>8} {build_ms:>9.1f} {loop_rate:>13.0f} {matcher_rate:>16.0f} "
+            f"{matcher_rate / loop_rate:>7.1f}x"
+        )
+
+
+def legacy_extract_fields(skills, text: str):
+    """Name, email, skills and experience as ResumeParser extracted them before"""
+    name = "Unknown"
+    for line in text.split('\n')[:5]:
+        line = line.strip()
+        if line and len(line.split()) <= 4 and line[0].isupper():
+            if not any(k in line.lower() for k in ['resume', 'cv', 'curriculum', 'vitae', 'page']):
+                name = line
+                break
+
+    emails = re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text)
+
+    experience = None
+    for pattern in [
+        r'(\d+)\+?\s*years?\s+(?:of\s+)?experience',
+        r'experience[:\s]+(\d+)\+?\s*years?',
+        r'(\d+)\+?\s*yrs?\s+(?:of\s+)?experience',
+    ]:
+        matches = re.findall(pattern, text.lower())
+        if matches:
+            experience = int(matches[0])
+            break
+
+    return {
+        "name": name,
+        "email": emails[0] if emails else None,
+        "skills": legacy_extract_skills(skills, text),
+        "experience": experience
+    }
+
+
+def benchmark_fields(pages: int):
+    """Time full field extraction over the sample pages replicated to N pages"""
+    with fitz.open(SAMPLE_PDF) as doc:
+        sample = [page.get_text() for page in doc]
+    texts = (sample * (pages // len(sample) + 1))[:pages]
+
+    skills = [canonical for canonical, _ in load_taxonomy(DEFAULT_TAXONOMY_PATH)]
+    parser = ResumeParser(tempfile.gettempdir(), tempfile.gettempdir())
+    parser.extract_fields(texts[0])  # build the skill matcher outside the timing
+
+    start = time.perf_counter()
+    for text in texts:
+        legacy_extract_fields(skills, text)
+    legacy_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for text in texts:
+        parser.extract_fields(text)
+    engine_seconds = time.perf_counter() - start
+
+    mismatched = sum(
+        1 for text in sample
+        if {k: v for k, v in legacy_extract_fields(skills, text).items() if k != "skills"}
+        != {k: v for k, v in parser.extract_fields(text).items() if k != "skills"}
+    )
+
+    print(f"\n{'extractor':>10} {'pages':>8} {'seconds':>9} {'pages/sec':>10}")
+    print(f"{'legacy':>10} {len(texts):>8} {legacy_seconds:>9.2f} {len(texts) / legacy_seconds:>10.0f}")
+    print(f"{'engine':>10} {len(texts):>8} {engine_seconds:>9.2f} {len(texts) / engine_seconds:>10.0f}")
+    print(f"Speedup: {legacy_seconds / engine_seconds:.1f}x, "
+          f"name/email/experience mismatches on sample pages: {mismatched}")
+
+
+def benchmark_cache(pdf_path: str, work_dir: str):
+    """Extract the same bundle cold and then warm through a fresh cache"""
+    cache = ParsedResumeCache(os.path.join(work_dir, "parsed_resumes.sqlite"))
+    parser = ResumeParser(
+        os.path.join(work_dir, "uploads"),
+        os.path.join(work_dir, "resumes"),
+        cache=cache
+    )
+
+    print(f"\n{'upload':>8} {'pages':>8} {'cached':>8} {'seconds':>9} {'pages/sec':>10}")
+
+    for label in ("cold", "warm"):
+        parser.extract_resumes_from_pdf(pdf_path)
+        stats = parser.last_extraction_stats
+        print(
+            f"{label:>8} {stats['pages']:>8} {stats['cache_hits']:>8} "
+            f"{stats['seconds']:>9.2f} {stats['pages_per_second']:>10.1f}"
+        )
+
+    print(f"Cache: {cache.stats()}")
+
+
+def benchmark_profiles(pdf_path: str, work_dir: str):
+    """Compare extraction profiles for speed and for parity with 'default'"""
+    results = {}
+
+    for profile in EXTRACTION_PROFILES:
+        parser = ResumeParser(
+            os.path.join(work_dir, "uploads"),
+            os.path.join(work_dir, "resumes"),
+            extraction_profile=profile
+        )
+
+        with fitz.open(pdf_path) as doc:
+            start = time.perf_counter()
+            texts = [parser.extract_page_text(page) for page in doc]
+            text_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        fields = [parser.parse_page_text(text) for text in texts]
+        parse_seconds = time.perf_counter() - start
+
+        results[profile] = (len(texts), text_seconds, parse_seconds, fields)
+
+    baseline = results["default"][3]
+
+    print(f"\n{'profile':>10} {'text pages/s':>13} {'total pages/s':>14} {'skill recall':>13} "
+          f"{'extra skills':>13} {'exp parity':>11}")
+
+    for profile, (pages, text_seconds, parse_seconds, fields) in results.items():
+        expected = found = extra = same_experience = compared = 0
+
+        for base, other in zip(baseline, fields):
+            if not base:
+                continue
+            compared += 1
+            other = other or {"skills": [], "experience": None}
+            expected += len(base["skills"])
+            found += len(set(base["skills"]) & set(other["skills"]))
+            extra += len(set(other["skills"]) - set(base["skills"]))
+            same_experience += base["experience"] == other["experience"]
+
+        print(
+            f"{profile:>10} {pages / text_seconds:>13.0f} {pages / (text_seconds + parse_seconds):>14.0f} "
+            f"{found / expected if expected else 1.0:>13.3f} {extra:>13} "
+            f"{same_experience / compared if compared else 1.0:>11.3f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark resume parsing")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    extraction = subparsers.add_parser("extraction", help="PDF extraction pages/sec")
+    extraction.add_argument("--pages", type=int, default=2000, help="Pages in the generated bundle")
+    extraction.add_argument("--workers", default="1,2,4", help="Comma-separated worker counts")
+
+    skills = subparsers.add_parser("skills", help="Skill matcher vs substring loop")
+    skills.add_argument("--sizes", default="60,1000,5000", help="Comma-separated taxonomy sizes")
+    skills.add_argument("--repeat", type=int, default=50, help="Times to repeat the sample pages")
+
+    fields = subparsers.add_parser("fields", help="Field extraction engine vs per-call regexes")
+    fields.add_argument("--pages", type=int, default=10000, help="Pages of sample text to extract")
+
+    cache = subparsers.add_parser("cache", help="Cold vs warm upload through the parse cache")
+    cache.add_argument("--pages", type=int, default=3000, help="Pages in the generated bundle")
+
+    profiles = subparsers.add_parser("profiles", help="Compare text extraction profiles")
+    profiles.add_argument("--pages", type=int, default=2000, help="Pages in the generated bundle")
+
+    args = parser.parse_args()
+
+    if args.benchmark == "profiles":
+        with tempfile.TemporaryDirectory() as work_dir:
+            pdf_path = build_bundle(args.pages, os.path.join(work_dir, "bundle.pdf"))
+            benchmark_profiles(pdf_path, work_dir)
+        return
+
+    if args.benchmark == "cache":
+        with tempfile.TemporaryDirectory() as work_dir:
+            pdf_path = build_bundle(args.pages, os.path.join(work_dir, "bundle.pdf"), unique=True)
+            benchmark_cache(pdf_path, work_dir)
+        return
+
+    if args.benchmark == "fields":
+        benchmark_fields(args.pages)
+        return
+
+    if args.benchmark == "skills":
+        benchmark_skills([int(n) for n in args.sizes.split(",") if n.strip()], args.repeat)
+        return
+
+    worker_counts = [int(w) for w in args.workers.split(",") if w.strip()]
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        pdf_path = build_bundle(args.pages, os.path.join(work_dir, "bundle.pdf"))
+        print(f"Built {args.pages}-page bundle from {os.path.basename(SAMPLE_PDF)}")
+        benchmark_workers(pdf_path, worker_counts, work_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,449 @@
+"""
+Benchmarks for Phase1Shortlister
+
+    scoring   - per-resume calculate_score loop vs the vectorised batch
+                scorer, checking both produce the same ranking; also with
+                and without precomputed resume features
+    selection - full sort and filter passes vs top-k selection of the
+                shortlist, checking both return the same resumes
+    index     - scoring the whole pool vs querying the skill/experience
+                index, for a job with common skills and one with rare skills
+    jobs      - one shortlist() per job vs shortlist_many() over the same
+                pool, checking both return the same shortlists
+    bm25      - appending a batch of resumes to a BM25 index vs rebuilding
+                it, and scoring a job description against the pool
+    semantic  - recall@k and query time of the semantic prefilter index vs
+                an exact scan, on resumes clustered by role; also encoding,
+                incremental adds and a save/load round trip
+
+Usage:
+    python benchmark_phase1.py scoring --sizes 1000,100000,1000000
+    python benchmark_phase1.py selection --sizes 100000 --top 50
+    python benchmark_phase1.py index --sizes 10000,100000,1000000
+    python benchmark_phase1.py jobs --sizes 100000 --jobs 50
+    python benchmark_phase1.py bm25 --sizes 100000 --batch 500
+    python benchmark_phase1.py semantic --sizes 10000,100000 --top 500
+"""
+
+import os
+import random
+import argparse
+import tempfile
+import time
+from typing import List, Optional
+
+import numpy as np
+
+from models import Resume, ResumeFeatures, JobPosting
+from phase1_shortlister import Phase1Shortlister, ResumeMatrix
+from resume_index import ResumeIndex
+from bm25 import BM25Index, term_counts
+from semantic_index import HashedNgramEncoder, SemanticIndex
+from skill_matcher import load_taxonomy, get_skill_matcher, DEFAULT_TAXONOMY_PATH
+
+
+def generate_resumes(count: int, seed: int = 7, features: bool = True) -> List[Resume]:
+    """
+    Synthetic resume pool with skewed skill popularity and experience; with
+    features, resumes carry the ResumeFeatures the parser would compute
+    """
+    rng = random.Random(seed)
+    skills = [canonical for canonical, _ in load_taxonomy(DEFAULT_TAXONOMY_PATH)]
+    matcher = get_skill_matcher(DEFAULT_TAXONOMY_PATH)
+    weights = [1.0 / (rank + 1) for rank in range(len(skills))]
+
+    resumes = []
+    for i in range(count):
+        resume_skills = sorted(set(rng.choices(skills, weights=weights, k=rng.randint(3, 12))))
+        experience = None if rng.random() < 0.2 else rng.randint(0, 15)
+        # model_construct skips validation, which would dominate at 1M resumes
+        resumes.append(Resume.model_construct(
+            name=f"Candidate {i}",
+            email=f"candidate{i}@example.com",
+            skills=resume_skills,
+            experience=experience,
+            cv_path=f"synthetic.pdf#page={i + 1}",
+            text_content=None,
+            text_ref=None,
+            features=ResumeFeatures.model_construct(
+                skill_ids=matcher.skill_ids(resume_skills),
+                experience=experience,
+                fingerprint=f"{i:016x}"
+            ) if features else None
+        ))
+
+    return resumes
+
+
+def legacy_ranking(shortlister: Phase1Shortlister, resumes: List[Resume], job_posting: JobPosting):
+    """Score every resume with calculate_score and sort, as shortlist() used to"""
+    scored = [(i, shortlister.calculate_score(resume, job_posting)) for i, resume in enumerate(resumes)]
+    scored.sort(key=lambda x: x[1], reverse=True)
+    return scored
+
+
+def legacy_shortlist(resumes: List[Resume], scores, job_posting: JobPosting, target_count: int) -> List[Resume]:
+    """Sort every scored resume, then filter and backfill, as shortlist() used to"""
+    scored_resumes = sorted(zip(resumes, scores.tolist()), key=lambda x: x[1], reverse=True)
+
+    filtered_resumes = [
+        (resume, score) for resume, score in scored_resumes
+        if resume.experience is not None and resume.experience >= job_posting.minimum_experience
+    ]
+    if len(filtered_resumes) < target_count:
+        filtered_resumes.extend(
+            (resume, score) for resume, score in scored_resumes if resume.experience is None
+        )
+
+    return [resume for resume, score in filtered_resumes[:target_count]]
+
+
+def benchmark_job(minimum_experience: int = 3, top: int = 50, skills: Optional[List[str]] = None) -> JobPosting:
+    return JobPosting(
+        job_title="Full Stack Developer",
+        description="Benchmark job",
+        required_tech_stack=skills or ["Python", "React", "Node.js", "Docker", "AWS", "PostgreSQL"],
+        minimum_experience=minimum_experience,
+        hiring_slots=2,
+        phase1_shortlist_count=top,
+        phase2_shortlist_count=10
+    )
+
+
+def benchmark_scoring(sizes: List[int]):
+    shortlister = Phase1Shortlister()
+    job_posting = benchmark_job()
+
+    print(
+        f"\n{'resumes':>9} {'loop s':>8} {'loop (features) s':>18} {'encode s':>9} "
+        f"{'encode (features) s':>20} {'batch s':>8} {'speedup':>8} {'same ranking':>13}"
+    )
+
+    for size in sizes:
+        plain_resumes = generate_resumes(size, features=False)
+        resumes = generate_resumes(size)
+
+        start = time.perf_counter()
+        legacy = legacy_ranking(shortlister, plain_resumes, job_posting)
+        loop_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        legacy_ranking(shortlister, resumes, job_posting)
+        features_loop_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        ResumeMatrix(plain_resumes)
+        encode_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        matrix = ResumeMatrix(resumes)
+        features_encode_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        scores = shortlister.score_batch(matrix, job_posting)
+        order = (-scores).argsort(kind="stable")
+        batch_seconds = time.perf_counter() - start
+
+        same = [i for i, _ in legacy] == order.tolist() and all(
+            score == scores[i] for i, score in legacy
+        )
+
+        print(
+            f"{size:>9} {loop_seconds:>8.3f} {features_loop_seconds:>18.3f} {encode_seconds:>9.3f} "
+            f"{features_encode_seconds:>20.3f} {batch_seconds:>8.4f} {loop_seconds / batch_seconds:>7.0f}x {str(same):>13}"
+        )
+
+
+def benchmark_selection(sizes: List[int], top: int):
+    shortlister = Phase1Shortlister()
+
+    print(f"\n{'resumes':>9} {'min exp':>8} {'sort s':>8} {'top-k s':>8} {'speedup':>8} {'same result':>12}")
+
+    for size in sizes:
+        resumes = generate_resumes(size)
+        matrix = ResumeMatrix(resumes)
+
+        # 20 years is above every synthetic resume, which exercises the backfill
+        for minimum_experience in (0, 3, 20):
+            job_posting = benchmark_job(minimum_experience, top)
+            scores = shortlister.score_batch(matrix, job_posting)
+
+            start = time.perf_counter()
+            expected = legacy_shortlist(resumes, scores, job_posting, top)
+            sort_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            shortlisted = shortlister.shortlist(resumes, job_posting, top, matrix=matrix)
+            # shortlist() also scores; only time the selection
+            topk_seconds = time.perf_counter() - start
+            start = time.perf_counter()
+            shortlister.score_batch(matrix, job_posting)
+            topk_seconds -= time.perf_counter() - start
+
+            same = [id(r) for r in shortlisted] == [id(r) for r in expected]
+
+            print(
+                f"{size:>9} {minimum_experience:>8} {sort_seconds:>8.3f} {topk_seconds:>8.4f} "
+                f"{sort_seconds / max(topk_seconds, 1e-6):>7.0f}x {str(same):>12}"
+            )
+
+
+def benchmark_index(sizes: List[int], top: int):
+    shortlister = Phase1Shortlister()
+    taxonomy = [canonical for canonical, _ in load_taxonomy(DEFAULT_TAXONOMY_PATH)]
+    # generate_resumes favours skills early in the taxonomy
+    jobs = {
+        "common": benchmark_job(3, top, taxonomy[:6]),
+        "rare": benchmark_job(3, top, taxonomy[-3:])
+    }
+
+    print(f"\n{'resumes':>9} {'job':>7} {'matches':>8} {'matrix s':>9} {'index s':>8} {'speedup':>8} {'same result':>12}")
+
+    for size in sizes:
+        resumes = generate_resumes(size)
+        matrix = ResumeMatrix(resumes)
+        index = ResumeIndex(resumes)
+
+        for name, job_posting in jobs.items():
+            start = time.perf_counter()
+            expected = shortlister.shortlist(resumes, job_posting, top, matrix=matrix)
+            matrix_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            shortlisted = shortlister.shortlist_indexed(index, job_posting, top)
+            index_seconds = time.perf_counter() - start
+
+            matches = len({
+                resume_id
+                for skill in job_posting.required_tech_stack
+                for resume_id in index.skill_postings.get(skill.lower(), ())
+            })
+            same = [id(r) for r in shortlisted] == [id(r) for r in expected]
+
+            print(
+                f"{size:>9} {name:>7} {matches:>8} {matrix_seconds:>9.4f} {index_seconds:>8.4f} "
+                f"{matrix_seconds / max(index_seconds, 1e-6):>7.1f}x {str(same):>12}"
+            )
+
+
+def generate_jobs(count: int, seed: int = 11) -> List[JobPosting]:
+    """Job postings with 3-8 required skills and 0-8 years minimum experience"""
+    rng = random.Random(seed)
+    skills = [canonical for canonical, _ in load_taxonomy(DEFAULT_TAXONOMY_PATH)]
+
+    return [
+        benchmark_job(rng.randint(0, 8), 50, rng.sample(skills, rng.randint(3, 8)))
+        for _ in range(count)
+    ]
+
+
+def benchmark_jobs(sizes: List[int], job_count: int):
+    shortlister = Phase1Shortlister()
+    job_postings = generate_jobs(job_count)
+
+    print(f"\n{'resumes':>9} {'jobs':>5} {'per-job s':>10} {'batch s':>8} {'speedup':>8} {'same result':>12}")
+
+    for size in sizes:
+        resumes = generate_resumes(size)
+        matrix = ResumeMatrix(resumes)
+
+        start = time.perf_counter()
+        expected = [
+            shortlister.shortlist(resumes, job_posting, job_posting.phase1_shortlist_count, matrix=matrix)
+            for job_posting in job_postings
+        ]
+        per_job_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        shortlists = shortlister.shortlist_many(resumes, job_postings, matrix=matrix)
+        batch_seconds = time.perf_counter() - start
+
+        same = all(
+            [id(resume) for resume, _ in shortlist] == [id(resume) for resume in job_expected]
+            for shortlist, job_expected in zip(shortlists, expected)
+        )
+
+        print(
+            f"{size:>9} {job_count:>5} {per_job_seconds:>10.3f} {batch_seconds:>8.3f} "
+            f"{per_job_seconds / batch_seconds:>7.1f}x {str(same):>12}"
+        )
+
+
+FILLER_WORDS = (
+    "built scalable services for the platform team and led migrations to the cloud, "
+    "designed data pipelines, mentored engineers, improved test coverage and reliability, "
+    "owned frontend and backend features, apis, dashboards, monitoring and deployments"
+).replace(",", "").split()
+
+
+def synthetic_text(resume: Resume, rng: random.Random) -> str:
+    """Resume-like text: the resume's skills among 150-400 filler words"""
+    words = rng.choices(FILLER_WORDS, k=rng.randint(150, 400)) + resume.skills * 2
+    rng.shuffle(words)
+    return " ".join(words)
+
+
+def benchmark_bm25(sizes: List[int], batch: int):
+    rng = random.Random(3)
+    description = "Python and React engineer to build cloud data pipelines and mentor the frontend team"
+
+    print(f"\n{'resumes':>9} {'batch':>6} {'tokenize s':>11} {'append s':>9} {'rebuild s':>10} {'query s':>8} {'same scores':>12}")
+
+    for size in sizes:
+        resumes = generate_resumes(size + batch)
+        documents = [term_counts(synthetic_text(resume, rng)) for resume in resumes[:size]]
+
+        index = BM25Index()
+        index.add(documents)
+
+        start = time.perf_counter()
+        new_documents = [term_counts(synthetic_text(resume, rng)) for resume in resumes[size:]]
+        tokenize_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        index.add(new_documents)
+        append_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        rebuilt = BM25Index()
+        rebuilt.add(documents + new_documents)
+        rebuild_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        scores = index.score(description)
+        query_seconds = time.perf_counter() - start
+
+        same = bool((scores == rebuilt.score(description)).all())
+
+        print(
+            f"{size:>9} {batch:>6} {tokenize_seconds:>11.3f} {append_seconds:>9.4f} "
+            f"{rebuild_seconds:>10.3f} {query_seconds:>8.4f} {str(same):>12}"
+        )
+
+
+def role_corpus(count: int, query_count: int, roles: int = 8, seed: int = 5):
+    """
+    Resume texts and job queries drawn from role families (groups of related
+    skills), so resumes have real nearest neighbours; skills are written as
+    one of their aliases half the time
+    """
+    rng = random.Random(seed)
+    taxonomy = load_taxonomy(DEFAULT_TAXONOMY_PATH)
+    names = [[canonical] + aliases for canonical, aliases in taxonomy]
+    rng.shuffle(names)
+    families = [names[i::roles] for i in range(roles)]
+
+    def spelled(skill_names: List[str]) -> str:
+        return skill_names[0] if len(skill_names) == 1 or rng.random() < 0.5 else rng.choice(skill_names[1:])
+
+    texts = []
+    for _ in range(count):
+        family = rng.choice(families)
+        skills = rng.sample(family, rng.randint(3, min(7, len(family)))) + rng.sample(names, rng.randint(0, 3))
+        words = rng.choices(FILLER_WORDS, k=rng.randint(150, 400)) + [spelled(skill) for skill in skills] * 2
+        rng.shuffle(words)
+        texts.append(" ".join(words))
+
+    queries = []
+    for _ in range(query_count):
+        skills = rng.sample(rng.choice(families), 4)
+        queries.append("Engineer to join the platform team. Required: " + ", ".join(skill[0] for skill in skills))
+
+    return texts, queries
+
+
+def benchmark_semantic(sizes: List[int], top: int, query_count: int = 50):
+    encoder = HashedNgramEncoder()
+
+    print(
+        f"\n{'resumes':>9} {'top':>5} {'encode s':>9} {'add s':>7} {'save+load s':>12} {'scanned':>8} "
+        f"{'exact ms':>9} {'ann ms':>7} {'speedup':>8} {f'recall@{top}':>11}"
+    )
+
+    for size in sizes:
+        texts, queries = role_corpus(size, query_count)
+
+        start = time.perf_counter()
+        vectors = encoder.encode_many(texts)
+        encode_seconds = time.perf_counter() - start
+
+        # Added in upload-sized batches, so clusters are retrained as the pool grows
+        start = time.perf_counter()
+        index = SemanticIndex(encoder.dim)
+        for i in range(0, size, 1000):
+            index.add(vectors[i:i + 1000])
+        add_seconds = time.perf_counter() - start
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "index.npz")
+            start = time.perf_counter()
+            index.save(path)
+            index = SemanticIndex.load(path)
+            save_load_seconds = time.perf_counter() - start
+
+        query_vectors = encoder.encode_many(queries)
+
+        start = time.perf_counter()
+        expected = [index.exact(vector, top)[0] for vector in query_vectors]
+        exact_seconds = (time.perf_counter() - start) / query_count
+
+        start = time.perf_counter()
+        found = [index.query(vector, top)[0] for vector in query_vectors]
+        ann_seconds = (time.perf_counter() - start) / query_count
+
+        recall = sum(len(np.intersect1d(a, b)) for a, b in zip(found, expected)) / (top * query_count)
+        scanned = sum(len(index.candidates(vector)) for vector in query_vectors) / (query_count * size)
+
+        print(
+            f"{size:>9} {top:>5} {encode_seconds:>9.2f} {add_seconds:>7.2f} {save_load_seconds:>12.3f} "
+            f"{scanned:>7.1%} {exact_seconds * 1000:>9.2f} {ann_seconds * 1000:>7.2f} "
+            f"{exact_seconds / ann_seconds:>7.1f}x {recall:>11.3f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Phase 1 shortlisting")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    scoring = subparsers.add_parser("scoring", help="Per-resume loop vs batch scoring")
+    scoring.add_argument("--sizes", default="1000,100000,1000000", help="Comma-separated pool sizes")
+
+    selection = subparsers.add_parser("selection", help="Full sort vs top-k shortlist selection")
+    selection.add_argument("--sizes", default="1000,100000", help="Comma-separated pool sizes")
+    selection.add_argument("--top", type=int, default=50, help="Shortlist size")
+
+    index = subparsers.add_parser("index", help="Whole-pool scoring vs inverted index queries")
+    index.add_argument("--sizes", default="10000,100000,1000000", help="Comma-separated pool sizes")
+    index.add_argument("--top", type=int, default=50, help="Shortlist size")
+
+    jobs = subparsers.add_parser("jobs", help="Per-job shortlists vs one batched jobs x resumes run")
+    jobs.add_argument("--sizes", default="10000,100000", help="Comma-separated pool sizes")
+    jobs.add_argument("--jobs", type=int, default=50, help="Number of job postings")
+
+    bm25 = subparsers.add_parser("bm25", help="Incremental BM25 postings vs a rebuild")
+    bm25.add_argument("--sizes", default="10000,100000", help="Comma-separated pool sizes")
+    bm25.add_argument("--batch", type=int, default=500, help="Resumes added to the pool")
+
+    semantic = subparsers.add_parser("semantic", help="Semantic prefilter recall and query time vs exact scan")
+    semantic.add_argument("--sizes", default="10000,100000", help="Comma-separated pool sizes")
+    semantic.add_argument("--top", type=int, default=500, help="Resumes kept by the prefilter")
+
+    args = parser.parse_args()
+    sizes = [int(n) for n in args.sizes.split(",") if n.strip()]
+
+    if args.benchmark == "scoring":
+        benchmark_scoring(sizes)
+    elif args.benchmark == "selection":
+        benchmark_selection(sizes, args.top)
+    elif args.benchmark == "index":
+        benchmark_index(sizes, args.top)
+    elif args.benchmark == "jobs":
+        benchmark_jobs(sizes, args.jobs)
+    elif args.benchmark == "bm25":
+        benchmark_bm25(sizes, args.batch)
+    elif args.benchmark == "semantic":
+        benchmark_semantic(sizes, args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,436 @@
+"""
+Benchmarks for Phase2Shortlister
+
+    concurrency - reviews a generated candidate pool against a local stub
+                  of the Ollama API (fixed latency, a limited number of
+                  requests served in parallel, a few failing requests) with
+                  different max_concurrency settings, checking every run
+                  returns the same reviews and ranking as the sequential one
+    cache       - the same review run cold, again, and again after a
+                  restart (a new cache over the same file), through an
+                  LLMReviewCache
+    early-stop  - reviewing every candidate vs stopping once the target
+                  count reach a confidence bar: LLM calls, time, and how
+                  much of the full run's shortlist is kept
+    batch       - one candidate per LLM call vs several per prompt sharing
+                  the job description, against a stub whose latency grows
+                  with the prompt and the verdicts generated; truncates a
+                  share of batched answers to exercise the fallback to
+                  single reviews
+    streaming   - waiting for whole answers vs streaming them and stopping
+                  generation at a negative verdict (or a confidence below a
+                  cutoff), against a stub that generates token by token
+
+Usage:
+    python benchmark_phase2.py concurrency --candidates 50 --latency 0.2 --levels 1,2,4,8 --slots 4
+    python benchmark_phase2.py cache --candidates 50 --latency 0.2
+    python benchmark_phase2.py early-stop --candidates 100 --thresholds 0.9,0.8,0.7
+    python benchmark_phase2.py batch --candidates 48 --sizes 1,2,4,8 --prompt-cost 0.1 --verdict-cost 0.05
+    python benchmark_phase2.py streaming --candidates 50 --token-latency 0.005 --cutoffs 0.5
+"""
+
+import io
+import os
+import re
+import json
+import time
+import zlib
+import asyncio
+import argparse
+import tempfile
+import contextlib
+from typing import List, Optional
+
+import httpx
+
+from phase2_shortlister import Phase2Shortlister
+from resume_cache import LLMReviewCache
+from benchmark_suite import profile_resumes, suite_jobs
+from generate_corpus import generate_profiles, page_text
+
+
+STUB_REASONING = (
+    "The candidate's listed skills and stated experience were compared with the required stack "
+    "and the minimum experience of the role."
+)
+STUB_COVER_LETTER = (
+    "I am excited to apply for this role. My experience building and running production systems with "
+    "the technologies in your stack has prepared me to contribute from day one, and I would welcome "
+    "the chance to discuss how I can help your team."
+)
+
+
+def stub_verdicts(prompt: str) -> List[dict]:
+    """
+    The stub's verdict on each candidate of a prompt; a fixed function of
+    the candidate's name and email, so it is the same alone or in a batch
+    """
+    verdicts = []
+    for number, (name, email) in enumerate(re.findall(r"^Name: (.*)\nEmail: (.*)$", prompt, re.MULTILINE), 1):
+        digest = zlib.crc32(f"{name} {email}".encode("utf-8"))
+        verdicts.append({
+            "candidate": number,
+            "is_suitable": digest % 3 != 0,
+            "confidence": round((digest % 100) / 100, 2),
+            "reasoning": STUB_REASONING,
+            "cover_letter": STUB_COVER_LETTER
+        })
+    return verdicts
+
+
+def stub_ollama(
+    latency: float,
+    slots: int,
+    failure_rate: float = 0.05,
+    prompt_cost: float = 0.0,
+    verdict_cost: float = 0.0,
+    malformed_rate: float = 0.0
+):
+    """
+    ASGI app answering /api/generate like Ollama, at most slots requests at
+    a time. A request takes latency seconds, plus prompt_cost per 1000
+    prompt characters (prompt evaluation) and verdict_cost per candidate in
+    it (generation).
+
+    Verdicts come from stub_verdicts. Batched prompts are
+    answered with {"candidates": [...]}, or with a truncated answer for a
+    malformed_rate share of them; a failure_rate share of the prompts get an
+    HTTP 500. app.state counts the requests served and their prompt characters.
+    """
+    state = {"requests": 0, "prompt_chars": 0}
+
+    async def app(scope, receive, send):
+        if scope["type"] != "http":
+            return
+
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+
+        prompt = json.loads(body)["prompt"]
+        digest = zlib.crc32(prompt.encode("utf-8"))
+        state["requests"] += 1
+        state["prompt_chars"] += len(prompt)
+
+        # Created on first use, so it belongs to the running event loop
+        semaphore = state.setdefault("semaphore", asyncio.Semaphore(slots))
+        async with semaphore:
+            await asyncio.sleep(latency + prompt_cost * len(prompt) / 1000 + verdict_cost * prompt.count("\nEmail: "))
+
+        verdicts = stub_verdicts(prompt)
+
+        if digest % 1000 < failure_rate * 1000:
+            status, payload = 500, {"error": "model runner crashed"}
+        elif "\nCandidate 1:\n" not in prompt:
+            verdict = {key: value for key, value in verdicts[0].items() if key != "candidate"}
+            status, payload = 200, {"response": json.dumps(verdict)}
+        elif (digest // 1000) % 1000 < malformed_rate * 1000:
+            status, payload = 200, {"response": json.dumps({"candidates": verdicts})[:-20]}
+        else:
+            status, payload = 200, {"response": json.dumps({"candidates": verdicts})}
+
+        await send({"type": "http.response.start", "status": status,
+                    "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": json.dumps(payload).encode()})
+
+    app.state = state
+    return app
+
+
+class StubStreamingOllama(httpx.AsyncBaseTransport):
+    """
+    httpx transport answering single-candidate /api/generate requests like
+    Ollama, generating the answer chars_per_token characters at a time:
+    latency seconds of prompt evaluation, then token_latency per token.
+    Streamed answers are sent a token per NDJSON line as generated, and
+    generation stops when the client closes the response. stats counts the
+    requests and the characters generated.
+    """
+
+    def __init__(self, latency: float, token_latency: float, chars_per_token: int = 4):
+        self.latency = latency
+        self.token_latency = token_latency
+        self.chars_per_token = chars_per_token
+        self.stats = {"requests": 0, "generated_chars": 0}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(await request.aread())
+        verdict = {key: value for key, value in stub_verdicts(body["prompt"])[0].items() if key != "candidate"}
+        answer = json.dumps(verdict)
+        tokens = [answer[i:i + self.chars_per_token] for i in range(0, len(answer), self.chars_per_token)]
+        self.stats["requests"] += 1
+
+        if not body.get("stream"):
+            await asyncio.sleep(self.latency + self.token_latency * len(tokens))
+            self.stats["generated_chars"] += len(answer)
+            return httpx.Response(200, json={"response": answer, "done": True})
+
+        return httpx.Response(200, stream=_TokenStream(self, tokens))
+
+
+class _TokenStream(httpx.AsyncByteStream):
+    def __init__(self, transport: StubStreamingOllama, tokens: List[str]):
+        self.transport = transport
+        self.tokens = tokens
+
+    async def __aiter__(self):
+        await asyncio.sleep(self.transport.latency)
+        # Generation only goes on while the client reads the next line
+        for token in self.tokens:
+            await asyncio.sleep(self.transport.token_latency)
+            self.transport.stats["generated_chars"] += len(token)
+            yield (json.dumps({"response": token, "done": False}) + "\n").encode()
+        yield (json.dumps({"response": "", "done": True}) + "\n").encode()
+
+
+async def run_reviews(
+    app,
+    resumes,
+    job_posting,
+    concurrency: int,
+    cache: Optional[LLMReviewCache] = None,
+    early_stop_confidence: Optional[float] = None,
+    batch_size: int = 1,
+    stream: bool = False,
+    abort_confidence: Optional[float] = None
+):
+    """Review resumes through a stub app (ASGI) or transport; returns (seconds, reviews, ranking, skipped)"""
+    shortlister = Phase2Shortlister(
+        "http://ollama-stub", "stub-model",
+        max_concurrency=concurrency, cache=cache, early_stop_confidence=early_stop_confidence,
+        batch_size=batch_size, stream=stream, abort_confidence=abort_confidence
+    )
+    transport = app if isinstance(app, httpx.AsyncBaseTransport) else httpx.ASGITransport(app=app)
+    shortlister.client = httpx.AsyncClient(transport=transport, timeout=120.0)
+
+    try:
+        # Phase 2 logs every call; keep the benchmark output readable
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            reviews, skipped = await shortlister.review_many(
+                resumes, job_posting, stop_after=job_posting.phase2_shortlist_count
+            )
+            seconds = time.perf_counter() - start
+            ranking = shortlister.rank(list(reviews.values()), job_posting.phase2_shortlist_count)
+    finally:
+        await shortlister.client.aclose()
+
+    return seconds, reviews, ranking, skipped
+
+
+def benchmark_concurrency(candidates: int, latency: float, levels: List[int], slots: int):
+    resumes = profile_resumes(candidates, seed=7)
+    job_posting = suite_jobs()[0]
+
+    print(
+        f"\n{'in flight':>10} {'candidates':>11} {'server slots':>13} {'seconds':>8} "
+        f"{'reviews/s':>10} {'speedup':>8} {'failed':>7} {'same result':>12}"
+    )
+
+    baseline = None
+    for concurrency in levels:
+        seconds, reviews, ranking, _ = asyncio.run(
+            run_reviews(stub_ollama(latency, slots), resumes, job_posting, concurrency)
+        )
+        result = (list(reviews.items()), ranking)
+        if baseline is None:
+            baseline = (seconds, result)
+
+        print(
+            f"{concurrency:>10} {candidates:>11} {slots:>13} {seconds:>8.2f} {candidates / seconds:>10.1f} "
+            f"{baseline[0] / seconds:>7.1f}x {candidates - len(reviews):>7} {str(result == baseline[1]):>12}"
+        )
+
+
+def benchmark_cache(candidates: int, latency: float, concurrency: int):
+    resumes = profile_resumes(candidates, seed=7)
+    job_posting = suite_jobs()[0]
+
+    print(f"\n{'run':>14} {'candidates':>11} {'seconds':>8} {'hits':>5} {'misses':>7} {'hit rate':>9} {'same result':>12}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "llm_reviews.sqlite")
+        cache = LLMReviewCache(path)
+        baseline = None
+
+        for run in ("cold", "re-run", "after restart"):
+            if run == "after restart":
+                cache = LLMReviewCache(path)
+
+            app = stub_ollama(latency, concurrency, failure_rate=0)
+            seconds, reviews, ranking, _ = asyncio.run(run_reviews(app, resumes, job_posting, concurrency, cache))
+            result = (list(reviews.items()), ranking)
+            baseline = baseline or result
+            stats = cache.stats()
+
+            print(
+                f"{run:>14} {candidates:>11} {seconds:>8.3f} {stats['hits']:>5} {stats['misses']:>7} "
+                f"{stats['hit_rate']:>9.2f} {str(result == baseline):>12}"
+            )
+
+
+def benchmark_early_stop(candidates: int, latency: float, thresholds: List[float], concurrency: int):
+    resumes = profile_resumes(candidates, seed=7)
+    job_posting = suite_jobs()[0]
+    target = job_posting.phase2_shortlist_count
+
+    print(
+        f"\n{'threshold':>10} {'candidates':>11} {'target':>7} {'llm calls':>10} {'saved':>6} "
+        f"{'seconds':>8} {'speedup':>8} {'min confidence':>15} {'same as full':>13}"
+    )
+
+    baseline = None
+    for threshold in [None] + thresholds:
+        seconds, reviews, ranking, skipped = asyncio.run(run_reviews(
+            stub_ollama(latency, concurrency, failure_rate=0), resumes, job_posting, concurrency,
+            early_stop_confidence=threshold
+        ))
+        chosen = [candidate.cv_path for candidate in ranking.shortlisted]
+        if baseline is None:
+            baseline = (seconds, set(chosen))
+
+        lowest = min((candidate.confidence for candidate in ranking.shortlisted), default=0.0)
+        print(
+            f"{'off' if threshold is None else threshold:>10} {candidates:>11} {target:>7} "
+            f"{candidates - skipped:>10} {skipped:>6} {seconds:>8.2f} {baseline[0] / seconds:>7.1f}x "
+            f"{lowest:>15.2f} {len(baseline[1] & set(chosen)):>10}/{target}"
+        )
+
+
+def benchmark_batch(
+    candidates: int,
+    latency: float,
+    prompt_cost: float,
+    verdict_cost: float,
+    sizes: List[int],
+    concurrency: int,
+    malformed_rate: float
+):
+    resumes = profile_resumes(candidates, seed=7)
+    job_posting = suite_jobs()[0]
+
+    # Give the resumes their generated page text, so prompts are resume-sized
+    for resume, profile in zip(resumes, generate_profiles(candidates, seed=7)):
+        resume.text_content = "\n".join(text for _, text in page_text(profile))
+
+    print(
+        f"\n{'batch size':>11} {'candidates':>11} {'llm calls':>10} {'prompt chars':>13} {'seconds':>8} "
+        f"{'reviews/s':>10} {'speedup':>8} {'same result':>12}"
+    )
+
+    baseline = None
+    for batch_size in sizes:
+        app = stub_ollama(
+            latency, concurrency, failure_rate=0, prompt_cost=prompt_cost,
+            verdict_cost=verdict_cost, malformed_rate=malformed_rate
+        )
+        seconds, reviews, ranking, _ = asyncio.run(
+            run_reviews(app, resumes, job_posting, concurrency, batch_size=batch_size)
+        )
+        result = (list(reviews.items()), ranking)
+        if baseline is None:
+            baseline = (seconds, result)
+
+        print(
+            f"{batch_size:>11} {candidates:>11} {app.state['requests']:>10} {app.state['prompt_chars']:>13} {seconds:>8.2f} "
+            f"{candidates / seconds:>10.1f} {baseline[0] / seconds:>7.1f}x {str(result == baseline[1]):>12}"
+        )
+
+
+def benchmark_streaming(
+    candidates: int,
+    latency: float,
+    token_latency: float,
+    cutoffs: List[float],
+    concurrency: int
+):
+    resumes = profile_resumes(candidates, seed=7)
+    job_posting = suite_jobs()[0]
+
+    print(
+        f"\n{'mode':>22} {'candidates':>11} {'generated chars':>16} {'seconds':>8} "
+        f"{'speedup':>8} {'shortlisted':>12} {'same as full':>13}"
+    )
+
+    baseline = None
+    modes = [("no streaming", False, None), ("streaming", True, None)]
+    modes += [(f"streaming, cutoff {cutoff}", True, cutoff) for cutoff in cutoffs]
+
+    for label, stream, cutoff in modes:
+        transport = StubStreamingOllama(latency, token_latency)
+        seconds, reviews, ranking, _ = asyncio.run(run_reviews(
+            transport, resumes, job_posting, concurrency, stream=stream, abort_confidence=cutoff
+        ))
+        chosen = [candidate.cv_path for candidate in ranking.shortlisted]
+        if baseline is None:
+            baseline = (seconds, chosen)
+
+        print(
+            f"{label:>22} {candidates:>11} {transport.stats['generated_chars']:>16} {seconds:>8.2f} "
+            f"{baseline[0] / seconds:>7.1f}x {len(chosen):>12} {str(chosen == baseline[1]):>13}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Phase 2 reviews")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    concurrency = subparsers.add_parser("concurrency", help="Sequential vs concurrent LLM reviews")
+    concurrency.add_argument("--candidates", type=int, default=50, help="Phase 1 candidates to review")
+    concurrency.add_argument("--latency", type=float, default=0.2, help="Stub seconds per review")
+    concurrency.add_argument("--levels", default="1,2,4,8", help="Comma-separated max_concurrency values")
+    concurrency.add_argument("--slots", type=int, default=4, help="Requests the stub serves in parallel")
+
+    cache = subparsers.add_parser("cache", help="Cold vs cached LLM reviews")
+    cache.add_argument("--candidates", type=int, default=50, help="Phase 1 candidates to review")
+    cache.add_argument("--latency", type=float, default=0.2, help="Stub seconds per review")
+    cache.add_argument("--concurrency", type=int, default=4, help="Reviews in flight")
+
+    early_stop = subparsers.add_parser("early-stop", help="Full Phase 2 vs stopping at a confidence bar")
+    early_stop.add_argument("--candidates", type=int, default=100, help="Phase 1 candidates to review")
+    early_stop.add_argument("--latency", type=float, default=0.2, help="Stub seconds per review")
+    early_stop.add_argument("--thresholds", default="0.9,0.8,0.7", help="Comma-separated confidence bars")
+    early_stop.add_argument("--concurrency", type=int, default=1, help="Reviews in flight")
+
+    batch = subparsers.add_parser("batch", help="One candidate per LLM call vs several per prompt")
+    batch.add_argument("--candidates", type=int, default=48, help="Phase 1 candidates to review")
+    batch.add_argument("--latency", type=float, default=0.05, help="Stub seconds per request")
+    batch.add_argument("--prompt-cost", type=float, default=0.1, help="Stub seconds per 1000 prompt characters")
+    batch.add_argument("--verdict-cost", type=float, default=0.05, help="Stub seconds per candidate verdict")
+    batch.add_argument("--sizes", default="1,2,4,8", help="Comma-separated batch sizes")
+    batch.add_argument("--concurrency", type=int, default=1, help="LLM calls in flight")
+    batch.add_argument("--malformed", type=float, default=0.1, help="Share of batched answers the stub truncates")
+
+    streaming = subparsers.add_parser("streaming", help="Waiting for whole answers vs streaming with early abort")
+    streaming.add_argument("--candidates", type=int, default=50, help="Phase 1 candidates to review")
+    streaming.add_argument("--latency", type=float, default=0.05, help="Stub seconds of prompt evaluation")
+    streaming.add_argument("--token-latency", type=float, default=0.005, help="Stub seconds per generated token")
+    streaming.add_argument("--cutoffs", default="0.5", help="Comma-separated abort confidences to also try")
+    streaming.add_argument("--concurrency", type=int, default=1, help="Reviews in flight")
+
+    args = parser.parse_args()
+
+    if args.benchmark == "concurrency":
+        levels = [int(n) for n in args.levels.split(",") if n.strip()]
+        benchmark_concurrency(args.candidates, args.latency, levels, args.slots)
+    elif args.benchmark == "cache":
+        benchmark_cache(args.candidates, args.latency, args.concurrency)
+    elif args.benchmark == "early-stop":
+        thresholds = [float(n) for n in args.thresholds.split(",") if n.strip()]
+        benchmark_early_stop(args.candidates, args.latency, thresholds, args.concurrency)
+    elif args.benchmark == "batch":
+        sizes = [int(n) for n in args.sizes.split(",") if n.strip()]
+        benchmark_batch(
+            args.candidates, args.latency, args.prompt_cost, args.verdict_cost,
+            sizes, args.concurrency, args.malformed
+        )
+    elif args.benchmark == "streaming":
+        cutoffs = [float(n) for n in args.cutoffs.split(",") if n.strip()]
+        benchmark_streaming(args.candidates, args.latency, args.token_latency, cutoffs, args.concurrency)
+
+
+if __name__ == "__main__":
+    main()
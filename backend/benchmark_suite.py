@@ -0,0 +1,320 @@
+"""
+Benchmark suite with machine-readable results
+
+Runs on a corpus from generate_corpus.py (same seed, same corpus) and
+writes every measurement as JSON, tagged with the git commit, so runs can
+be compared across commits.
+
+    parser - ResumeParser pages/sec over the generated bundle, and how many
+             pages' name, email, skills and experience match the ground truth
+    phase1 - Phase1Shortlister.shortlist (whole pool, with and without a
+             prebuilt ResumeMatrix) and indexed shortlisting, per pool size
+    e2e    - upload the bundle through the API and time until Phase 1
+             has finished (Phase 2 is replaced by an instant stub)
+
+Usage:
+    python benchmark_suite.py --pages 2000 --sizes 1000,10000,100000 --output results.json
+    python benchmark_suite.py --only parser,e2e --compare results.json
+"""
+
+import os
+import json
+import time
+import asyncio
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+
+from models import Resume, ResumeFeatures, JobPosting
+from generate_corpus import ROLES, generate_corpus, generate_profiles
+from skill_matcher import get_skill_matcher, DEFAULT_TAXONOMY_PATH
+
+BENCHMARKS = ("parser", "phase1", "e2e")
+
+
+def timed(function: Callable[[], Any], repeat: int = 5) -> float:
+    """Median wall time of function() in seconds"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def suite_jobs(top: int = 50) -> List[JobPosting]:
+    """One posting per role, asking for its four most common skills"""
+    return [
+        JobPosting(
+            job_title=role,
+            description=f"{role} to join a growing product team",
+            required_tech_stack=skills[:4],
+            minimum_experience=3,
+            hiring_slots=2,
+            phase1_shortlist_count=top,
+            phase2_shortlist_count=10
+        )
+        for role, (_, skills) in ROLES.items()
+    ]
+
+
+def profile_resumes(count: int, seed: int) -> List[Resume]:
+    """The corpus's resumes as the parser would produce them, without rendering PDFs"""
+    matcher = get_skill_matcher(DEFAULT_TAXONOMY_PATH)
+    resumes = []
+
+    for i, profile in enumerate(generate_profiles(count, seed)):
+        skills = sorted(profile["skills"])
+        # model_construct skips validation, which would dominate at large sizes
+        resumes.append(Resume.model_construct(
+            name=profile["name"],
+            email=profile["email"],
+            skills=skills,
+            experience=profile["experience"],
+            cv_path=f"corpus.pdf#page={i + 1}",
+            text_content=None,
+            text_ref=None,
+            features=ResumeFeatures.model_construct(
+                skill_ids=matcher.skill_ids(skills),
+                experience=profile["experience"],
+                fingerprint=f"{i:016x}"
+            )
+        ))
+
+    return resumes
+
+
+def benchmark_parser(pdf_path: str, manifest_path: str, work_dir: str, workers: int) -> Dict[str, Any]:
+    from resume_parser import ResumeParser
+
+    parser = ResumeParser(os.path.join(work_dir, "uploads"), os.path.join(work_dir, "resumes"), workers=workers)
+    resumes = parser.extract_resumes_from_pdf(pdf_path)
+    parser.close()
+    stats = parser.last_extraction_stats
+
+    with open(manifest_path) as f:
+        expected = json.load(f)["resumes"]
+
+    parsed = {resume.cv_path.rsplit("=", 1)[-1]: resume for resume in resumes}
+    correct = 0
+    for page, truth in enumerate(expected, 1):
+        resume = parsed.get(str(page))
+        correct += bool(resume) and (
+            resume.name == truth["name"] and resume.email == truth["email"]
+            and resume.experience == truth["experience"] and set(resume.skills) == set(truth["skills"])
+        )
+
+    return {
+        "pages": stats["pages"],
+        "workers": stats["workers"],
+        "seconds": round(stats["seconds"], 4),
+        "pages_per_second": round(stats["pages_per_second"], 1),
+        "fields_correct": round(correct / len(expected), 4) if expected else 1.0
+    }
+
+
+def benchmark_phase1(sizes: List[int], seed: int) -> Dict[str, Any]:
+    from phase1_shortlister import Phase1Shortlister, ResumeMatrix
+    from resume_index import ResumeIndex
+
+    shortlister = Phase1Shortlister()
+    jobs = suite_jobs()
+    results = {}
+
+    for size in sizes:
+        resumes = profile_resumes(size, seed)
+        repeat = 5 if size <= 100000 else 1
+
+        start = time.perf_counter()
+        matrix = ResumeMatrix(resumes)
+        matrix_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        index = ResumeIndex(resumes)
+        index_seconds = time.perf_counter() - start
+
+        def run(shortlist):
+            return lambda: [shortlist(job) for job in jobs]
+
+        results[str(size)] = {
+            "jobs": len(jobs),
+            "matrix_build_seconds": round(matrix_seconds, 4),
+            "index_build_seconds": round(index_seconds, 4),
+            # Per job; shortlist() without a matrix encodes the pool on every call
+            "shortlist_seconds": round(timed(run(
+                lambda job: shortlister.shortlist(resumes, job, job.phase1_shortlist_count)
+            ), repeat) / len(jobs), 6),
+            "shortlist_prebuilt_matrix_seconds": round(timed(run(
+                lambda job: shortlister.shortlist(resumes, job, job.phase1_shortlist_count, matrix=matrix)
+            ), repeat) / len(jobs), 6),
+            "shortlist_indexed_seconds": round(timed(run(
+                lambda job: shortlister.shortlist_indexed_ids(index, job, job.phase1_shortlist_count)
+            ), repeat) / len(jobs), 6),
+        }
+        print(f"   phase1 {size}: {results[str(size)]}")
+
+    return results
+
+
+async def run_e2e(pdf_path: str, work_dir: str) -> Dict[str, Any]:
+    import httpx
+    import main
+
+    async def instant_review(prompt: str, abort_unsuitable: bool = False) -> str:
+        return json.dumps({"is_suitable": True, "confidence": 0.9, "reasoning": "stub", "cover_letter": ""})
+
+    main.phase2_shortlister.call_ollama = instant_review
+    transport = httpx.ASGITransport(app=main.app)
+    job = suite_jobs()[0]
+
+    async def wait_for(client, url: str, done: Callable[[Dict[str, Any]], bool]) -> Dict[str, Any]:
+        while True:
+            body = (await client.get(url)).json()
+            if done(body):
+                return body
+            await asyncio.sleep(0.005)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver", timeout=None) as client:
+        job_id = (await client.post("/api/jobs/create", json=job.model_dump())).json()["job_id"]
+
+        start = time.perf_counter()
+        with open(pdf_path, "rb") as f:
+            upload = await client.post(
+                f"/api/jobs/{job_id}/upload-resumes",
+                files={"file": ("corpus.pdf", f, "application/pdf")}
+            )
+        upload_seconds = time.perf_counter() - start
+
+        ingestion = await wait_for(
+            client, f"/api/jobs/{job_id}/ingestions/{upload.json()['ingestion_id']}",
+            lambda body: body["status"] not in ("queued", "running")
+        )
+        ingested_seconds = time.perf_counter() - start
+
+        await client.post(f"/api/jobs/{job_id}/start-shortlisting")
+        status = await wait_for(
+            client, f"/api/jobs/{job_id}/status",
+            lambda body: body["status"] in ("phase2", "completed", "error")
+        )
+        phase1_seconds = time.perf_counter() - start
+
+        await wait_for(client, f"/api/jobs/{job_id}/status", lambda body: body["status"] in ("completed", "error"))
+
+    return {
+        "pages": ingestion["pages_total"],
+        "resumes": ingestion["total_resumes"],
+        "upload_seconds": round(upload_seconds, 4),
+        "upload_to_ingested_seconds": round(ingested_seconds, 4),
+        "upload_to_phase1_seconds": round(phase1_seconds, 4),
+        "phase1_completed": status["phase1_completed"],
+        "status": status["status"]
+    }
+
+
+def benchmark_e2e(pdf_path: str, work_dir: str) -> Dict[str, Any]:
+    # main reads its configuration at import: keep its files in the work dir
+    os.environ["UPLOAD_DIR"] = os.path.join(work_dir, "api_uploads")
+    os.environ["RESUME_DIR"] = os.path.join(work_dir, "api_resumes")
+    os.environ["TEXT_STORE_PATH"] = os.path.join(work_dir, "resume_texts.dat")
+    # A cold run: no pages or reviews served from an earlier run's caches
+    os.environ["PARSE_CACHE_PATH"] = ""
+    os.environ["REVIEW_CACHE_PATH"] = ""
+
+    return asyncio.run(run_e2e(pdf_path, work_dir))
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def flatten(results: Dict[str, Any], prefix: str = "") -> Dict[str, float]:
+    """Numeric results as {"phase1.1000.shortlist_seconds": ...}"""
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{name}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def compare(results: Dict[str, Any], baseline_path: str):
+    """Print each metric next to the same metric of an earlier run"""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+
+    current, previous = flatten(results["results"]), flatten(baseline["results"])
+    print(f"\nCompared with {baseline.get('commit', '?')} ({baseline_path}):")
+    print(f"{'metric':<55} {'before':>12} {'after':>12} {'change':>8}")
+
+    for name in sorted(current.keys() & previous.keys()):
+        before, after = previous[name], current[name]
+        change = f"{(after - before) / before:+.1%}" if before else "n/a"
+        print(f"{name:<55} {before:>12g} {after:>12g} {change:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the benchmark suite and write JSON results")
+    parser.add_argument("--pages", type=int, default=2000, help="Pages in the generated bundle (parser, e2e)")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="Comma-separated pool sizes (phase1)")
+    parser.add_argument("--seed", type=int, default=7, help="Corpus seed")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Parser worker processes")
+    parser.add_argument("--only", default=",".join(BENCHMARKS), help="Comma-separated benchmarks to run")
+    parser.add_argument("--output", default="benchmark_results.json", help="Where to write the results")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    args = parser.parse_args()
+
+    selected = [name for name in args.only.split(",") if name.strip()]
+    unknown = set(selected) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    results = {
+        "commit": git_commit(),
+        "timestamp": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "config": {"pages": args.pages, "sizes": args.sizes, "seed": args.seed, "workers": args.workers},
+        "results": {}
+    }
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        if "parser" in selected or "e2e" in selected:
+            start = time.perf_counter()
+            pdf_path, manifest_path = generate_corpus(args.pages, os.path.join(work_dir, "corpus.pdf"), args.seed)
+            print(f"Generated {args.pages}-page corpus in {time.perf_counter() - start:.1f}s")
+
+        if "parser" in selected:
+            results["results"]["parser"] = benchmark_parser(pdf_path, manifest_path, work_dir, args.workers)
+            print(f"   parser: {results['results']['parser']}")
+
+        if "phase1" in selected:
+            sizes = [int(n) for n in args.sizes.split(",") if n.strip()]
+            results["results"]["phase1"] = benchmark_phase1(sizes, args.seed)
+
+        if "e2e" in selected:
+            results["results"]["e2e"] = benchmark_e2e(pdf_path, work_dir)
+            print(f"   e2e: {results['results']['e2e']}")
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"✅ Results written to {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
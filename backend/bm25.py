@@ -0,0 +1,92 @@
+import re
+import math
+from array import array
+from collections import Counter
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+# Keeps "c++", "c#" and "node.js"-style tokens ("node", "js") usable as terms
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+STOP_WORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or our that the "
+    "their this to was we were will with you your".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens of text, without stop words"""
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOP_WORDS]
+
+
+def term_counts(text: str) -> Dict[str, int]:
+    """Term frequencies of a document, the unit BM25Index.add takes"""
+    return dict(Counter(tokenize(text)))
+
+
+class BM25Index:
+    """
+    Incremental BM25 index over a job's resume texts
+
+    Documents are identified by their position in the pool (upload order)
+    and only ever appended, so adding resumes appends to the postings of
+    their terms instead of rebuilding the index. IDF depends on the pool
+    size, so it is derived from the document frequencies at query time.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        # term -> (document ids, term frequencies), both ascending by id
+        self.postings: Dict[str, Tuple[array, array]] = {}
+        self.doc_lengths = array("q")
+        self.total_length = 0
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    def add(self, documents: List[Dict[str, int]]):
+        """Append documents given as term frequencies (see term_counts)"""
+        for counts in documents:
+            doc_id = len(self.doc_lengths)
+            length = sum(counts.values())
+            self.doc_lengths.append(length)
+            self.total_length += length
+
+            for term, frequency in counts.items():
+                posting = self.postings.get(term)
+                if posting is None:
+                    posting = self.postings[term] = (array("q"), array("q"))
+                posting[0].append(doc_id)
+                posting[1].append(frequency)
+
+    def idf(self, term: str) -> float:
+        """Inverse document frequency of a term (0 for unseen terms)"""
+        posting = self.postings.get(term)
+        if posting is None:
+            return 0.0
+
+        document_frequency = len(posting[0])
+        return math.log(1 + (len(self) - document_frequency + 0.5) / (document_frequency + 0.5))
+
+    def score(self, query: str) -> np.ndarray:
+        """BM25 score of every document for a query text"""
+        scores = np.zeros(len(self), dtype=np.float64)
+        if not len(self):
+            return scores
+
+        doc_lengths = np.frombuffer(self.doc_lengths, dtype=np.int64)
+        average_length = self.total_length / len(self) or 1.0
+        length_norm = self.k1 * (1 - self.b + self.b * doc_lengths / average_length)
+
+        for term in set(tokenize(query)):
+            posting = self.postings.get(term)
+            if posting is None:
+                continue
+
+            doc_ids = np.frombuffer(posting[0], dtype=np.int64)
+            frequencies = np.frombuffer(posting[1], dtype=np.int64)
+            scores[doc_ids] += self.idf(term) * frequencies * (self.k1 + 1) / (frequencies + length_norm[doc_ids])
+
+        return scores
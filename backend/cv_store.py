@@ -0,0 +1,92 @@
+import fitz  # PyMuPDF
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Tuple
+
+
+class CVStore:
+    """
+    Lazy store for individual resume PDFs
+
+    A resume's cv_path is a reference to a page of the uploaded bundle
+    ("<pdf_path>#page=<n>"). The single-page PDF is only produced when a
+    candidate's CV is actually requested, and the produced files are kept
+    in a bounded on-disk LRU cache.
+    """
+
+    PAGE_SEPARATOR = "#page="
+
+    def __init__(self, cache_dir: str, max_cached_files: int = 500):
+        self.cache_dir = cache_dir
+        self.max_cached_files = max(1, max_cached_files)
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+        # Pick up files produced before a restart, oldest first
+        cached = [
+            os.path.join(cache_dir, name)
+            for name in os.listdir(cache_dir)
+            if name.startswith("cv_") and name.endswith(".pdf")
+        ]
+        cached.sort(key=os.path.getmtime)
+        self._cache: "OrderedDict[str, None]" = OrderedDict((path, None) for path in cached)
+
+    @classmethod
+    def make_ref(cls, pdf_path: str, page_num: int) -> str:
+        """Build a CV reference for a zero-based page of a PDF"""
+        return f"{pdf_path}{cls.PAGE_SEPARATOR}{page_num + 1}"
+
+    @classmethod
+    def parse_ref(cls, cv_path: str) -> Tuple[str, int]:
+        """Split a CV reference into (pdf_path, zero-based page number)"""
+        pdf_path, separator, page = cv_path.rpartition(cls.PAGE_SEPARATOR)
+
+        if not separator or not page.isdigit() or int(page) < 1:
+            raise ValueError(f"Not a CV reference: {cv_path}")
+
+        return pdf_path, int(page) - 1
+
+    def get_pdf_bytes(self, cv_path: str) -> bytes:
+        """Render the referenced page as a single-page PDF byte stream"""
+        pdf_path, page_num = self.parse_ref(cv_path)
+
+        with fitz.open(pdf_path) as doc:
+            if page_num >= len(doc):
+                raise ValueError(f"Page {page_num + 1} not in {pdf_path}")
+
+            with fitz.open() as single_page_doc:
+                single_page_doc.insert_pdf(doc, from_page=page_num, to_page=page_num)
+                return single_page_doc.tobytes()
+
+    def get_pdf_path(self, cv_path: str) -> str:
+        """Return a path to the single-page PDF, producing it on first request"""
+        digest = hashlib.sha1(cv_path.encode("utf-8")).hexdigest()[:16]
+        cached_path = os.path.join(self.cache_dir, f"cv_{digest}.pdf")
+
+        with self._lock:
+            if cached_path in self._cache and os.path.exists(cached_path):
+                self._cache.move_to_end(cached_path)
+                return cached_path
+
+        content = self.get_pdf_bytes(cv_path)
+
+        # Write then rename so a concurrent reader never sees a partial file
+        tmp_path = f"{cached_path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, cached_path)
+
+        with self._lock:
+            self._cache[cached_path] = None
+            self._cache.move_to_end(cached_path)
+
+            while len(self._cache) > self.max_cached_files:
+                evicted, _ = self._cache.popitem(last=False)
+                try:
+                    os.remove(evicted)
+                except OSError:
+                    pass
+
+        return cached_path
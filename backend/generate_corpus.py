@@ -0,0 +1,240 @@
+"""
+Synthetic resume corpus generator
+
+Writes a bundle PDF with one resume per page, laid out like
+create_sample_resumes.py, plus a JSON manifest with the ground truth of
+every page (role, skills, experience). The same seed always gives the same
+corpus, so benchmark runs stay comparable across commits.
+
+Distributions aim to look like a real applicant pool:
+- each candidate has a role; roles are not equally common, and each role
+  has core skills, the first ones more common than the last
+- a few general skills (Git, Agile, SQL, ...) on top, by popularity
+- skills are sometimes written as one of their aliases ("K8s", "Postgres")
+- years of experience are log-normal (many juniors, a long senior tail),
+  and about 1 in 10 resumes don't state them
+
+Usage:
+    python generate_corpus.py --pages 5000 --output corpus.pdf --seed 7
+"""
+
+import os
+import json
+import random
+import argparse
+import textwrap
+from typing import Any, Dict, List, Optional, Tuple
+
+import fitz  # PyMuPDF
+
+from skill_matcher import load_taxonomy, get_skill_matcher, DEFAULT_TAXONOMY_PATH
+
+# Role -> (share of the pool, core skills from most to least common)
+ROLES: Dict[str, Tuple[float, List[str]]] = {
+    "Backend Engineer": (0.22, [
+        "Python", "Java", "PostgreSQL", "Docker", "REST API", "Django", "Spring", "Go", "Redis",
+        "Microservices", "FastAPI", "Flask", "MySQL", "Kubernetes", "MongoDB", "Cassandra"
+    ]),
+    "Frontend Developer": (0.18, [
+        "JavaScript", "React", "TypeScript", "HTML", "CSS", "Node.js", "Angular", "Vue", "GraphQL", "REST API"
+    ]),
+    "Full Stack Developer": (0.2, [
+        "JavaScript", "React", "Node.js", "TypeScript", "MongoDB", "Express", "PostgreSQL", "Docker",
+        "HTML", "CSS", "Python", "AWS", "GraphQL", "Redis"
+    ]),
+    "Data Scientist": (0.12, [
+        "Python", "SQL", "Pandas", "Machine Learning", "NumPy", "Scikit-learn", "Data Analysis",
+        "Data Science", "TensorFlow", "Deep Learning", "PyTorch", "NLP"
+    ]),
+    "AI Engineer": (0.08, [
+        "Python", "PyTorch", "Machine Learning", "Deep Learning", "TensorFlow", "Docker", "Kubernetes",
+        "NLP", "Computer Vision", "AWS", "GCP", "NumPy"
+    ]),
+    "DevOps Engineer": (0.12, [
+        "Docker", "Kubernetes", "AWS", "Linux", "CI/CD", "Jenkins", "Bash", "Python", "Azure",
+        "GCP", "Shell Scripting", "Go", "Git"
+    ]),
+    "Systems Programmer": (0.08, [
+        "C++", "Linux", "Rust", "Go", "C#", "Python", "Bash", "Windows", "Git"
+    ]),
+    "QA Engineer": (0.05, [
+        "Testing", "Selenium", "Python", "Pytest", "JavaScript", "Jest", "CI/CD", "Jenkins", "Agile"
+    ]),
+}
+
+# Skills anyone may list, most popular first
+GENERAL_SKILLS = ["Git", "Agile", "SQL", "Linux", "Scrum", "REST API", "Docker", "AWS", "Windows", "MacOS"]
+
+FIRST_NAMES = [
+    "Aarav", "Maya", "Lucas", "Sofia", "Noah", "Priya", "Ethan", "Amara", "Liam", "Chen", "Olivia", "Mateo",
+    "Hana", "Omar", "Zara", "Daniel", "Ines", "Kofi", "Elena", "Ravi", "Grace", "Yusuf", "Nina", "Jonas",
+    "Leila", "Marco", "Aiko", "Samuel", "Freya", "Diego", "Anya", "Tariq", "Clara", "Felix", "Meera", "Hugo"
+]
+LAST_NAMES = [
+    "Mehta", "Brown", "Garcia", "Kim", "Okafor", "Rossi", "Nguyen", "Patel", "Schmidt", "Silva", "Tanaka",
+    "Haddad", "Johansson", "Kowalski", "Murphy", "Novak", "Ortiz", "Sato", "Walker", "Yilmaz", "Adeyemi",
+    "Fischer", "Larsen", "Moreau", "Reddy", "Costa", "Hughes", "Ivanova", "Dubois", "Khan"
+]
+COMPANIES = ["Northwind Labs", "Bluefin Systems", "Acme Analytics", "Helio Software", "Quarry Tech", "Lumen Works"]
+UNIVERSITIES = ["University of Technology", "State University", "Institute of Engineering", "City College"]
+
+# Prose avoids words that are also skill names, so the manifest's skills
+# are exactly what a parser should find
+SUMMARY_FOCUS = [
+    "building reliable products", "shipping features end to end", "improving performance and stability",
+    "working closely with product and design", "mentoring engineers", "automating repetitive work"
+]
+HIGHLIGHTS = [
+    "Led development of key features", "Mentored junior developers", "Improved system performance by 40%",
+    "Reduced release time from weeks to days", "Cut infrastructure costs by 25%", "Owned on-call and incident reviews"
+]
+
+
+def experience_phrase(years: int, rng: random.Random) -> str:
+    """Years of experience written one of the ways resumes state them"""
+    return rng.choice([
+        f"{years} years of professional experience",
+        f"{years}+ years of experience",
+        f"Experience: {years} years",
+    ])
+
+
+def generate_profiles(count: int, seed: int = 7) -> List[Dict[str, Any]]:
+    """Ground truth for count resumes: name, email, role, experience, skills and their spelling"""
+    rng = random.Random(seed)
+    aliases = {canonical: names for canonical, names in load_taxonomy(DEFAULT_TAXONOMY_PATH)}
+    # Titles such as "Full Stack Developer" name a skill themselves
+    title_skills = {role: get_skill_matcher(DEFAULT_TAXONOMY_PATH).find_skills(role) for role in ROLES}
+
+    roles = list(ROLES)
+    role_weights = [ROLES[role][0] for role in roles]
+    general_weights = [1.0 / (rank + 1) for rank in range(len(GENERAL_SKILLS))]
+
+    profiles = []
+    for i in range(count):
+        role = rng.choices(roles, weights=role_weights)[0]
+        core = ROLES[role][1]
+
+        # Earlier core skills are more common: weighted sampling without replacement
+        ranked = sorted(core, key=lambda skill: rng.random() ** (1.0 / (len(core) - core.index(skill))), reverse=True)
+        skills = ranked[:rng.randint(4, min(9, len(core)))]
+        for skill in rng.choices(GENERAL_SKILLS, weights=general_weights, k=rng.randint(0, 3)):
+            if skill not in skills:
+                skills.append(skill)
+
+        experience: Optional[int] = None
+        if rng.random() >= 0.1:
+            experience = min(30, int(rng.lognormvariate(1.3, 0.6)))
+
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        written_skills = [
+            # An alias about one time in five
+            rng.choice(aliases[skill]) if aliases.get(skill) and rng.random() < 0.2 else skill
+            for skill in skills
+        ]
+
+        profiles.append({
+            "name": f"{first} {last}",
+            "email": f"{first.lower()}.{last.lower()}{i}@example.com",
+            "role": role,
+            "experience": experience,
+            "skills": skills + [skill for skill in title_skills[role] if skill not in skills],
+            "written_skills": written_skills,
+            "experience_text": experience_phrase(experience, rng) if experience is not None else "Open to new opportunities",
+            "focus": rng.choice(SUMMARY_FOCUS),
+            "highlights": rng.sample(HIGHLIGHTS, 3),
+            "company": rng.choice(COMPANIES),
+            "university": rng.choice(UNIVERSITIES),
+            "graduated": 2024 - (experience or 0) - rng.randint(0, 2)
+        })
+
+    return profiles
+
+
+def page_text(profile: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """The (style, text) blocks of a profile's page, top to bottom"""
+    return [
+        ("name", profile["name"]),
+        ("body", profile["email"]),
+        ("heading", "EXPERIENCE"),
+        ("body", profile["experience_text"]),
+        ("heading", "TECHNICAL SKILLS"),
+        ("body", ", ".join(profile["written_skills"])),
+        ("heading", "PROFESSIONAL SUMMARY"),
+        ("body", f"{profile['role']} with a track record of {profile['focus']}."),
+        ("heading", "WORK HISTORY"),
+        ("body", f"{profile['role']} - {profile['company']}"),
+        ("body", "\n".join(f"- {highlight}" for highlight in profile["highlights"])),
+        ("heading", "EDUCATION"),
+        ("body", f"Bachelor of Science in Computer Science\n{profile['university']}, {profile['graduated']}"),
+    ]
+
+
+# Style -> (font, size, gap after in points)
+STYLES = {"name": ("hebo", 22, 10), "heading": ("hebo", 13, 4), "body": ("helv", 11, 10)}
+
+# Characters per line of body text across the page's text column
+WRAP_WIDTH = 85
+
+
+def write_bundle(profiles: List[Dict[str, Any]], output_path: str) -> str:
+    """Render one page per profile into a PDF"""
+    doc = fitz.open()
+    width, height = fitz.paper_size("letter")
+    margin = 72
+    fonts = {name: fitz.Font(name) for name, _, _ in STYLES.values()}
+
+    for profile in profiles:
+        page = doc.new_page(width=width, height=height)
+        # One TextWriter per page is several times faster than insert_textbox per block
+        writer = fitz.TextWriter(page.rect)
+        y = margin
+
+        for style, text in page_text(profile):
+            font, size, gap = STYLES[style]
+            for paragraph in text.split("\n"):
+                for line in textwrap.wrap(paragraph, WRAP_WIDTH, break_on_hyphens=False):
+                    y += size * 1.2
+                    writer.append((margin, y), line, font=fonts[font], fontsize=size)
+            y += gap
+
+        writer.write_text(page)
+
+    doc.save(output_path, garbage=0, deflate=True)
+    doc.close()
+
+    return output_path
+
+
+def manifest_path_for(pdf_path: str) -> str:
+    return os.path.splitext(pdf_path)[0] + ".json"
+
+
+def generate_corpus(pages: int, output_path: str, seed: int = 7) -> Tuple[str, str]:
+    """Write the bundle and its manifest; returns both paths"""
+    profiles = generate_profiles(pages, seed)
+    write_bundle(profiles, output_path)
+
+    manifest_path = manifest_path_for(output_path)
+    with open(manifest_path, "w") as f:
+        json.dump({
+            "seed": seed,
+            "pages": pages,
+            "resumes": [
+                {key: profile[key] for key in ("name", "email", "role", "experience", "skills")}
+                for profile in profiles
+            ]
+        }, f)
+
+    return output_path, manifest_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic resume bundle")
+    parser.add_argument("--pages", type=int, default=1000, help="Resumes (one per page)")
+    parser.add_argument("--output", default="corpus.pdf", help="PDF to write; the manifest goes next to it")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed")
+    args = parser.parse_args()
+
+    pdf_path, manifest_path = generate_corpus(args.pages, args.output, args.seed)
+    print(f"✅ Wrote {args.pages} resumes to {pdf_path} (ground truth in {manifest_path})")
@@ -1,21 +1,37 @@
 from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from typing import List, Dict, Any
+from fastapi.responses import JSONResponse, FileResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+from typing import List, Dict, Any, Optional, Set, Tuple
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import os
+import re
+import time
 import uuid
+import zipfile
 from datetime import datetime
 import json
+import numpy as np
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
-from models import JobPosting, JobStatus, ShortlistResponse
+from models import (
+    JobPosting, JobStatus, ShortlistResponse, BatchShortlistRequest, CandidateFitRequest, RerankRequest
+)
 from resume_parser import ResumeParser
-from phase1_shortlister import Phase1Shortlister
+from resume_cache import ParsedResumeCache, LLMReviewCache
+from text_store import ResumeTextStore
+from cv_store import CVStore
+from phase1_shortlister import Phase1Shortlister, ResumeMatrix
+from resume_index import ResumeIndex
+from bm25 import BM25Index, term_counts
+from semantic_index import HashedNgramEncoder, SemanticIndex
 from phase2_shortlister import Phase2Shortlister
 from mcp_tools import MCPResumeTools
+from skill_matcher import get_skill_matcher
 
 # Initialize FastAPI
 app = FastAPI(title="Resume Shortlister AI", version="1.0.0")
@@ -34,27 +50,175 @@ UPLOAD_DIR = os.getenv("UPLOAD_DIR", "./uploads")
 RESUME_DIR = os.getenv("RESUME_DIR", "./resumes")
 OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
 OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "ministral-3:3b")
+# LLM reviews in flight at once; keep it at or below Ollama's OLLAMA_NUM_PARALLEL
+PHASE2_CONCURRENCY = int(os.getenv("PHASE2_CONCURRENCY", "4"))
+# Phase 2 stops once phase2_shortlist_count candidates reach this confidence (0 disables)
+PHASE2_EARLY_STOP_CONFIDENCE = float(os.getenv("PHASE2_EARLY_STOP_CONFIDENCE", "0"))
+# Candidates reviewed per LLM call, sharing one copy of the job description (1 disables batching)
+PHASE2_BATCH_SIZE = int(os.getenv("PHASE2_BATCH_SIZE", "1"))
+# Stream reviews from Ollama and stop generating once a candidate is rejected
+PHASE2_STREAMING = os.getenv("PHASE2_STREAMING", "false").lower() in ("1", "true", "yes")
+# While streaming, also stop once the confidence is below this (0 stops on a negative verdict only)
+PHASE2_ABORT_CONFIDENCE = float(os.getenv("PHASE2_ABORT_CONFIDENCE", "0"))
+PARSER_WORKERS = int(os.getenv("PARSER_WORKERS", str(os.cpu_count() or 1)))
+EXTRACTION_PROFILE = os.getenv("EXTRACTION_PROFILE", "default")
+CV_CACHE_MAX_FILES = int(os.getenv("CV_CACHE_MAX_FILES", "500"))
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))
+MAX_UPLOAD_SIZE_MB = int(os.getenv("MAX_UPLOAD_SIZE_MB", "500"))
+# Limits of a batch upload: the whole request, and what its ZIP archives may inflate to
+MAX_BATCH_UPLOAD_SIZE_MB = int(os.getenv("MAX_BATCH_UPLOAD_SIZE_MB", "2048"))
+MAX_ZIP_INFLATED_MB = int(os.getenv("MAX_ZIP_INFLATED_MB", "2048"))
+MAX_ZIP_MEMBERS = int(os.getenv("MAX_ZIP_MEMBERS", "10000"))
+INGESTION_WORKERS = int(os.getenv("INGESTION_WORKERS", "2"))
+PARSE_CACHE_PATH = os.getenv("PARSE_CACHE_PATH", "./cache/parsed_resumes.sqlite")
+PARSE_CACHE_MAX_ENTRIES = int(os.getenv("PARSE_CACHE_MAX_ENTRIES", "200000"))
+TEXT_STORE_PATH = os.getenv("TEXT_STORE_PATH", "./cache/resume_texts.dat")
+REVIEW_CACHE_PATH = os.getenv("REVIEW_CACHE_PATH", "./cache/llm_reviews.sqlite")
+REVIEW_CACHE_MAX_ENTRIES = int(os.getenv("REVIEW_CACHE_MAX_ENTRIES", "50000"))
+REVIEW_CACHE_MAX_MB = int(os.getenv("REVIEW_CACHE_MAX_MB", "256"))
+REVIEW_CACHE_TTL_HOURS = float(os.getenv("REVIEW_CACHE_TTL_HOURS", "168"))
+BM25_WEIGHT = float(os.getenv("BM25_WEIGHT", "0"))
+# Only this many resumes nearest to the job go to Phase 1 (0 disables the prefilter)
+SEMANTIC_PREFILTER_SIZE = int(os.getenv("SEMANTIC_PREFILTER_SIZE", "0"))
+SEMANTIC_PROBES = int(os.getenv("SEMANTIC_PROBES", "24"))
+
+# Room for the multipart boundaries and part headers around an uploaded file
+MULTIPART_OVERHEAD = 1024 * 1024
+
+
+def upload_body_limit(path: str) -> Optional[int]:
+    """Largest request body accepted on path, or None if it has no limit"""
+    if re.fullmatch(r"/api/jobs/[^/]+/upload-resumes", path):
+        return MAX_UPLOAD_SIZE_MB * 1024 * 1024 + MULTIPART_OVERHEAD
+    if re.fullmatch(r"/api/jobs/[^/]+/upload-resumes/batch", path):
+        return MAX_BATCH_UPLOAD_SIZE_MB * 1024 * 1024
+    return None
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Reject oversized uploads before their body is parsed
+
+    Starlette spools a multipart body to a temporary file before the
+    endpoint runs, so a limit checked by the endpoint only applies once the
+    whole upload is on disk. This answers 413 straight away when the
+    Content-Length is over the limit, and otherwise counts the body as it
+    is received, failing the request as soon as it goes over.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        limit = upload_body_limit(scope["path"]) if scope["type"] == "http" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        detail = f"Upload exceeds maximum size of {limit // (1024 * 1024)} MB"
+
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length and content_length.isdigit() and int(content_length) > limit:
+            await JSONResponse({"detail": detail}, status_code=413)(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    raise HTTPException(status_code=413, detail=detail)
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+app.add_middleware(UploadSizeLimitMiddleware)
 
 # Create directories
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 os.makedirs(RESUME_DIR, exist_ok=True)
 
 # Initialize components
-resume_parser = ResumeParser(UPLOAD_DIR, RESUME_DIR)
-phase1_shortlister = Phase1Shortlister()
-phase2_shortlister = Phase2Shortlister(OLLAMA_BASE_URL, OLLAMA_MODEL)
-mcp_tools = MCPResumeTools()
+# An empty PARSE_CACHE_PATH disables the parsed-resume cache
+parse_cache = ParsedResumeCache(PARSE_CACHE_PATH, PARSE_CACHE_MAX_ENTRIES) if PARSE_CACHE_PATH else None
+# An empty REVIEW_CACHE_PATH disables the LLM review cache; a TTL of 0 never expires entries
+review_cache = LLMReviewCache(
+    REVIEW_CACHE_PATH,
+    max_entries=REVIEW_CACHE_MAX_ENTRIES,
+    max_bytes=REVIEW_CACHE_MAX_MB * 1024 * 1024,
+    ttl_seconds=REVIEW_CACHE_TTL_HOURS * 3600
+) if REVIEW_CACHE_PATH else None
+# Resumes are kept in memory only, so texts from a previous run are dropped
+text_store = ResumeTextStore(TEXT_STORE_PATH, truncate=True)
+resume_parser = ResumeParser(
+    UPLOAD_DIR, RESUME_DIR,
+    workers=PARSER_WORKERS,
+    cache=parse_cache,
+    text_store=text_store,
+    extraction_profile=EXTRACTION_PROFILE
+)
+# Fork the extraction processes before the ingestion threads exist
+resume_parser.start_workers()
+cv_store = CVStore(RESUME_DIR, max_cached_files=CV_CACHE_MAX_FILES)
+phase1_shortlister = Phase1Shortlister(relevance_weight=BM25_WEIGHT)
+phase2_shortlister = Phase2Shortlister(
+    OLLAMA_BASE_URL,
+    OLLAMA_MODEL,
+    text_store=text_store,
+    max_concurrency=PHASE2_CONCURRENCY,
+    cache=review_cache,
+    early_stop_confidence=PHASE2_EARLY_STOP_CONFIDENCE or None,
+    batch_size=PHASE2_BATCH_SIZE,
+    stream=PHASE2_STREAMING,
+    abort_confidence=PHASE2_ABORT_CONFIDENCE or None
+)
+mcp_tools = MCPResumeTools(text_store=text_store)
+semantic_encoder = HashedNgramEncoder() if SEMANTIC_PREFILTER_SIZE > 0 else None
+
+# PDF parsing is CPU-bound, so it runs here instead of on the event loop
+ingestion_executor = ThreadPoolExecutor(max_workers=INGESTION_WORKERS, thread_name_prefix="ingest")
 
 # Print configuration on startup
 print(f"🚀 Resume Shortlister AI Starting...")
 print(f"   Ollama URL: {OLLAMA_BASE_URL}")
 print(f"   Ollama Model: {OLLAMA_MODEL}")
+print(f"   Phase 2 Concurrency: {PHASE2_CONCURRENCY}")
+print(f"   Phase 2 Early Stop: {PHASE2_EARLY_STOP_CONFIDENCE or 'disabled'}")
+print(f"   Phase 2 Batch Size: {PHASE2_BATCH_SIZE}")
+print(f"   Phase 2 Streaming: {PHASE2_STREAMING} (abort below confidence {PHASE2_ABORT_CONFIDENCE or 'disabled'})")
 print(f"   Upload Dir: {UPLOAD_DIR}")
 print(f"   Resume Dir: {RESUME_DIR}")
+print(f"   Parser Workers: {PARSER_WORKERS}")
+print(f"   Extraction Profile: {EXTRACTION_PROFILE}")
+print(f"   Max Upload Size: {MAX_UPLOAD_SIZE_MB} MB (batch {MAX_BATCH_UPLOAD_SIZE_MB} MB)")
+print(f"   ZIP Limits: {MAX_ZIP_INFLATED_MB} MB inflated, {MAX_ZIP_MEMBERS} members")
+print(f"   Ingestion Workers: {INGESTION_WORKERS}")
+print(f"   Parse Cache: {PARSE_CACHE_PATH or 'disabled'}")
+print(f"   Review Cache: {REVIEW_CACHE_PATH or 'disabled'}")
+print(f"   BM25 Weight: {BM25_WEIGHT}")
+print(f"   Semantic Prefilter: {SEMANTIC_PREFILTER_SIZE or 'disabled'}")
 
 # In-memory storage (in production, use a database)
 jobs_db: Dict[str, Dict[str, Any]] = {}
 resumes_db: Dict[str, List[Any]] = {}
+# cv_paths of each job's resumes, for checking that a requested CV belongs to the job
+cv_paths_db: Dict[str, Set[str]] = {}
+# Skill and experience indexes over each job's resumes, kept in step with resumes_db
+resume_indexes: Dict[str, ResumeIndex] = {}
+# BM25 postings over each job's resume texts, also in step with resumes_db
+bm25_indexes: Dict[str, BM25Index] = {}
+# Last BM25 scores per job, as (pool size, query, scores); valid until the pool grows
+relevance_cache: Dict[str, Tuple[int, str, Any]] = {}
+# Nearest-neighbour indexes over each job's resume vectors, if the prefilter is enabled
+semantic_indexes: Dict[str, SemanticIndex] = {}
+semantic_locks: Dict[str, asyncio.Lock] = {}
+ingestion_tasks: Dict[str, asyncio.Task] = {}
+# Job statuses while run_shortlisting_process is running
+SHORTLISTING_STATUSES = ("processing", "phase1", "phase2")
 
 
 @app.get("/")
@@ -80,10 +244,24 @@ async def create_job(job: JobPosting, background_tasks: BackgroundTasks):
         "created_at": datetime.now().isoformat(),
         "phase1_results": [],
         "phase2_results": [],
-        "shortlisted": []
+        "shortlisted": [],
+        "ingestions": {},
+        # Pool positions of the Phase 1 shortlist, and how many resumes it covered
+        "phase1_ids": [],
+        "phase1_scored": 0,
+        # Phase 2 outcome per reviewed cv_path (None if not suitable)
+        "reviews": {},
+        # Phase 1 candidates the last Phase 2 run didn't send to the LLM
+        "llm_calls_saved": 0
     }
 
     resumes_db[job_id] = []
+    cv_paths_db[job_id] = set()
+    resume_indexes[job_id] = ResumeIndex()
+    bm25_indexes[job_id] = BM25Index()
+    if semantic_encoder:
+        semantic_indexes[job_id] = SemanticIndex(semantic_encoder.dim, probes=SEMANTIC_PROBES)
+    semantic_locks[job_id] = asyncio.Lock()
 
     return {
         "job_id": job_id,
@@ -92,89 +270,480 @@ async def create_job(job: JobPosting, background_tasks: BackgroundTasks):
     }
 
 
-@app.post("/api/jobs/{job_id}/upload-resumes")
+async def save_upload(file: UploadFile, file_path: str) -> int:
+    """Stream an upload to disk in fixed-size chunks, enforcing MAX_UPLOAD_SIZE_MB"""
+
+    max_bytes = MAX_UPLOAD_SIZE_MB * 1024 * 1024
+    written = 0
+
+    try:
+        with open(file_path, "wb") as f:
+            while True:
+                chunk = await file.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+
+                written += len(chunk)
+                if written > max_bytes:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"File exceeds maximum upload size of {MAX_UPLOAD_SIZE_MB} MB"
+                    )
+
+                f.write(chunk)
+    except Exception:
+        # Don't leave a partial upload behind
+        if os.path.exists(file_path):
+            os.remove(file_path)
+        raise
+
+    return written
+
+
+def extract_zip_pdfs(zip_path: str, path_prefix: str, max_total_bytes: int) -> Tuple[List[Tuple[str, str]], int]:
+    """
+    Stream the PDFs out of a ZIP upload; returns (filename, path) pairs and
+    the bytes inflated
+
+    Each PDF may inflate to MAX_UPLOAD_SIZE_MB, the archive to
+    MAX_ZIP_INFLATED_MB and at most max_total_bytes (what is left of the
+    request's budget), and the archive may have at most MAX_ZIP_MEMBERS
+    entries, so a ZIP bomb fails with 413 instead of filling the disk.
+    """
+
+    max_bytes = MAX_UPLOAD_SIZE_MB * 1024 * 1024
+    max_archive_bytes = MAX_ZIP_INFLATED_MB * 1024 * 1024
+    extracted = []
+    inflated = 0
+
+    try:
+        with zipfile.ZipFile(zip_path) as archive:
+            members = archive.infolist()
+            if len(members) > MAX_ZIP_MEMBERS:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"ZIP archive has {len(members)} entries, more than the maximum of {MAX_ZIP_MEMBERS}"
+                )
+
+            for index, member in enumerate(members):
+                filename = os.path.basename(member.filename)
+                if member.is_dir() or not filename.lower().endswith(".pdf") or filename.startswith("._"):
+                    continue
+
+                member_path = f"{path_prefix}_{index}_{filename}"
+                extracted.append((filename, member_path))
+                written = 0
+
+                # Count bytes as they are inflated rather than trusting the header
+                with archive.open(member) as source, open(member_path, "wb") as target:
+                    while True:
+                        chunk = source.read(UPLOAD_CHUNK_SIZE)
+                        if not chunk:
+                            break
+
+                        written += len(chunk)
+                        inflated += len(chunk)
+                        if written > max_bytes:
+                            raise HTTPException(
+                                status_code=413,
+                                detail=f"{filename} exceeds maximum upload size of {MAX_UPLOAD_SIZE_MB} MB"
+                            )
+                        if inflated > max_total_bytes:
+                            raise HTTPException(
+                                status_code=413,
+                                detail=f"Upload exceeds maximum batch size of {MAX_BATCH_UPLOAD_SIZE_MB} MB once inflated"
+                            )
+                        if inflated > max_archive_bytes:
+                            raise HTTPException(
+                                status_code=413,
+                                detail=f"ZIP archive inflates to more than {MAX_ZIP_INFLATED_MB} MB"
+                            )
+
+                        target.write(chunk)
+    except Exception:
+        for _, member_path in extracted:
+            if os.path.exists(member_path):
+                os.remove(member_path)
+        raise
+
+    return extracted, inflated
+
+
+def start_ingestion(job_id: str, ingestion_id: str, files: List[Tuple[str, str]]) -> Dict[str, Any]:
+    """Record an ingestion for saved files and start parsing them in the background"""
+
+    jobs_db[job_id]["ingestions"][ingestion_id] = {
+        "ingestion_id": ingestion_id,
+        "filename": ", ".join(filename for filename, _ in files),
+        "status": "queued",
+        "pages_done": 0,
+        "pages_total": 0,
+        "resumes_added": 0,
+        "pages_per_second": 0.0,
+        "error": None,
+        "files": [
+            {
+                "filename": filename,
+                "status": "queued",
+                "pages_done": 0,
+                "pages_total": 0,
+                "resumes": 0,
+                "seconds": 0.0,
+                "error": None
+            }
+            for filename, _ in files
+        ]
+    }
+    # A running shortlist keeps reporting its own progress
+    if jobs_db[job_id]["status"] not in SHORTLISTING_STATUSES:
+        jobs_db[job_id]["status"] = "ingesting"
+
+    ingestion_tasks[ingestion_id] = asyncio.create_task(
+        run_ingestion(job_id, ingestion_id, [file_path for _, file_path in files])
+    )
+
+    return {
+        "message": "Upload received, extracting resumes in the background",
+        "ingestion_id": ingestion_id,
+        "status": "queued",
+        "files": len(files)
+    }
+
+
+@app.post("/api/jobs/{job_id}/upload-resumes", status_code=202)
 async def upload_resumes(job_id: str, file: UploadFile = File(...)):
-    """Upload a PDF containing multiple resumes"""
+    """Upload a PDF containing multiple resumes; parsing continues in the background"""
 
     if job_id not in jobs_db:
         raise HTTPException(status_code=404, detail="Job not found")
 
-    # Save uploaded file
-    file_path = os.path.join(UPLOAD_DIR, f"{job_id}_{file.filename}")
+    ingestion_id = str(uuid.uuid4())
+
+    # Save uploaded file - the ingestion id keeps earlier uploads with the
+    # same name intact, since their resumes' cv_path points into them
+    file_path = os.path.join(UPLOAD_DIR, f"{job_id}_{ingestion_id[:8]}_{os.path.basename(file.filename)}")
 
     try:
-        with open(file_path, "wb") as f:
-            content = await file.read()
-            f.write(content)
+        await save_upload(file, file_path)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error processing file: {str(e)}")
+
+    return start_ingestion(job_id, ingestion_id, [(file.filename, file_path)])
+
+
+@app.post("/api/jobs/{job_id}/upload-resumes/batch", status_code=202)
+async def upload_resumes_batch(job_id: str, files: List[UploadFile] = File(...)):
+    """Upload many PDFs, or ZIP archives of PDFs, in one request"""
+
+    if job_id not in jobs_db:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    for file in files:
+        if not file.filename.lower().endswith((".pdf", ".zip")):
+            raise HTTPException(status_code=400, detail=f"Unsupported file type: {file.filename}")
+
+    ingestion_id = str(uuid.uuid4())
+    saved: List[Tuple[str, str]] = []
+    # Bytes this request may still put on disk, uploaded or inflated
+    budget = MAX_BATCH_UPLOAD_SIZE_MB * 1024 * 1024
+
+    try:
+        for index, file in enumerate(files):
+            filename = os.path.basename(file.filename)
+            file_path = os.path.join(UPLOAD_DIR, f"{job_id}_{ingestion_id[:8]}_{index}_{filename}")
+            budget -= await save_upload(file, file_path)
+
+            if filename.lower().endswith(".zip"):
+                try:
+                    # Inflating is blocking work, keep it off the event loop
+                    members, inflated = await asyncio.to_thread(
+                        extract_zip_pdfs, file_path, file_path[:-len(".zip")], budget
+                    )
+                    saved.extend(members)
+                    budget -= inflated
+                finally:
+                    os.remove(file_path)
+            else:
+                saved.append((filename, file_path))
+
+    except Exception as e:
+        for _, file_path in saved:
+            if os.path.exists(file_path):
+                os.remove(file_path)
+
+        if isinstance(e, HTTPException):
+            raise
+        if isinstance(e, zipfile.BadZipFile):
+            raise HTTPException(status_code=400, detail=f"Invalid ZIP archive: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error processing file: {str(e)}")
 
-        # Extract resumes from PDF
-        resumes = resume_parser.extract_resumes_from_pdf(file_path)
+    if not saved:
+        raise HTTPException(status_code=400, detail="No PDF files found in upload")
 
-        # Store resumes
+    return start_ingestion(job_id, ingestion_id, saved)
+
+
+async def run_ingestion(job_id: str, ingestion_id: str, file_paths: List[str]):
+    """Parse uploaded PDFs in the ingestion pool and add their resumes to the job"""
+
+    ingestion = jobs_db[job_id]["ingestions"][ingestion_id]
+    file_entries = ingestion["files"]
+    loop = asyncio.get_running_loop()
+
+    # A big batch shouldn't queue every file ahead of other jobs' uploads
+    semaphore = asyncio.Semaphore(INGESTION_WORKERS)
+
+    def extract_and_tokenize(file_path: str, progress_callback) -> Tuple[List[Any], List[Dict[str, int]], Any]:
+        resumes = resume_parser.extract_resumes_from_pdf(file_path, progress_callback)
+        texts = [text_store.get_text(resume) for resume in resumes]
+
+        # Tokenised and encoded here, in the ingestion pool, so the event loop only appends to indexes
+        vectors = semantic_encoder.encode_many(texts) if semantic_encoder else None
+        return resumes, [term_counts(text) for text in texts], vectors
+
+    async def ingest_file(entry: Dict[str, Any], file_path: str) -> Tuple[List[Any], List[Dict[str, int]], Any]:
+        def report_progress(pages_done: int, pages_total: int):
+            # Called from the ingestion thread; plain assignments are safe to share
+            entry["pages_done"] = pages_done
+            entry["pages_total"] = pages_total
+            ingestion["pages_done"] = sum(e["pages_done"] for e in file_entries)
+            ingestion["pages_total"] = sum(e["pages_total"] for e in file_entries)
+
+        async with semaphore:
+            entry["status"] = "running"
+            start_time = time.perf_counter()
+
+            try:
+                resumes, documents, vectors = await loop.run_in_executor(
+                    ingestion_executor,
+                    extract_and_tokenize,
+                    file_path,
+                    report_progress
+                )
+            except Exception as e:
+                # One bad file doesn't fail the rest of the batch
+                print(f"Error ingesting {file_path}: {e}")
+                entry["status"] = "error"
+                entry["error"] = str(e)
+                return [], [], None
+            finally:
+                entry["seconds"] = round(time.perf_counter() - start_time, 3)
+
+            entry["resumes"] = len(resumes)
+            entry["status"] = "completed"
+            return resumes, documents, vectors
+
+    try:
+        ingestion["status"] = "running"
+        start_time = time.perf_counter()
+
+        results = await asyncio.gather(*(
+            ingest_file(entry, file_path) for entry, file_path in zip(file_entries, file_paths)
+        ))
+
+        elapsed = time.perf_counter() - start_time
+
+        # Store resumes in file order with a single extend on the event loop,
+        # so readers see the whole batch or none of it
+        resumes = [resume for file_resumes, _, _ in results for resume in file_resumes]
         resumes_db[job_id].extend(resumes)
+        cv_paths_db[job_id].update(resume.cv_path for resume in resumes)
+        resume_indexes[job_id].add(resumes)
+        bm25_indexes[job_id].add([document for _, file_documents, _ in results for document in file_documents])
+
+        semantic_index = semantic_indexes.get(job_id)
+        if semantic_index is not None:
+            vectors = [file_vectors for _, _, file_vectors in results if file_vectors is not None]
+            # Adding may retrain the clusters over the whole pool, so it runs in the
+            # ingestion pool; the lock keeps queries and other uploads' adds (which
+            # must follow the order of resumes_db) from seeing it half done
+            async with semantic_locks[job_id]:
+                await loop.run_in_executor(
+                    ingestion_executor,
+                    semantic_index.add,
+                    np.concatenate(vectors) if vectors else np.zeros((0, semantic_index.dim))
+                )
 
         # Update job status
         jobs_db[job_id]["total_resumes"] = len(resumes_db[job_id])
         jobs_db[job_id]["resumes_in_review"] = len(resumes_db[job_id])
-        jobs_db[job_id]["status"] = "uploaded"
 
-        return {
-            "message": f"Uploaded and processed {len(resumes)} resumes",
-            "total_resumes": jobs_db[job_id]["total_resumes"]
-        }
+        ingestion["resumes_added"] = len(resumes)
+        ingestion["pages_per_second"] = round(ingestion["pages_total"] / elapsed, 1) if elapsed > 0 else 0.0
+
+        failed = [entry for entry in file_entries if entry["status"] == "error"]
+        if failed and len(failed) == len(file_entries):
+            ingestion["status"] = "error"
+            ingestion["error"] = failed[0]["error"]
+        else:
+            ingestion["status"] = "completed"
+            if failed:
+                ingestion["error"] = f"{len(failed)} of {len(file_entries)} files could not be parsed"
+
 
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error processing file: {str(e)}")
+        print(f"Error ingesting {ingestion_id}: {e}")
+        ingestion["status"] = "error"
+        ingestion["error"] = str(e)
+
+    finally:
+        ingestion_tasks.pop(ingestion_id, None)
+
+        if jobs_db[job_id]["status"] == "ingesting" and not ingestions_in_progress(job_id):
+            jobs_db[job_id]["status"] = "uploaded" if resumes_db[job_id] else "pending"
+
+
+def semantic_candidates(job_id: str, job_posting: JobPosting) -> Optional[np.ndarray]:
+    """
+    Ids of the resumes nearest to the job description, or None when the
+    prefilter is disabled or the pool is small enough to score in full
+    """
+    index = semantic_indexes.get(job_id)
+    if index is None or len(index) <= SEMANTIC_PREFILTER_SIZE:
+        return None
+
+    query = " ".join([job_posting.job_title, job_posting.description] + job_posting.required_tech_stack)
+    candidate_ids, _ = index.query(semantic_encoder.encode(query), SEMANTIC_PREFILTER_SIZE)
+    return candidate_ids
+
+
+def ingestions_in_progress(job_id: str) -> int:
+    """Number of uploads for a job that are still being parsed"""
+    return sum(
+        1 for ingestion in jobs_db[job_id]["ingestions"].values()
+        if ingestion["status"] in ("queued", "running")
+    )
+
+
+@app.get("/api/jobs/{job_id}/ingestions/{ingestion_id}")
+async def get_ingestion_status(job_id: str, ingestion_id: str):
+    """Get the progress of one resume upload"""
+
+    if job_id not in jobs_db:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    ingestion = jobs_db[job_id]["ingestions"].get(ingestion_id)
+    if not ingestion:
+        raise HTTPException(status_code=404, detail="Ingestion not found")
+
+    return {**ingestion, "total_resumes": jobs_db[job_id]["total_resumes"]}
 
 
 @app.post("/api/jobs/{job_id}/start-shortlisting")
-async def start_shortlisting(job_id: str, background_tasks: BackgroundTasks):
-    """Start the two-phase shortlisting process"""
+async def start_shortlisting(job_id: str, background_tasks: BackgroundTasks, incremental: bool = False):
+    """
+    Start the two-phase shortlisting process
+
+    With incremental=true, a job that was shortlisted before only scores the
+    resumes uploaded since, and only new Phase 1 candidates go to the LLM.
+    """
 
     if job_id not in jobs_db:
         raise HTTPException(status_code=404, detail="Job not found")
 
+    if ingestions_in_progress(job_id):
+        raise HTTPException(status_code=409, detail="Resumes are still being extracted, try again shortly")
+
     if not resumes_db.get(job_id):
         raise HTTPException(status_code=400, detail="No resumes uploaded for this job")
 
     # Start shortlisting in background
-    background_tasks.add_task(run_shortlisting_process, job_id)
+    background_tasks.add_task(run_shortlisting_process, job_id, incremental)
 
     jobs_db[job_id]["status"] = "processing"
 
     return {
         "message": "Shortlisting process started",
-        "status": "processing"
+        "status": "processing",
+        "incremental": incremental and jobs_db[job_id]["phase1_scored"] > 0
     }
 
 
-async def run_shortlisting_process(job_id: str):
-    """Run the complete two-phase shortlisting process"""
+async def run_shortlisting_process(job_id: str, incremental: bool = False):
+    """
+    Run the complete two-phase shortlisting process
+
+    Incrementally (after an earlier run), Phase 1 merges the resumes added
+    since into the retained shortlist and Phase 2 only reviews candidates
+    without a review yet.
+    """
 
     try:
         job_data = jobs_db[job_id]
         job_posting = JobPosting(**job_data["job_posting"])
-        resumes = resumes_db[job_id]
+        index = resume_indexes[job_id]
+        pool_size = len(index)
+        incremental = incremental and job_data["phase1_scored"] > 0
 
         # Phase 1: Keyword and experience-based shortlisting
         jobs_db[job_id]["status"] = "phase1"
 
-        phase1_results = phase1_shortlister.shortlist(
-            resumes,
-            job_posting,
-            job_posting.phase1_shortlist_count
-        )
+        # Lexical relevance of each resume to the job description
+        relevance = job_relevance(job_id, job_posting.description) if BM25_WEIGHT > 0 else None
+
+        if incremental:
+            phase1_ids = phase1_shortlister.shortlist_incremental_ids(
+                index,
+                job_posting,
+                job_posting.phase1_shortlist_count,
+                job_data["phase1_ids"],
+                job_data["phase1_scored"],
+                relevance=relevance
+            )
+            print(f"Phase 1: Merged {pool_size - job_data['phase1_scored']} new resumes into the shortlist")
+        else:
+            async with semantic_locks[job_id]:
+                candidate_ids = semantic_candidates(job_id, job_posting)
 
+            if candidate_ids is not None:
+                phase1_ids = phase1_shortlister.shortlist_among_ids(
+                    index,
+                    job_posting,
+                    job_posting.phase1_shortlist_count,
+                    candidate_ids,
+                    relevance=relevance
+                )
+                print(f"Phase 1: Semantic prefilter kept {len(candidate_ids)} of {pool_size} resumes")
+            else:
+                phase1_ids = phase1_shortlister.shortlist_indexed_ids(
+                    index,
+                    job_posting,
+                    job_posting.phase1_shortlist_count,
+                    relevance=relevance
+                )
+            job_data["reviews"] = {}
+
+        phase1_results = [index.resumes[i] for i in phase1_ids]
+        reviews = job_data["reviews"]
+        to_review = [resume for resume in phase1_results if resume.cv_path not in reviews]
+
+        jobs_db[job_id]["phase1_ids"] = phase1_ids
+        jobs_db[job_id]["phase1_scored"] = pool_size
         jobs_db[job_id]["phase1_results"] = phase1_results
         jobs_db[job_id]["phase1_completed"] = len(phase1_results)
-        jobs_db[job_id]["resumes_in_review"] = len(phase1_results)
+        jobs_db[job_id]["resumes_in_review"] = len(to_review)
 
         # Phase 2: LLM-based comprehensive review
         jobs_db[job_id]["status"] = "phase2"
 
-        phase2_response = await phase2_shortlister.shortlist(
-            phase1_results,
+        # Candidates reviewed before already count towards an early stop
+        confident = sum(
+            1 for resume in phase1_results
+            if reviews.get(resume.cv_path) and PHASE2_EARLY_STOP_CONFIDENCE
+            and reviews[resume.cv_path].confidence >= PHASE2_EARLY_STOP_CONFIDENCE
+        )
+        new_reviews, skipped = await phase2_shortlister.review_many(
+            to_review,
             job_posting,
+            stop_after=job_posting.phase2_shortlist_count - confident
+        )
+        reviews.update(new_reviews)
+        jobs_db[job_id]["llm_calls_saved"] = skipped
+
+        phase2_response = phase2_shortlister.rank(
+            [reviews.get(resume.cv_path) for resume in phase1_results],
             job_posting.phase2_shortlist_count
         )
 
@@ -197,6 +766,95 @@ async def run_shortlisting_process(job_id: str):
         jobs_db[job_id]["error_details"] = error_details
 
 
+def job_relevance(job_id: str, description: str):
+    """BM25 scores of a job's resumes for its description, cached until more resumes arrive"""
+    index = bm25_indexes[job_id]
+    cached = relevance_cache.get(job_id)
+
+    if cached and cached[0] == len(index) and cached[1] == description:
+        return cached[2]
+
+    scores = index.score(description)
+    relevance_cache[job_id] = (len(index), description, scores)
+    return scores
+
+
+@app.post("/api/jobs/{job_id}/rerank")
+async def rerank_job(job_id: str, request: RerankRequest):
+    """
+    What-if Phase 1 ranking with other skills, thresholds, count or weights
+
+    Uses the job's skill/experience index and cached BM25 scores, so neither
+    the parser nor the LLM is involved and the job itself is not changed.
+    """
+
+    if job_id not in jobs_db:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    start_time = time.perf_counter()
+    job_posting = JobPosting(**jobs_db[job_id]["job_posting"])
+    overrides = {
+        field: value for field, value in request.model_dump().items()
+        if value is not None and field in JobPosting.model_fields
+    }
+    job_posting = job_posting.model_copy(update=overrides)
+
+    weights = {
+        "skill_weight": phase1_shortlister.skill_weight if request.skill_weight is None else request.skill_weight,
+        "experience_weight": (
+            phase1_shortlister.experience_weight if request.experience_weight is None else request.experience_weight
+        ),
+        "relevance_weight": BM25_WEIGHT if request.relevance_weight is None else request.relevance_weight
+    }
+    if any(weight < 0 for weight in weights.values()) or weights["relevance_weight"] > 1:
+        raise HTTPException(status_code=400, detail="Weights must be >= 0, and relevance_weight <= 1")
+    if job_posting.phase1_shortlist_count < 0:
+        raise HTTPException(status_code=400, detail="phase1_shortlist_count must be >= 0")
+
+    shortlister = Phase1Shortlister(**weights)
+    index = resume_indexes[job_id]
+    relevance = job_relevance(job_id, job_posting.description) if weights["relevance_weight"] > 0 else None
+
+    ranked_ids = shortlister.shortlist_indexed_ids(
+        index, job_posting, job_posting.phase1_shortlist_count, relevance=relevance
+    )
+    scores = shortlister.score_ids(index, job_posting, ranked_ids, relevance) if ranked_ids else []
+
+    required_skills = set([skill.lower() for skill in job_posting.required_tech_stack])
+    matcher = get_skill_matcher()
+    candidates = []
+
+    for rank, (resume_id, score) in enumerate(zip(ranked_ids, scores), 1):
+        resume = index.resumes[resume_id]
+        resume_skills = set(matcher.normalized_skills(
+            resume.skills, resume.features.skill_ids if resume.features else None
+        ))
+        candidates.append({
+            "rank": rank,
+            "name": resume.name,
+            "email": resume.email,
+            "cv_path": resume.cv_path,
+            "score": round(float(score), 4),
+            "matched_skills": sorted(required_skills & resume_skills),
+            "missing_skills": sorted(required_skills - resume_skills),
+            "experience": resume.experience,
+            "meets_minimum_experience": (
+                resume.experience is not None and resume.experience >= job_posting.minimum_experience
+            )
+        })
+
+    return {
+        "job_id": job_id,
+        "required_tech_stack": job_posting.required_tech_stack,
+        "minimum_experience": job_posting.minimum_experience,
+        "phase1_shortlist_count": job_posting.phase1_shortlist_count,
+        **weights,
+        "total_resumes": len(index),
+        "milliseconds": round((time.perf_counter() - start_time) * 1000, 2),
+        "candidates": candidates
+    }
+
+
 @app.get("/api/jobs/{job_id}/status")
 async def get_job_status(job_id: str):
     """Get the current status of a job"""
@@ -205,6 +863,7 @@ async def get_job_status(job_id: str):
         raise HTTPException(status_code=404, detail="Job not found")
 
     job_data = jobs_db[job_id]
+    ingestions = job_data["ingestions"].values()
 
     return JobStatus(
         job_id=job_id,
@@ -215,7 +874,13 @@ async def get_job_status(job_id: str):
         phase2_completed=job_data["phase2_completed"],
         shortlisted_count=job_data["shortlisted_count"],
         status=job_data["status"],
-        created_at=datetime.fromisoformat(job_data["created_at"])
+        created_at=datetime.fromisoformat(job_data["created_at"]),
+        ingestions_in_progress=ingestions_in_progress(job_id),
+        pages_ingested=sum(ingestion["pages_done"] for ingestion in ingestions),
+        pages_total=sum(ingestion["pages_total"] for ingestion in ingestions),
+        new_resumes=job_data["total_resumes"] - job_data["phase1_scored"],
+        reviewed_resumes=len(job_data["reviews"]),
+        llm_calls_saved=job_data["llm_calls_saved"]
     )
 
 
@@ -236,6 +901,31 @@ async def get_shortlisted_candidates(job_id: str):
     }
 
 
+@app.get("/api/jobs/{job_id}/cv")
+async def get_candidate_cv(job_id: str, cv_path: str):
+    """Get a single candidate's CV as a PDF, produced on first request"""
+
+    if job_id not in jobs_db:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    # Only serve pages that belong to this job's uploaded resumes
+    if cv_path not in cv_paths_db.get(job_id, ()):
+        raise HTTPException(status_code=404, detail="CV not found")
+
+    try:
+        # The first request for a page writes its PDF, so keep it off the event loop
+        pdf_path = await asyncio.to_thread(cv_store.get_pdf_path, cv_path)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error producing CV: {str(e)}")
+
+    page_num = CVStore.parse_ref(cv_path)[1] + 1
+    return FileResponse(
+        pdf_path,
+        media_type="application/pdf",
+        filename=f"resume_page_{page_num}.pdf"
+    )
+
+
 @app.get("/api/jobs")
 async def list_jobs():
     """List all jobs"""
@@ -254,6 +944,140 @@ async def list_jobs():
     return {"jobs": jobs}
 
 
+def resolve_batch_jobs(job_ids: Optional[List[str]], pool_job_ids: Optional[List[str]]):
+    """
+    Job ids to rank for, the shared resume pool of pool_job_ids, and the
+    sources of each pool resume
+
+    The same resume uploaded to several jobs has the same text fingerprint,
+    so it is scored once; sources[i] maps every pool job that has resume i
+    to that job's own cv_path for it.
+    """
+    job_ids = list(jobs_db) if job_ids is None else job_ids
+    pool_job_ids = job_ids if pool_job_ids is None else pool_job_ids
+
+    missing = [job_id for job_id in job_ids + pool_job_ids if job_id not in jobs_db]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Job not found: {missing[0]}")
+
+    pool: List[Any] = []
+    sources: List[Dict[str, str]] = []
+    positions: Dict[str, int] = {}
+    for job_id in pool_job_ids:
+        for resume in resumes_db.get(job_id, []):
+            key = resume.features.fingerprint if resume.features else resume.cv_path
+            position = positions.get(key)
+            if position is None:
+                position = positions[key] = len(pool)
+                pool.append(resume)
+                sources.append({})
+            sources[position].setdefault(job_id, resume.cv_path)
+
+    return job_ids, pool, sources
+
+
+def pool_cv_path(source: Dict[str, str], job_id: str) -> Tuple[str, str]:
+    """(job, cv_path) to show a pool resume under for job_id: the job's own copy if it has one"""
+    owner = job_id if job_id in source else next(iter(source))
+    return owner, source[owner]
+
+
+@app.post("/api/batch/shortlist")
+async def batch_shortlist(request: BatchShortlistRequest):
+    """Score many jobs against one resume pool in a single batch and return each job's top resumes"""
+
+    job_ids, pool, sources = resolve_batch_jobs(request.job_ids, request.pool_job_ids)
+    job_postings = [JobPosting(**jobs_db[job_id]["job_posting"]) for job_id in job_ids]
+    positions = {id(resume): i for i, resume in enumerate(pool)}
+
+    def rank():
+        return phase1_shortlister.shortlist_many(pool, job_postings, request.top_k)
+
+    start_time = time.perf_counter()
+    # Scoring a large pool is CPU-bound, so keep it off the event loop
+    shortlists = await asyncio.get_running_loop().run_in_executor(ingestion_executor, rank)
+    elapsed = time.perf_counter() - start_time
+
+    return {
+        "pool_size": len(pool),
+        "seconds": round(elapsed, 3),
+        "jobs": [
+            {
+                "job_id": job_id,
+                "job_title": job_posting.job_title,
+                "top": [
+                    {
+                        "name": resume.name,
+                        "email": resume.email,
+                        # The job's own copy of the resume, so GET /api/jobs/{pool_job_id}/cv serves it
+                        "pool_job_id": owner,
+                        "cv_path": cv_path,
+                        "skills": resume.skills,
+                        "experience": resume.experience,
+                        "score": round(score, 4)
+                    }
+                    for resume, score in shortlist
+                    for owner, cv_path in [pool_cv_path(sources[positions[id(resume)]], job_id)]
+                ]
+            }
+            for job_id, job_posting, shortlist in zip(job_ids, job_postings, shortlists)
+        ]
+    }
+
+
+@app.post("/api/batch/candidate-fit")
+async def candidate_fit(request: CandidateFitRequest):
+    """Rank jobs by how well one candidate of the pool fits them"""
+
+    job_ids, pool, sources = resolve_batch_jobs(request.job_ids, request.pool_job_ids)
+    job_postings = [JobPosting(**jobs_db[job_id]["job_posting"]) for job_id in job_ids]
+
+    # Any job's copy of a resume finds it, whichever copy stands for it in the pool
+    resume_id = next((i for i, source in enumerate(sources) if request.cv_path in source.values()), None)
+    if resume_id is None:
+        raise HTTPException(status_code=404, detail="Candidate not found in the resume pool")
+
+    def rank():
+        return phase1_shortlister.roles_for_candidate(ResumeMatrix(pool), job_postings, resume_id)
+
+    roles = await asyncio.get_running_loop().run_in_executor(ingestion_executor, rank)
+
+    return {
+        "name": pool[resume_id].name,
+        "cv_path": request.cv_path,
+        "pool_size": len(pool),
+        "roles": [
+            {
+                "job_id": job_ids[role["job"]],
+                "job_title": job_postings[role["job"]].job_title,
+                "score": round(role["score"], 4),
+                "rank": role["rank"],
+                "meets_minimum_experience": role["meets_minimum_experience"],
+                "in_phase1_shortlist": role["in_phase1_shortlist"]
+            }
+            for role in roles
+        ]
+    }
+
+
+@app.get("/api/cache/stats")
+async def get_cache_stats():
+    """Get parsed-resume cache counters"""
+    if not parse_cache:
+        return {"enabled": False}
+
+    return {"enabled": True, **parse_cache.stats()}
+
+
+@app.get("/api/cache/review-stats")
+async def get_review_cache_stats():
+    """Get LLM review cache counters"""
+    if not review_cache:
+        return {"enabled": False}
+
+    return {"enabled": True, **review_cache.stats()}
+
+
 @app.get("/api/mcp/tools")
 async def get_mcp_tools():
     """Get MCP tools definition"""
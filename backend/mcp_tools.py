@@ -1,5 +1,7 @@
 import json
 from typing import List, Dict, Any, Optional
+from text_store import ResumeTextStore
+from skill_matcher import get_skill_matcher
 
 
 class MCPResumeTools:
@@ -8,7 +10,8 @@ class MCPResumeTools:
     These tools make resume data available to the LLM agent
     """
 
-    def __init__(self):
+    def __init__(self, text_store: Optional[ResumeTextStore] = None):
+        self.text_store = text_store
         self.tools = self._define_tools()
 
     def _define_tools(self) -> List[Dict[str, Any]]:
@@ -118,8 +121,14 @@ class MCPResumeTools:
         if not resume:
             return {"error": "Resume not found"}
 
+        # Text is loaded lazily when the resume only carries a text_ref
+        if self.text_store:
+            content = self.text_store.get_text(resume)
+        else:
+            content = resume.get("text_content") or ""
+
         return {
-            "content": resume.get("text_content", ""),
+            "content": content,
             "name": resume.get("name", "Unknown"),
             "email": resume.get("email")
         }
@@ -175,7 +184,11 @@ class MCPResumeTools:
         if not resume:
             return {"error": "Resume not found"}
 
-        resume_skills = set([s.lower() for s in resume.get("skills", [])])
+        # Skill ids precomputed at parse time avoid lowercasing every skill again
+        features = resume.get("features")
+        resume_skills = set(get_skill_matcher().normalized_skills(
+            resume.get("skills", []), features["skill_ids"] if features else None
+        ))
         required_skills_set = set([s.lower() for s in required_skills])
 
         matched_skills = resume_skills.intersection(required_skills_set)
@@ -13,13 +13,22 @@ class JobPosting(BaseModel):
     phase2_shortlist_count: int
 
 
+class ResumeFeatures(BaseModel):
+    """Normalised resume features, computed once when the resume is parsed"""
+    skill_ids: List[int] = []  # Taxonomy ids of the resume's skills (see SkillMatcher.skill_ids)
+    experience: Optional[int] = None
+    fingerprint: str  # Hash of the whitespace- and case-normalised text
+
+
 class Resume(BaseModel):
     name: str
     email: Optional[str] = None
     skills: List[str] = []
     experience: Optional[int] = None
     cv_path: str
-    text_content: str
+    text_content: Optional[str] = None
+    text_ref: Optional[str] = None  # Handle into ResumeTextStore when the text is kept off-heap
+    features: Optional[ResumeFeatures] = None
 
 
 class ShortlistedCandidate(BaseModel):
@@ -34,6 +43,7 @@ class ShortlistedCandidate(BaseModel):
 
 class ShortlistResponse(BaseModel):
     shortlisted: List[ShortlistedCandidate]
+    llm_calls_saved: int = 0  # Candidates not sent to the LLM because Phase 2 stopped early
 
 
 class JobStatus(BaseModel):
@@ -44,5 +54,33 @@ class JobStatus(BaseModel):
     phase1_completed: int
     phase2_completed: int
     shortlisted_count: int
-    status: str  # "pending", "phase1", "phase2", "completed"
+    status: str  # "pending", "ingesting", "uploaded", "phase1", "phase2", "completed"
     created_at: datetime
+    ingestions_in_progress: int = 0
+    pages_ingested: int = 0
+    pages_total: int = 0
+    new_resumes: int = 0  # Uploaded since the last Phase 1 run
+    reviewed_resumes: int = 0  # Resumes with a Phase 2 review on record
+    llm_calls_saved: int = 0  # Phase 2 reviews skipped by the early stop in the last run
+
+
+class BatchShortlistRequest(BaseModel):
+    job_ids: Optional[List[str]] = None  # Jobs to rank for; defaults to every job
+    pool_job_ids: Optional[List[str]] = None  # Jobs whose resumes form the pool; defaults to job_ids
+    top_k: Optional[int] = None  # Defaults to each job's phase1_shortlist_count
+
+
+class CandidateFitRequest(BaseModel):
+    cv_path: str
+    job_ids: Optional[List[str]] = None
+    pool_job_ids: Optional[List[str]] = None
+
+
+class RerankRequest(BaseModel):
+    """What-if Phase 1 settings; anything left out keeps the job's value"""
+    required_tech_stack: Optional[List[str]] = None
+    minimum_experience: Optional[int] = None
+    phase1_shortlist_count: Optional[int] = None
+    skill_weight: Optional[float] = None
+    experience_weight: Optional[float] = None
+    relevance_weight: Optional[float] = None
@@ -1,55 +1,463 @@
-from typing import List, Dict, Tuple
+from typing import Any, List, Dict, Tuple, Optional, Iterator
+from itertools import islice
+import heapq
+import numpy as np
 from models import Resume, JobPosting
+from resume_index import ResumeIndex
+from skill_matcher import get_skill_matcher
 
 
+class ResumeMatrix:
+    """
+    A resume pool encoded for batch scoring
+
+    Each resume is a row of a bit-packed matrix over the pool's skill
+    vocabulary (lowercased skill names), next to an experience vector with
+    NaN for resumes without a stated experience. The taxonomy's skills come
+    first, with their skill ids as columns, so precomputed resume features
+    are used as they are; other skills get columns after them.
+    """
+
+    def __init__(self, resumes: List[Resume]):
+        self.vocabulary: Dict[str, int] = dict(get_skill_matcher().key_ids)
+        rows, cols = [], []
+
+        for i, resume in enumerate(resumes):
+            if resume.features is not None:
+                resume_cols = resume.features.skill_ids
+            else:
+                resume_cols = {
+                    self.vocabulary.setdefault(skill.lower(), len(self.vocabulary)) for skill in resume.skills
+                }
+            rows.extend([i] * len(resume_cols))
+            cols.extend(resume_cols)
+
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+
+        # 8 skills per byte, most significant bit first (np.packbits order)
+        self.skill_bits = np.zeros((len(resumes), (len(self.vocabulary) + 7) // 8), dtype=np.uint8)
+        np.bitwise_or.at(self.skill_bits, (rows, cols >> 3), (128 >> (cols & 7)).astype(np.uint8))
+
+        self.experience = np.array(
+            [np.nan if resume.experience is None else resume.experience for resume in resumes],
+            dtype=np.float64
+        )
+
+    def __len__(self) -> int:
+        return len(self.experience)
+
+    def count_matches(self, skills: List[str]) -> np.ndarray:
+        """Number of the given (distinct, lowercased) skills each resume has"""
+        counts = np.zeros(len(self), dtype=np.int64)
+
+        for skill in skills:
+            col = self.vocabulary.get(skill)
+            if col is not None:
+                counts += (self.skill_bits[:, col >> 3] >> (7 - (col & 7))) & 1
+
+        return counts
+
+    def count_matches_many(self, skill_sets: List[List[str]]) -> np.ndarray:
+        """
+        count_matches for several skill lists at once, as a (lists, resumes)
+        matrix; the bits of every column the lists use are extracted once
+        and shared by all of them (the other columns are never unpacked)
+        """
+        used = sorted({
+            self.vocabulary[skill] for skills in skill_sets for skill in skills if skill in self.vocabulary
+        })
+        row_of = {col: row for row, col in enumerate(used)}
+
+        # Row r holds every resume's bit for vocabulary column used[r]
+        cols = np.asarray(used, dtype=np.int64)
+        shifts = (7 - (cols & 7)).astype(np.uint8)
+        columns = np.ascontiguousarray(((self.skill_bits[:, cols >> 3] >> shifts) & 1).T)
+
+        # One byte per count is enough unless a list has more than 255 skills
+        widest = max((len(skills) for skills in skill_sets), default=0)
+        counts = np.zeros((len(skill_sets), len(self)), dtype=np.uint8 if widest < 256 else np.int64)
+
+        for j, skills in enumerate(skill_sets):
+            for skill in skills:
+                col = self.vocabulary.get(skill)
+                if col is not None:
+                    counts[j] += columns[row_of[col]]
+
+        return counts
+
 class Phase1Shortlister:
     """
     Phase 1: Keyword-based and experience-based shortlisting
     No LLM required
+
+    The score is skill_weight x the share of required skills matched plus
+    experience_weight x the experience score (0.7 and 0.3 by default).
+    With a relevance_weight above 0, a text relevance score (BM25 of the
+    job description) passed to shortlist() is blended into the score.
     """
 
-    def __init__(self):
-        pass
+    def __init__(self, relevance_weight: float = 0.0, skill_weight: float = 0.7, experience_weight: float = 0.3):
+        self.relevance_weight = relevance_weight
+        self.skill_weight = skill_weight
+        self.experience_weight = experience_weight
 
     def shortlist(
         self,
         resumes: List[Resume],
         job_posting: JobPosting,
-        target_count: int
+        target_count: int,
+        matrix: Optional[ResumeMatrix] = None,
+        relevance: Optional[np.ndarray] = None
     ) -> List[Resume]:
         """
         Shortlist resumes based on:
         1. Keyword matching with required tech stack
         2. Minimum experience requirement
+        3. Text relevance to the job, if given (one score per resume)
+
+        Pass a prebuilt ResumeMatrix for these resumes to skip encoding them.
         """
 
-        scored_resumes = []
+        if matrix is None:
+            matrix = ResumeMatrix(resumes)
+        scores = self.blend(self.score_batch(matrix, job_posting), relevance)
+        selected = self.select(scores, matrix.experience, job_posting, target_count)
 
-        for resume in resumes:
-            score = self.calculate_score(resume, job_posting)
-            scored_resumes.append((resume, score))
+        return [resumes[i] for i in selected]
 
-        # Sort by score (descending)
-        scored_resumes.sort(key=lambda x: x[1], reverse=True)
+    def shortlist_many(
+        self,
+        resumes: List[Resume],
+        job_postings: List[JobPosting],
+        target_count: Optional[int] = None,
+        matrix: Optional[ResumeMatrix] = None
+    ) -> List[List[Tuple[Resume, float]]]:
+        """
+        Shortlist one resume pool for many jobs at once
 
-        # Filter by minimum experience
-        filtered_resumes = [
-            (resume, score) for resume, score in scored_resumes
-            if resume.experience is not None and resume.experience >= job_posting.minimum_experience
-        ]
+        Returns, for each job, the same resumes shortlist() would pick, with
+        their scores. target_count defaults to each job's phase1_shortlist_count.
+        """
+        if matrix is None:
+            matrix = ResumeMatrix(resumes)
+
+        shortlists = []
+        for job_posting, scores in zip(job_postings, self._iter_job_scores(matrix, job_postings)):
+            count = job_posting.phase1_shortlist_count if target_count is None else target_count
+            selected = self.select(scores, matrix.experience, job_posting, count)
+            shortlists.append([(resumes[i], float(scores[i])) for i in selected])
+
+        return shortlists
+
+    def roles_for_candidate(
+        self,
+        matrix: ResumeMatrix,
+        job_postings: List[JobPosting],
+        resume_id: int
+    ) -> List[Dict[str, Any]]:
+        """
+        How well one resume of the pool fits each job, best fit first
+
+        Each entry has the job's position in job_postings, the resume's score,
+        its rank in the pool (1 + resumes scoring higher) and whether it makes
+        the job's Phase 1 shortlist.
+        """
+        experience = matrix.experience[resume_id]
+        roles = []
+
+        for j, (job_posting, scores) in enumerate(zip(job_postings, self._iter_job_scores(matrix, job_postings))):
+            shortlisted = self.select(scores, matrix.experience, job_posting, job_posting.phase1_shortlist_count)
+            roles.append({
+                "job": j,
+                "score": float(scores[resume_id]),
+                "rank": int((scores > scores[resume_id]).sum()) + 1,
+                "meets_minimum_experience": bool(experience >= job_posting.minimum_experience),
+                "in_phase1_shortlist": bool((shortlisted == resume_id).any())
+            })
+
+        roles.sort(key=lambda role: role["score"], reverse=True)
+        return roles
+
+    def select(
+        self,
+        scores: np.ndarray,
+        experience: np.ndarray,
+        job_posting: JobPosting,
+        target_count: int
+    ) -> np.ndarray:
+        """Positions of the shortlisted resumes, best first, given their scores"""
+
+        # Candidates that meet minimum experience (NaN compares False)
+        qualified = np.flatnonzero(experience >= job_posting.minimum_experience)
+        selected = self._top_k(qualified, scores, target_count)
 
         # If not enough candidates meet minimum experience, include those without specified experience
-        if len(filtered_resumes) < target_count:
-            no_exp_resumes = [
-                (resume, score) for resume, score in scored_resumes
-                if resume.experience is None
-            ]
-            filtered_resumes.extend(no_exp_resumes)
+        if len(selected) < target_count:
+            no_exp = np.flatnonzero(np.isnan(experience))
+            selected = np.concatenate([selected, self._top_k(no_exp, scores, target_count - len(selected))])
+
+        return selected
+
+    def shortlist_indexed(
+        self,
+        index: ResumeIndex,
+        job_posting: JobPosting,
+        target_count: int,
+        relevance: Optional[np.ndarray] = None
+    ) -> List[Resume]:
+        """Same shortlist as shortlist(), answered from a ResumeIndex"""
+        return [index.resumes[i] for i in self.shortlist_indexed_ids(index, job_posting, target_count, relevance)]
+
+    def shortlist_indexed_ids(
+        self,
+        index: ResumeIndex,
+        job_posting: JobPosting,
+        target_count: int,
+        relevance: Optional[np.ndarray] = None
+    ) -> List[int]:
+        """
+        Ids (pool positions) of the resumes shortlist_indexed() picks
+
+        Only resumes with at least one required skill are scored. Every other
+        resume scores on experience alone, so those are read in rank order
+        from the experience index, and only as many as the shortlist needs.
+        A blended relevance score touches every resume anyway, so then the
+        whole pool is scored from the index arrays.
+        """
+        if target_count <= 0:
+            return []
 
-        # Take top N candidates
-        shortlisted = [resume for resume, score in filtered_resumes[:target_count]]
+        required_skills = set([skill.lower() for skill in job_posting.required_tech_stack])
+        matched_ids, counts = index.matches(list(required_skills))
 
-        return shortlisted
+        if relevance is not None and self.relevance_weight > 0:
+            all_counts = np.zeros(len(index), dtype=np.int64)
+            all_counts[matched_ids] = counts
+            scores = self.blend(
+                self._scores(all_counts, len(required_skills), self._experience_scores(index.experience, job_posting)),
+                relevance
+            )
+            return self.select(scores, index.experience, job_posting, target_count).tolist()
+
+        experience = index.experience[matched_ids]
+        scores = self._scores(counts, len(required_skills), self._experience_scores(experience, job_posting))
+
+        def ranked(positions: np.ndarray, k: int) -> List[Tuple[float, int]]:
+            """(-score, resume id) of the best k matching resumes at these positions"""
+            top = self._top_k(positions, scores, k)
+            return list(zip((-scores[top]).tolist(), matched_ids[top].tolist()))
+
+        qualified = np.flatnonzero(experience >= job_posting.minimum_experience)
+        selected = list(islice(heapq.merge(
+            ranked(qualified, target_count),
+            self._unmatched_by_experience(index, matched_ids, job_posting)
+        ), target_count))
+
+        # If not enough candidates meet minimum experience, include those without specified experience
+        if index.count_at_least(job_posting.minimum_experience) < target_count:
+            missing = target_count - len(selected)
+            no_exp = np.flatnonzero(np.isnan(experience))
+            unmatched_no_exp = (
+                (0.0, resume_id) for resume_id in index.no_experience
+                if not self._contains(matched_ids, resume_id)
+            )
+            selected.extend(islice(heapq.merge(ranked(no_exp, missing), unmatched_no_exp), missing))
+
+        return [resume_id for _, resume_id in selected]
+
+    def shortlist_incremental_ids(
+        self,
+        index: ResumeIndex,
+        job_posting: JobPosting,
+        target_count: int,
+        retained_ids: List[int],
+        new_from: int,
+        relevance: Optional[np.ndarray] = None
+    ) -> List[int]:
+        """
+        Update a shortlist after resumes were appended to the pool
+
+        retained_ids is the previous shortlist (of the first new_from
+        resumes). A resume that missed it is outranked by all of it, so only
+        the retained resumes and the new ones need scoring; the result is the
+        same as shortlisting the whole pool again. With a blended relevance
+        score, which shifts as the pool grows, retained resumes are re-scored
+        but resumes that missed the earlier shortlist are not reconsidered.
+        """
+        candidate_ids = np.union1d(
+            np.asarray(retained_ids, dtype=np.int64),
+            np.arange(new_from, len(index), dtype=np.int64)
+        )
+        return self.shortlist_among_ids(index, job_posting, target_count, candidate_ids, relevance)
+
+    def shortlist_among_ids(
+        self,
+        index: ResumeIndex,
+        job_posting: JobPosting,
+        target_count: int,
+        candidate_ids: np.ndarray,
+        relevance: Optional[np.ndarray] = None
+    ) -> List[int]:
+        """Shortlist (ids, best first) of an indexed pool, considering only candidate_ids"""
+        candidate_ids = np.unique(np.asarray(candidate_ids, dtype=np.int64))
+        scores = self.score_ids(index, job_posting, candidate_ids, relevance)
+        experience = index.experience[candidate_ids]
+
+        # Candidates are in pool order, so ties still resolve by upload order
+        return candidate_ids[self.select(scores, experience, job_posting, target_count)].tolist()
+
+    def score_ids(
+        self,
+        index: ResumeIndex,
+        job_posting: JobPosting,
+        resume_ids: np.ndarray,
+        relevance: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Scores of some resumes of an indexed pool, relevance scaled as for the whole pool"""
+        scores = self.score_batch(ResumeMatrix([index.resumes[i] for i in resume_ids]), job_posting)
+
+        if relevance is not None:
+            best = relevance.max() if len(relevance) else 0.0
+            scores = self.blend(scores, relevance[resume_ids], best=best)
+
+        return scores
+
+    def _unmatched_by_experience(
+        self,
+        index: ResumeIndex,
+        matched_ids: np.ndarray,
+        job_posting: JobPosting
+    ) -> Iterator[Tuple[float, int]]:
+        """
+        (-score, resume id) of qualified resumes without any required skill,
+        best first; ties keep upload order
+        """
+        values = index.experience_descending(job_posting.minimum_experience)
+        i = 0
+
+        while i < len(values):
+            # Experience values that earn the same score form one tie group,
+            # e.g. everything above twice the minimum
+            score = self.experience_score(values[i], job_posting)
+            group = [values[i]]
+            i += 1
+            while i < len(values) and self.experience_score(values[i], job_posting) == score:
+                group.append(values[i])
+                i += 1
+
+            for resume_id in index.ids_with_experience(group):
+                if not self._contains(matched_ids, resume_id):
+                    yield -score, resume_id
+
+    @staticmethod
+    def _contains(sorted_ids: np.ndarray, resume_id: int) -> bool:
+        position = np.searchsorted(sorted_ids, resume_id)
+        return position < len(sorted_ids) and sorted_ids[position] == resume_id
+
+    @staticmethod
+    def _top_k(indices: np.ndarray, scores: np.ndarray, k: int) -> np.ndarray:
+        """
+        The k indices with the highest scores, best first; ties keep upload
+        order, exactly as a stable descending sort would
+        """
+        if k <= 0 or len(indices) == 0:
+            return indices[:0]
+
+        candidate_scores = scores[indices]
+
+        if len(indices) > k:
+            # Partial selection: everything above the k-th best score, then
+            # the earliest of the resumes tied with it
+            threshold = -np.partition(-candidate_scores, k - 1)[k - 1]
+            above = candidate_scores > threshold
+            tied = np.flatnonzero(candidate_scores == threshold)[:k - int(above.sum())]
+            keep = np.concatenate([np.flatnonzero(above), tied])
+            indices, candidate_scores = indices[keep], candidate_scores[keep]
+
+        # Sort by score (descending), then upload order
+        return indices[np.lexsort((indices, -candidate_scores))]
+
+    def blend(
+        self,
+        scores: np.ndarray,
+        relevance: Optional[np.ndarray],
+        best: Optional[float] = None
+    ) -> np.ndarray:
+        """
+        Mix relevance, scaled to 0-1 by the pool's best (the best of relevance
+        unless given), into keyword/experience scores
+        """
+        if relevance is None or self.relevance_weight <= 0:
+            return scores
+
+        if best is None:
+            best = relevance.max() if len(relevance) else 0.0
+        normalized = relevance / best if best > 0 else np.zeros_like(scores)
+
+        return (1 - self.relevance_weight) * scores + self.relevance_weight * normalized
+
+    def score_batch(self, matrix: ResumeMatrix, job_posting: JobPosting) -> np.ndarray:
+        """
+        Scores for a whole resume pool at once - the same formula as
+        calculate_score, evaluated with array operations
+        """
+        required_skills = set([skill.lower() for skill in job_posting.required_tech_stack])
+        matched = matrix.count_matches(list(required_skills))
+
+        return self._scores(matched, len(required_skills), self._experience_scores(matrix.experience, job_posting))
+
+    def score_jobs(self, matrix: ResumeMatrix, job_postings: List[JobPosting]) -> np.ndarray:
+        """
+        Scores of every resume for every job, as a (jobs, resumes) matrix;
+        row j equals score_batch(matrix, job_postings[j])
+        """
+        scores = np.empty((len(job_postings), len(matrix)), dtype=np.float64)
+
+        for j, job_scores in enumerate(self._iter_job_scores(matrix, job_postings)):
+            scores[j] = job_scores
+
+        return scores
+
+    def _iter_job_scores(self, matrix: ResumeMatrix, job_postings: List[JobPosting]) -> Iterator[np.ndarray]:
+        """score_batch for each job in turn, sharing the work that jobs have in common"""
+        required_skills = [
+            set([skill.lower() for skill in job_posting.required_tech_stack]) for job_posting in job_postings
+        ]
+        matched = matrix.count_matches_many([list(skills) for skills in required_skills])
+
+        # The experience part only depends on the minimum experience
+        experience_scores: Dict[int, np.ndarray] = {}
+
+        for j, job_posting in enumerate(job_postings):
+            minimum = job_posting.minimum_experience
+            if minimum not in experience_scores:
+                experience_scores[minimum] = self._experience_scores(matrix.experience, job_posting)
+
+            yield self._scores(matched[j], len(required_skills[j]), experience_scores[minimum])
+
+    def _scores(self, matched: np.ndarray, required_count: int, experience_scores: np.ndarray) -> np.ndarray:
+        """calculate_score over arrays of matched-skill counts and experience scores"""
+
+        # Keyword matching (70% weight by default)
+        if required_count:
+            return (matched / required_count) * self.skill_weight + experience_scores
+
+        # A copy, since experience scores are shared between jobs
+        return experience_scores + 0.0
+
+    def _experience_scores(self, experience: np.ndarray, job_posting: JobPosting) -> np.ndarray:
+        """experience_score over an array of experience (NaN if unknown)"""
+
+        # Experience matching (30% weight by default)
+        if job_posting.minimum_experience == 0:
+            # If no experience required, give full score for any experience
+            return np.where(~np.isnan(experience), self.experience_weight, 0.0)
+
+        # Give full score if meets minimum (NaN compares False)
+        meets_minimum = experience >= job_posting.minimum_experience
+        experience_score = np.minimum(1.0, experience / (job_posting.minimum_experience * 2))
+        return np.where(meets_minimum, experience_score * self.experience_weight, 0.0)
 
     def calculate_score(self, resume: Resume, job_posting: JobPosting) -> float:
         """
@@ -59,23 +467,39 @@ class Phase1Shortlister:
         """
         score = 0.0
 
-        # Keyword matching (70% weight)
+        # Keyword matching (70% weight by default)
         required_skills = set([skill.lower() for skill in job_posting.required_tech_stack])
-        resume_skills = set([skill.lower() for skill in resume.skills])
 
         if required_skills:
-            matched_skills = required_skills.intersection(resume_skills)
-            keyword_score = len(matched_skills) / len(required_skills)
-            score += keyword_score * 0.7
-
-        # Experience matching (30% weight)
-        if resume.experience is not None:
-            if job_posting.minimum_experience == 0:
-                # If no experience required, give full score for any experience
-                score += 0.3
-            elif resume.experience >= job_posting.minimum_experience:
-                # Give full score if meets minimum
-                experience_score = min(1.0, resume.experience / (job_posting.minimum_experience * 2))
-                score += experience_score * 0.3
+            if resume.features is not None:
+                # Compare precomputed skill ids instead of lowercasing the resume's skills
+                key_ids = get_skill_matcher().key_ids
+                required_ids = set([key_ids[skill] for skill in required_skills if skill in key_ids])
+                matched_count = len(required_ids.intersection(resume.features.skill_ids))
+            else:
+                resume_skills = set([skill.lower() for skill in resume.skills])
+                matched_count = len(required_skills.intersection(resume_skills))
+
+            keyword_score = matched_count / len(required_skills)
+            score += keyword_score * self.skill_weight
+
+        # Experience matching (30% weight by default)
+        score += self.experience_score(resume.experience, job_posting)
 
         return score
+
+    def experience_score(self, experience: Optional[int], job_posting: JobPosting) -> float:
+        """The experience part of the score (up to experience_weight)"""
+        if experience is None:
+            return 0.0
+
+        if job_posting.minimum_experience == 0:
+            # If no experience required, give full score for any experience
+            return self.experience_weight
+
+        if experience >= job_posting.minimum_experience:
+            # Give full score if meets minimum
+            experience_score = min(1.0, experience / (job_posting.minimum_experience * 2))
+            return experience_score * self.experience_weight
+
+        return 0.0
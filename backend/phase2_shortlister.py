@@ -1,8 +1,29 @@
+import re
 import json
-from typing import List, Dict, Any
+import asyncio
+from typing import List, Dict, Any, Tuple
+from typing import Optional
 from models import Resume, JobPosting, ShortlistedCandidate, ShortlistResponse
+from text_store import ResumeTextStore
+from resume_cache import LLMReviewCache
 import httpx
 
+# Bump when create_review_prompt changes so cached responses to older prompts are ignored
+REVIEW_PROMPT_VERSION = 1
+
+# Resume text per candidate in a review prompt, and in a batched one
+RESUME_CHARS = 1500
+BATCH_RESUME_CHARS = 800
+
+# Outermost {...} or [...] of a response with text around the JSON
+_JSON_SPAN = re.compile(r"[\[{].*[\]}]", re.DOTALL)
+
+# Verdict fields of a streamed review, once their value is complete (a
+# number is complete when something follows it). Keys inside strings have
+# escaped quotes, so they don't match.
+_STREAMED_SUITABLE = re.compile(r'[{,]\s*"is_suitable"\s*:\s*(true|false)\b')
+_STREAMED_CONFIDENCE = re.compile(r'[{,]\s*"confidence"\s*:\s*"?(-?\d+(?:\.\d+)?)\s*"?\s*[,}\s]')
+
 
 class Phase2Shortlister:
     """
@@ -10,9 +31,32 @@ class Phase2Shortlister:
     Uses MCP tools for resume analysis
     """
 
-    def __init__(self, ollama_url: str, model_name: str):
+    def __init__(
+        self,
+        ollama_url: str,
+        model_name: str,
+        text_store: Optional[ResumeTextStore] = None,
+        max_concurrency: int = 1,
+        cache: Optional[LLMReviewCache] = None,
+        early_stop_confidence: Optional[float] = None,
+        batch_size: int = 1,
+        stream: bool = False,
+        abort_confidence: Optional[float] = None
+    ):
         self.ollama_url = ollama_url
         self.model_name = model_name
+        self.text_store = text_store
+        self.cache = cache
+        # Reviews in flight at once; 1 reviews candidates one by one
+        self.max_concurrency = max(1, max_concurrency)
+        # With a target count, stop reviewing once that many candidates reach this confidence
+        self.early_stop_confidence = early_stop_confidence
+        # Resumes per LLM call; above 1 they share one prompt with the job description
+        self.batch_size = max(1, batch_size)
+        # Stream single reviews and stop generating once the verdict is negative,
+        # or the confidence is below abort_confidence
+        self.stream = stream
+        self.abort_confidence = abort_confidence
         self.client = httpx.AsyncClient(timeout=120.0)
 
     async def shortlist(
@@ -23,28 +67,134 @@ class Phase2Shortlister:
     ) -> ShortlistResponse:
         """
         Use LLM to comprehensively review resumes and shortlist candidates
+
+        resumes should be in Phase 1 order (best first), so an early stop
+        keeps the most promising candidates.
         """
 
-        shortlisted_candidates = []
+        reviews, skipped = await self.review_many(resumes, job_posting, stop_after=target_count)
 
-        print(f"Phase 2: Starting LLM review of {len(resumes)} candidates...")
+        response = self.rank(list(reviews.values()), target_count)
+        response.llm_calls_saved = skipped
 
-        for i, resume in enumerate(resumes, 1):
-            try:
-                print(f"  [{i}/{len(resumes)}] Reviewing {resume.name}...")
-                result = await self.review_resume(resume, job_posting)
-                if result:
-                    shortlisted_candidates.append(result)
-                    print(f"    ✅ Shortlisted with confidence {result.confidence:.2f}")
-                else:
-                    print(f"    ❌ Not suitable")
-            except Exception as e:
-                import traceback
-                print(f"    ⚠️ Error reviewing {resume.name}: {e}")
-                print(f"    Traceback: {traceback.format_exc()}")
-                continue
+        return response
+
+    async def review_many(
+        self,
+        resumes: List[Resume],
+        job_posting: JobPosting,
+        stop_after: Optional[int] = None
+    ) -> Tuple[Dict[str, Optional[ShortlistedCandidate]], int]:
+        """
+        Review resumes, up to max_concurrency LLM calls at a time
+
+        Returns the outcome per cv_path, in the order of resumes: the
+        candidate if suitable, None if not. Resumes whose review failed are
+        left out, so they can be retried; a failure doesn't affect the
+        other reviews.
+
+        With batch_size above 1, consecutive resumes are reviewed batch_size
+        at a time in one prompt (see review_batch).
+
+        With stop_after and early_stop_confidence set, reviewing stops at the
+        first resume by which stop_after candidates have reached that
+        confidence: later resumes are not sent to the LLM (reviews already
+        in flight are cancelled) and are left out too. Returns the reviews
+        and how many resumes were never sent.
+        """
 
-        print(f"Phase 2: Completed. {len(shortlisted_candidates)} candidates shortlisted.")
+        early_stop = stop_after is not None and self.early_stop_confidence is not None
+        if early_stop and stop_after <= 0:
+            return {}, len(resumes)
+
+        batches = [resumes[i:i + self.batch_size] for i in range(0, len(resumes), self.batch_size)]
+        print(
+            f"Phase 2: Starting LLM review of {len(resumes)} candidates "
+            f"({self.batch_size} per call, {self.max_concurrency} calls at a time)..."
+        )
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        stopped = asyncio.Event()
+        started = 0
+
+        async def review(first: int, batch: List[Resume]):
+            nonlocal started
+
+            async with semaphore:
+                # The semaphore hands out slots in resume order, so nothing
+                # past the stopping point starts once it is known
+                if stopped.is_set():
+                    return {}
+                started += len(batch)
+
+                try:
+                    names = ", ".join(resume.name for resume in batch)
+                    last = first + len(batch) - 1
+                    print(f"  [{first if last == first else f'{first}-{last}'}/{len(resumes)}] Reviewing {names}...")
+                    outcomes = await self.review_batch(batch, job_posting)
+                except Exception as e:
+                    import traceback
+                    print(f"    ⚠️ Error reviewing {names}: {e}")
+                    print(f"    Traceback: {traceback.format_exc()}")
+                    return {}
+
+                for i, resume in enumerate(batch, first):
+                    if resume.cv_path not in outcomes:
+                        continue
+                    result = outcomes[resume.cv_path]
+                    if result:
+                        print(f"    ✅ [{i}] Shortlisted {resume.name} with confidence {result.confidence:.2f}")
+                    else:
+                        print(f"    ❌ [{i}] {resume.name} not suitable")
+                return outcomes
+
+        tasks = [
+            asyncio.ensure_future(review(i * self.batch_size + 1, batch))
+            for i, batch in enumerate(batches)
+        ]
+        reviews: Dict[str, Optional[ShortlistedCandidate]] = {}
+        confident = 0
+
+        try:
+            # Outcomes are taken in resume order, whatever order reviews finish in,
+            # so the result doesn't depend on timing
+            for batch, task in zip(batches, tasks):
+                outcomes = await task
+                for resume in batch:
+                    if resume.cv_path not in outcomes:
+                        continue
+
+                    result = outcomes[resume.cv_path]
+                    reviews[resume.cv_path] = result
+                    if early_stop and result and result.confidence >= self.early_stop_confidence:
+                        confident += 1
+                        if confident >= stop_after:
+                            break
+
+                if early_stop and confident >= stop_after:
+                    break
+        finally:
+            stopped.set()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        skipped = len(resumes) - started
+        shortlisted_count = sum(1 for result in reviews.values() if result)
+        if skipped:
+            print(f"Phase 2: Stopped early with {confident} confident candidates, {skipped} LLM reviews saved.")
+        print(f"Phase 2: Completed. {shortlisted_count} candidates shortlisted.")
+
+        return reviews, skipped
+
+    def rank(
+        self,
+        candidates: List[Optional[ShortlistedCandidate]],
+        target_count: int
+    ) -> ShortlistResponse:
+        """Final shortlist: the suitable candidates with the highest confidence"""
+
+        shortlisted_candidates = [candidate for candidate in candidates if candidate]
 
         # Sort by confidence score
         shortlisted_candidates.sort(key=lambda x: x.confidence, reverse=True)
@@ -65,33 +215,103 @@ class Phase2Shortlister:
 
         prompt = self.create_review_prompt(resume, job_posting)
 
-        # Call Ollama API
-        response = await self.call_ollama(prompt)
+        # The same prompt to the same model was answered before: skip the LLM
+        cache_key = LLMReviewCache.key(self.model_name, REVIEW_PROMPT_VERSION, prompt) if self.cache else None
+        # SQLite reads and commits block, so they run off the event loop
+        response = await asyncio.to_thread(self.cache.get, cache_key) if self.cache else None
+
+        if response is None:
+            # Call Ollama API
+            response = await self.call_ollama(prompt, abort_unsuitable=True)
+            # A rejection by our own confidence cutoff isn't the model's answer:
+            # it must not outlive a change of the cutoff or of streaming
+            if self.cache and not self.is_cutoff_verdict(response):
+                await asyncio.to_thread(self.cache.put, cache_key, response)
+        else:
+            print(f"      Using cached review of {resume.name}")
 
         # Parse LLM response
         result = self.parse_llm_response(response, resume)
 
         return result
 
-    def create_review_prompt(self, resume: Resume, job_posting: JobPosting) -> str:
+    async def review_batch(
+        self,
+        resumes: List[Resume],
+        job_posting: JobPosting
+    ) -> Dict[str, Optional[ShortlistedCandidate]]:
         """
-        Create a comprehensive prompt for LLM to review the resume
+        Review several resumes with one LLM call
+
+        The job description, which makes up most of a review prompt, is sent
+        once for the whole batch, and the model answers with a verdict per
+        candidate. Candidates whose verdict can't be found in the response
+        are reviewed again one by one; those whose single review fails too
+        are left out of the result.
         """
 
-        prompt = f"""You are an expert HR recruiter. Review the following resume against the job requirements and provide a detailed assessment.
+        if len(resumes) == 1:
+            return {resumes[0].cv_path: await self.review_resume(resumes[0], job_posting)}
+
+        prompt = self.create_batch_review_prompt(resumes, job_posting)
+
+        cache_key = LLMReviewCache.key(self.model_name, REVIEW_PROMPT_VERSION, prompt) if self.cache else None
+        response = await asyncio.to_thread(self.cache.get, cache_key) if self.cache else None
+
+        if response is None:
+            response = await self.call_ollama(prompt)
+            if self.cache:
+                await asyncio.to_thread(self.cache.put, cache_key, response)
+        else:
+            print(f"      Using cached review of {len(resumes)} candidates")
+
+        verdicts = self.parse_batch_response(response, len(resumes))
 
-Job Title: {job_posting.job_title}
+        outcomes: Dict[str, Optional[ShortlistedCandidate]] = {}
+        for resume, verdict in zip(resumes, verdicts):
+            if verdict is not None:
+                outcomes[resume.cv_path] = self.candidate_from_verdict(verdict, resume)
+                continue
+
+            print(f"      ⚠️ No verdict for {resume.name} in the batched response, reviewing on its own")
+            try:
+                outcomes[resume.cv_path] = await self.review_resume(resume, job_posting)
+            except Exception as e:
+                print(f"      ⚠️ Error reviewing {resume.name}: {e}")
+
+        return outcomes
+
+    def job_details(self, job_posting: JobPosting) -> str:
+        return f"""Job Title: {job_posting.job_title}
 Job Description: {job_posting.description}
 Required Tech Stack: {', '.join(job_posting.required_tech_stack)}
-Minimum Experience: {job_posting.minimum_experience} years
+Minimum Experience: {job_posting.minimum_experience} years"""
 
-Candidate Resume:
-Name: {resume.name}
+    def resume_details(self, resume: Resume, max_chars: int) -> str:
+        # Resume text may live in the text store; only load what the prompt uses
+        if self.text_store:
+            resume_text = self.text_store.get_text(resume, max_chars=max_chars)
+        else:
+            resume_text = (resume.text_content or "")[:max_chars]
+
+        return f"""Name: {resume.name}
 Email: {resume.email or 'Not provided'}
 Skills: {', '.join(resume.skills)}
 Experience: {resume.experience if resume.experience is not None else 'Not specified'} years
 Resume Content:
-{resume.text_content[:1500]}
+{resume_text}"""
+
+    def create_review_prompt(self, resume: Resume, job_posting: JobPosting) -> str:
+        """
+        Create a comprehensive prompt for LLM to review the resume
+        """
+
+        prompt = f"""You are an expert HR recruiter. Review the following resume against the job requirements and provide a detailed assessment.
+
+{self.job_details(job_posting)}
+
+Candidate Resume:
+{self.resume_details(resume, RESUME_CHARS)}
 
 Based on this information, provide your assessment in the following JSON format:
 {{
@@ -105,11 +325,50 @@ Respond ONLY with the JSON object, no additional text."""
 
         return prompt
 
-    async def call_ollama(self, prompt: str) -> str:
+    def create_batch_review_prompt(self, resumes: List[Resume], job_posting: JobPosting) -> str:
+        """
+        Create one prompt reviewing several resumes against the same job
+        """
+
+        candidates = "\n\n".join(
+            f"Candidate {i}:\n{self.resume_details(resume, BATCH_RESUME_CHARS)}"
+            for i, resume in enumerate(resumes, 1)
+        )
+
+        prompt = f"""You are an expert HR recruiter. Review each of the following {len(resumes)} resumes against the job requirements and provide a detailed assessment of every candidate.
+
+{self.job_details(job_posting)}
+
+{candidates}
+
+Assess each candidate on their own merits, not relative to the others. Provide your assessment in the following JSON format, with one entry per candidate in the order given:
+{{
+    "candidates": [
+        {{
+            "candidate": candidate number (1 to {len(resumes)}),
+            "is_suitable": true or false,
+            "confidence": 0.0 to 1.0 (confidence score),
+            "reasoning": "Brief explanation of your decision",
+            "cover_letter": "A personalized cover letter (2-3 sentences) that the candidate could use for this position, highlighting their relevant experience and skills"
+        }}
+    ]
+}}
+
+Respond ONLY with the JSON object, no additional text."""
+
+        return prompt
+
+    async def call_ollama(self, prompt: str, abort_unsuitable: bool = False) -> str:
         """
         Call Ollama API with the prompt
+
+        With streaming on, abort_unsuitable stops generation as soon as the
+        answer is known to be negative (see stream_ollama).
         """
 
+        if self.stream:
+            return await self.stream_ollama(prompt, abort_unsuitable)
+
         try:
             print(f"      Calling Ollama API ({self.model_name})...")
             response = await self.client.post(
@@ -136,6 +395,189 @@ Respond ONLY with the JSON object, no additional text."""
             print(f"      Traceback: {traceback.format_exc()}")
             raise
 
+    async def stream_ollama(self, prompt: str, abort_unsuitable: bool = False) -> str:
+        """
+        Call Ollama API with streaming, reading the answer as it is generated
+
+        Ollama streams one JSON object per line, each with the next piece of
+        the answer. With abort_unsuitable, the answer so far is checked for
+        a complete "is_suitable" or "confidence" value after every piece,
+        and the request is closed (which stops Ollama generating) once the
+        candidate is not suitable or the confidence is below
+        abort_confidence. The reasoning and cover letter, most of the
+        output, are then never generated; the verdict is returned as a
+        complete JSON answer, so it parses and caches like any other.
+        """
+
+        try:
+            print(f"      Streaming from Ollama API ({self.model_name})...")
+            llm_response = ""
+
+            async with self.client.stream(
+                "POST",
+                f"{self.ollama_url}/api/generate",
+                json={
+                    "model": self.model_name,
+                    "prompt": prompt,
+                    "stream": True,
+                    "format": "json"
+                }
+            ) as response:
+                response.raise_for_status()
+
+                async for line in response.aiter_lines():
+                    if not line.strip():
+                        continue
+
+                    chunk = json.loads(line)
+                    if chunk.get("error"):
+                        raise RuntimeError(f"Ollama error: {chunk['error']}")
+
+                    llm_response += chunk.get("response", "")
+                    if chunk.get("done"):
+                        break
+
+                    if abort_unsuitable:
+                        verdict = self.streamed_rejection(llm_response)
+                        if verdict:
+                            # Leaving the block closes the connection mid-generation
+                            print(f"      ✂️ Stopped generation after {len(llm_response)} characters: {verdict['reasoning']}")
+                            return json.dumps(verdict)
+
+            print(f"      Ollama responded with {len(llm_response)} characters")
+
+            return llm_response
+
+        except Exception as e:
+            import traceback
+            print(f"      ❌ Error calling Ollama: {e}")
+            print(f"      Traceback: {traceback.format_exc()}")
+            raise
+
+    def streamed_rejection(self, partial_response: str) -> Optional[Dict[str, Any]]:
+        """
+        The verdict of a partly generated review if it already rejects the
+        candidate, None while it may still be positive
+        """
+
+        suitable = _STREAMED_SUITABLE.search(partial_response)
+        confidence = _STREAMED_CONFIDENCE.search(partial_response)
+        confidence = float(confidence.group(1)) if confidence else None
+
+        if suitable and suitable.group(1) == "false":
+            reasoning, stopped_by = "Not suitable (generation stopped early)", "verdict"
+        elif confidence is not None and self.abort_confidence is not None and confidence < self.abort_confidence:
+            reasoning = f"Confidence {confidence} below {self.abort_confidence} (generation stopped early)"
+            stopped_by = "confidence_cutoff"
+        else:
+            return None
+
+        return {
+            "is_suitable": False,
+            "confidence": confidence if confidence is not None else 0.0,
+            "reasoning": reasoning,
+            "cover_letter": "",
+            "stopped_by": stopped_by
+        }
+
+    def is_cutoff_verdict(self, llm_response: str) -> bool:
+        """Whether a response is a rejection by abort_confidence rather than by the model"""
+        try:
+            data = json.loads(llm_response)
+        except json.JSONDecodeError:
+            return False
+        return isinstance(data, dict) and data.get("stopped_by") == "confidence_cutoff"
+
+    def parse_batch_response(self, llm_response: str, count: int) -> List[Optional[Dict[str, Any]]]:
+        """
+        Verdicts of a batched review by candidate position; None where missing
+
+        Accepts the requested {"candidates": [...]} object, a bare array, or
+        either wrapped in other text. Entries are matched by their
+        "candidate" number only if the numbers are exactly 1..count, each
+        once. Otherwise, a response with one entry per candidate is matched
+        by position, and anything else leaves every candidate to a single
+        review.
+        """
+
+        verdicts: List[Optional[Dict[str, Any]]] = [None] * count
+
+        try:
+            data = json.loads(llm_response)
+        except json.JSONDecodeError:
+            match = _JSON_SPAN.search(llm_response)
+            try:
+                data = json.loads(match.group(0)) if match else None
+            except json.JSONDecodeError:
+                data = None
+
+        if isinstance(data, dict):
+            data = data.get("candidates", next((value for value in data.values() if isinstance(value, list)), None))
+        if not isinstance(data, list):
+            print(f"      ⚠️ Could not parse batched LLM response: {llm_response[:200]}...")
+            return verdicts
+
+        entries = [entry for entry in data if isinstance(entry, dict) and "is_suitable" in entry]
+
+        try:
+            numbers = [int(entry.get("candidate")) for entry in entries]
+        except (TypeError, ValueError):
+            numbers = []
+
+        # 0-based, repeated or missing numbers mean the model lost count,
+        # so none of its numbers can be trusted
+        if sorted(numbers) == list(range(1, count + 1)):
+            for number, entry in zip(numbers, entries):
+                verdicts[number - 1] = entry
+        elif len(entries) == count:
+            verdicts = list(entries)
+
+        return verdicts
+
+        entries = [entry for entry in data if isinstance(entry, dict) and "is_suitable" in entry]
+
+        numbered = {}
+        for entry in entries:
+            try:
+                number = int(entry.get("candidate"))
+            except (TypeError, ValueError):
+                continue
+            if 1 <= number <= count:
+                numbered.setdefault(number, entry)
+
+        if numbered:
+            for number, entry in numbered.items():
+                verdicts[number - 1] = entry
+        elif len(entries) == count:
+            verdicts = list(entries)
+
+        return verdicts
+
+    def candidate_from_verdict(self, data: Dict[str, Any], resume: Resume) -> Optional[ShortlistedCandidate]:
+        """ShortlistedCandidate from a parsed verdict, or None if not suitable"""
+
+        # Check if candidate is suitable
+        is_suitable = data.get("is_suitable", False)
+        confidence = float(data.get("confidence", 0.5))
+
+        print(f"      LLM Decision: is_suitable={is_suitable}, confidence={confidence}")
+
+        if not is_suitable:
+            print(f"      Candidate not suitable according to LLM")
+            return None
+
+        cover_letter = data.get("cover_letter", "")
+
+        return ShortlistedCandidate(
+            name=resume.name,
+            confidence=confidence,
+            email=resume.email,
+            cv_path=resume.cv_path,
+            skills=resume.skills,
+            experience=resume.experience,
+            cover_letter=cover_letter
+        )
+
     def parse_llm_response(
         self,
         llm_response: str,
@@ -150,27 +592,7 @@ Respond ONLY with the JSON object, no additional text."""
             print(f"      Parsing LLM response...")
             data = json.loads(llm_response)
 
-            # Check if candidate is suitable
-            is_suitable = data.get("is_suitable", False)
-            confidence = float(data.get("confidence", 0.5))
-
-            print(f"      LLM Decision: is_suitable={is_suitable}, confidence={confidence}")
-
-            if not is_suitable:
-                print(f"      Candidate not suitable according to LLM")
-                return None
-
-            cover_letter = data.get("cover_letter", "")
-
-            return ShortlistedCandidate(
-                name=resume.name,
-                confidence=confidence,
-                email=resume.email,
-                cv_path=resume.cv_path,
-                skills=resume.skills,
-                experience=resume.experience,
-                cover_letter=cover_letter
-            )
+            return self.candidate_from_verdict(data, resume)
 
         except json.JSONDecodeError as e:
             print(f"      ⚠️ Error parsing LLM response: {e}")
@@ -0,0 +1,253 @@
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional
+
+
+class ParsedResumeCache:
+    """
+    Persistent, content-addressed cache of parsed resume pages
+
+    Maps a hash of a page's content to the fields ResumeParser extracted
+    from it, so re-uploading the same (or an overlapping) bundle skips text
+    extraction and parsing. Entries are evicted least-recently-used once
+    the cache holds more than max_entries pages.
+    """
+
+    # Stored for pages that were too short to be a resume
+    EMPTY = None
+
+    def __init__(self, db_path: str, max_entries: int = 200000):
+        self.db_path = db_path
+        self.max_entries = max(1, max_entries)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS parsed_pages ("
+            " key TEXT PRIMARY KEY,"
+            " fields TEXT,"
+            " last_used REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS parsed_pages_last_used ON parsed_pages (last_used)"
+        )
+        self._conn.commit()
+        self._entries = self._conn.execute("SELECT COUNT(*) FROM parsed_pages").fetchone()[0]
+
+    def get_many(self, keys: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Look up page keys; returns only the keys that were cached"""
+        found: Dict[str, Optional[Dict[str, Any]]] = {}
+        unique_keys = list(dict.fromkeys(keys))
+
+        with self._lock:
+            # Stay under SQLite's bound-parameter limit
+            for i in range(0, len(unique_keys), 500):
+                batch = unique_keys[i:i + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, fields FROM parsed_pages WHERE key IN ({placeholders})",
+                    batch
+                ).fetchall()
+                for key, fields in rows:
+                    found[key] = json.loads(fields) if fields is not None else self.EMPTY
+
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE parsed_pages SET last_used = ? WHERE key = ?",
+                    [(now, key) for key in found]
+                )
+                self._conn.commit()
+
+            hits = sum(1 for key in keys if key in found)
+            self.hits += hits
+            self.misses += len(keys) - hits
+
+        return found
+
+    def put_many(self, entries: Dict[str, Optional[Dict[str, Any]]]):
+        """Store parsed fields (or EMPTY) for page keys, evicting LRU entries"""
+        if not entries:
+            return
+
+        now = time.time()
+
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO parsed_pages (key, fields, last_used) VALUES (?, ?, ?)",
+                [
+                    (key, json.dumps(fields) if fields is not None else None, now)
+                    for key, fields in entries.items()
+                ]
+            )
+            self._entries += self._conn.total_changes - before
+
+            overflow = self._entries - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM parsed_pages WHERE key IN ("
+                    " SELECT key FROM parsed_pages ORDER BY last_used LIMIT ?)",
+                    (overflow,)
+                )
+                self._entries -= overflow
+                self.evictions += overflow
+
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters since start-up and the current cache size"""
+        lookups = self.hits + self.misses
+
+        return {
+            "entries": self._entries,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+
+class LLMReviewCache:
+    """
+    Persistent cache of raw LLM responses to Phase 2 review prompts
+
+    Keys are a hash of the model name, the prompt template version and the
+    prompt itself, so a changed model, template or resume text is a miss.
+    Entries older than ttl_seconds (0 keeps them forever) are treated as
+    misses and dropped. Least-recently-used entries are evicted once the
+    cache holds more than max_entries responses or max_bytes of text.
+    """
+
+    def __init__(self, db_path: str, max_entries: int = 50000, max_bytes: int = 256 * 1024 * 1024,
+                 ttl_seconds: float = 0):
+        self.db_path = db_path
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max(1, max_bytes)
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_reviews ("
+            " key TEXT PRIMARY KEY,"
+            " response TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " created REAL NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS llm_reviews_last_used ON llm_reviews (last_used)"
+        )
+        self._conn.commit()
+        self._entries, self._bytes = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_reviews"
+        ).fetchone()
+
+    @staticmethod
+    def key(model_name: str, prompt_version: int, prompt: str) -> str:
+        """Cache key of a prompt sent to a model with a given template version"""
+        digest = hashlib.sha256()
+        for part in (model_name, str(prompt_version), prompt):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """The cached response for a key, or None"""
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, size, created FROM llm_reviews WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row and self.ttl_seconds > 0 and now - row[2] > self.ttl_seconds:
+                self._conn.execute("DELETE FROM llm_reviews WHERE key = ?", (key,))
+                self._conn.commit()
+                self._entries -= 1
+                self._bytes -= row[1]
+                self.expired += 1
+                row = None
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE llm_reviews SET last_used = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+
+        return row[0]
+
+    def put(self, key: str, response: str):
+        """Store a response, evicting LRU entries beyond the count or size limit"""
+        size = len(response.encode("utf-8"))
+        now = time.time()
+
+        with self._lock:
+            previous = self._conn.execute("SELECT size FROM llm_reviews WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_reviews (key, response, size, created, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, response, size, now, now)
+            )
+            if previous:
+                self._bytes -= previous[0]
+            else:
+                self._entries += 1
+            self._bytes += size
+
+            while self._entries > self.max_entries or self._bytes > self.max_bytes:
+                # Oldest first, in small batches until both limits hold
+                rows = self._conn.execute(
+                    "SELECT key, size FROM llm_reviews WHERE key != ? ORDER BY last_used LIMIT ?",
+                    (key, max(1, self._entries - self.max_entries))
+                ).fetchall()
+                if not rows:
+                    break
+
+                self._conn.executemany("DELETE FROM llm_reviews WHERE key = ?", [(row[0],) for row in rows])
+                self._entries -= len(rows)
+                self._bytes -= sum(row[1] for row in rows)
+                self.evictions += len(rows)
+
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters since start-up and the current cache size"""
+        lookups = self.hits + self.misses
+
+        return {
+            "entries": self._entries,
+            "max_entries": self.max_entries,
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
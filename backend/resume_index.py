@@ -0,0 +1,93 @@
+import heapq
+from array import array
+from bisect import bisect_left, insort
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from models import Resume
+from skill_matcher import get_skill_matcher
+
+
+class ResumeIndex:
+    """
+    Inverted indexes over a job's resume pool, maintained as resumes are ingested
+
+    Resumes are identified by their position in the pool (upload order).
+    The index keeps:
+    - skill postings: lowercased skill -> ascending resume ids (int64
+      arrays, so a query can view them with NumPy without copying)
+    - experience buckets: years of experience -> ascending resume ids, with
+      the distinct values kept sorted so they can be walked high to low
+    - the ascending ids of resumes without a stated experience, and an
+      experience vector by id (NaN where not stated)
+    so a Phase 1 query only touches resumes that have a required skill,
+    plus as many others as it needs to fill the shortlist.
+    """
+
+    def __init__(self, resumes: Optional[List[Resume]] = None):
+        self.resumes: List[Resume] = []
+        self.skill_postings: Dict[str, array] = {}
+        self.experience_buckets: Dict[int, List[int]] = {}
+        self.experience_values: List[int] = []
+        self.no_experience: List[int] = []
+        self.experience = np.empty(0, dtype=np.float64)
+
+        if resumes:
+            self.add(resumes)
+
+    def __len__(self) -> int:
+        return len(self.resumes)
+
+    def add(self, resumes: List[Resume]):
+        """Index resumes appended to the pool; ids continue from the current size"""
+        self.experience = np.concatenate([self.experience, np.array(
+            [np.nan if resume.experience is None else resume.experience for resume in resumes],
+            dtype=np.float64
+        )])
+
+        matcher = get_skill_matcher()
+
+        for resume in resumes:
+            resume_id = len(self.resumes)
+            self.resumes.append(resume)
+
+            skills = matcher.normalized_skills(resume.skills, resume.features.skill_ids if resume.features else None)
+            for skill in set(skills):
+                posting = self.skill_postings.get(skill)
+                if posting is None:
+                    posting = self.skill_postings[skill] = array("q")
+                posting.append(resume_id)
+
+            if resume.experience is None:
+                self.no_experience.append(resume_id)
+                continue
+
+            bucket = self.experience_buckets.get(resume.experience)
+            if bucket is None:
+                bucket = self.experience_buckets[resume.experience] = []
+                insort(self.experience_values, resume.experience)
+            bucket.append(resume_id)
+
+    def matches(self, skills: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Ascending ids of resumes with any of the (lowercased) skills, and how many each has"""
+        postings = [self.skill_postings[skill] for skill in skills if skill in self.skill_postings]
+        if not postings:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+        ids = np.concatenate([np.frombuffer(posting, dtype=np.int64) for posting in postings])
+        return np.unique(ids, return_counts=True)
+
+    def count_at_least(self, experience: int) -> int:
+        """Number of resumes with at least this much experience"""
+        start = bisect_left(self.experience_values, experience)
+        return sum(len(self.experience_buckets[value]) for value in self.experience_values[start:])
+
+    def experience_descending(self, minimum: int) -> List[int]:
+        """Distinct experience values >= minimum, highest first"""
+        start = bisect_left(self.experience_values, minimum)
+        return self.experience_values[start:][::-1]
+
+    def ids_with_experience(self, values: List[int]) -> Iterator[int]:
+        """Ascending ids of the resumes whose experience is one of values"""
+        return heapq.merge(*(self.experience_buckets[value] for value in values))
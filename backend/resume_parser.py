@@ -1,44 +1,241 @@
 import fitz  # PyMuPDF
 import re
 import os
-from typing import List, Dict, Optional
+import math
+import time
+import hashlib
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Dict, Optional, Any, Callable
 from models import Resume
+from cv_store import CVStore
+from skill_matcher import get_skill_matcher
+from resume_cache import ParsedResumeCache
+from text_store import ResumeTextStore
+
+# Bump when parsing (or the page cache key) changes so cached pages from older versions are ignored
+PARSER_CACHE_VERSION = 3
+
+# An indirect reference ("12 0 R") inside a PDF object's source
+OBJECT_REFERENCE = re.compile(r"\b(\d+) (\d+) R\b")
+
+# Field patterns are compiled once at import and shared by every page
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
+
+# Look for patterns like "5 years", "5+ years", "5 yrs" (matched on lowercased text)
+EXPERIENCE_PATTERNS = [
+    re.compile(r'(\d+)\+?\s*years?\s+(?:of\s+)?experience'),
+    re.compile(r'experience[:\s]+(\d+)\+?\s*years?'),
+    re.compile(r'(\d+)\+?\s*yrs?\s+(?:of\s+)?experience'),
+]
+
+# Extraction workers are forked while the server is still single-threaded
+# (see ResumeParser.start_workers); spawn is used where fork is unavailable
+WORKER_CONTEXT = multiprocessing.get_context(
+    "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+NAME_SEARCH_LINES = 5
+NAME_HEADER_KEYWORDS = ('resume', 'cv', 'curriculum', 'vitae', 'page')
+
+# Text extraction profiles: PyMuPDF's defaults, normalized text, or
+# reading-order variants (compare them with benchmark_parser.py profiles).
+# Flags change what the text looks like, not what it costs: every profile
+# runs the same text-page build, and none of them loads images.
+EXTRACTION_PROFILES = {
+    # page.get_text() defaults: keeps ligatures and whitespace as drawn
+    "default": {"option": "text", "flags": None, "sort": False},
+    # Expands ligatures, collapses whitespace and joins hyphenated line ends
+    "normalized": {"option": "text", "flags": fitz.TEXT_MEDIABOX_CLIP | fitz.TEXT_DEHYPHENATE, "sort": False},
+    # Text blocks only (image blocks skipped), in top-left reading order
+    "blocks": {"option": "blocks", "flags": fitz.TEXT_MEDIABOX_CLIP | fitz.TEXT_DEHYPHENATE, "sort": True},
+    # Like default, but lines are sorted into reading order
+    "sorted": {"option": "text", "flags": None, "sort": True},
+}
 
 
 class ResumeParser:
-    def __init__(self, upload_dir: str, resume_dir: str):
+    def __init__(
+        self,
+        upload_dir: str,
+        resume_dir: str,
+        workers: int = 1,
+        min_pages_per_worker: int = 50,
+        cache: Optional[ParsedResumeCache] = None,
+        text_store: Optional[ResumeTextStore] = None,
+        extraction_profile: str = "default"
+    ):
+        if extraction_profile not in EXTRACTION_PROFILES:
+            raise ValueError(
+                f"Unknown extraction profile '{extraction_profile}', "
+                f"expected one of: {', '.join(EXTRACTION_PROFILES)}"
+            )
+
         self.upload_dir = upload_dir
         self.resume_dir = resume_dir
+        self.workers = max(1, workers)
+        self.min_pages_per_worker = max(1, min_pages_per_worker)
+        self.cache = cache
+        self.text_store = text_store
+        self.extraction_profile = extraction_profile
+        self.last_extraction_stats: Dict[str, float] = {}
+        # One pool of self.workers processes, shared by concurrent extractions
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
         os.makedirs(upload_dir, exist_ok=True)
         os.makedirs(resume_dir, exist_ok=True)
 
-    def extract_resumes_from_pdf(self, pdf_path: str) -> List[Resume]:
-        """Extract individual resumes from a multi-page PDF"""
+    def __getstate__(self):
+        # Worker processes get a copy of the parser; the cache and text
+        # store stay in the parent
+        state = self.__dict__.copy()
+        state["cache"] = None
+        state["text_store"] = None
+        state["_pool"] = None
+        state["_pool_lock"] = None
+        return state
+
+    def start_workers(self):
+        """
+        Start the extraction processes now rather than on the first large upload
+
+        Call this at startup, before any threads exist: forking a
+        multi-threaded process can leave a child holding a lock that no
+        thread will ever release.
+        """
+        if self.workers > 1:
+            self._worker_pool()
+
+    def close(self):
+        """Stop the extraction processes"""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool:
+            pool.shutdown()
+
+    def _worker_pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=WORKER_CONTEXT)
+                # Fork every worker up front instead of as pages are submitted
+                self._pool.submit(os.getpid).result()
+            return self._pool
+
+    def _discard_pool(self, pool: ProcessPoolExecutor):
+        # A worker died (e.g. killed for memory); the next extraction starts a new pool
+        with self._pool_lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False)
+
+    def extract_resumes_from_pdf(
+        self,
+        pdf_path: str,
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> List[Resume]:
+        """
+        Extract individual resumes from a multi-page PDF
+
+        progress_callback, if given, is called with (pages_done, total_pages)
+        as extraction proceeds.
+        """
         resumes = []
 
         try:
-            doc = fitz.open(pdf_path)
-
-            for page_num in range(len(doc)):
-                page = doc[page_num]
-                text = page.get_text()
-
-                # Save individual resume page as separate PDF
-                resume_filename = f"resume_page_{page_num + 1}.pdf"
-                resume_path = os.path.join(self.resume_dir, resume_filename)
-
-                # Create single page PDF
-                single_page_doc = fitz.open()
-                single_page_doc.insert_pdf(doc, from_page=page_num, to_page=page_num)
-                single_page_doc.save(resume_path)
-                single_page_doc.close()
-
-                # Parse the resume content
-                resume_data = self.parse_resume_text(text, resume_path)
-                if resume_data:
-                    resumes.append(resume_data)
-
-            doc.close()
+            start_time = time.perf_counter()
+
+            # Hashing a page's content is far cheaper than extracting its text,
+            # so pages seen in earlier uploads are served from the cache
+            cached: Dict[str, Optional[Dict[str, Any]]] = {}
+            page_keys: List[str] = []
+
+            with fitz.open(pdf_path) as doc:
+                page_count = len(doc)
+                if self.cache:
+                    # Fonts and XObjects are often shared by many pages; hash each once
+                    object_digests: Dict[int, bytes] = {}
+                    page_keys = [self.page_cache_key(page, object_digests) for page in doc]
+
+            if self.cache:
+                cached = self.cache.get_many(page_keys)
+
+            pending = [
+                page_num for page_num in range(page_count)
+                if not self.cache or page_keys[page_num] not in cached
+            ]
+            cached_pages = page_count - len(pending)
+
+            if progress_callback:
+                progress_callback(cached_pages, page_count)
+
+            # Small PDFs are not worth shipping to the worker processes
+            workers = min(self.workers, math.ceil(len(pending) / self.min_pages_per_worker))
+            parsed: Dict[int, Optional[Dict[str, Any]]] = {}
+
+            if workers <= 1:
+                def report_progress(pages_done: int, _total: int):
+                    progress_callback(cached_pages + pages_done, page_count)
+
+                parsed = self._extract_pages(
+                    pdf_path, pending, report_progress if progress_callback else None
+                )
+            else:
+                # Several shards per worker so a slow range doesn't hold up the pool
+                shard_size = math.ceil(len(pending) / (workers * 4))
+                shards = [pending[i:i + shard_size] for i in range(0, len(pending), shard_size)]
+
+                pool = self._worker_pool()
+                futures = {
+                    pool.submit(self._extract_pages, pdf_path, shard): len(shard)
+                    for shard in shards
+                }
+
+                pages_done = cached_pages
+                try:
+                    for future in as_completed(futures):
+                        parsed.update(future.result())
+                        pages_done += futures[future]
+                        if progress_callback:
+                            progress_callback(pages_done, page_count)
+                except BrokenProcessPool:
+                    self._discard_pool(pool)
+                    raise
+
+            if self.cache:
+                self.cache.put_many({page_keys[page_num]: fields for page_num, fields in parsed.items()})
+
+            # Merge parsed and cached pages back in page order
+            for page_num in range(page_count):
+                fields = parsed[page_num] if page_num in parsed else cached[page_keys[page_num]]
+                if fields:
+                    if self.text_store:
+                        # Keep only a handle on the resume; the text goes to disk
+                        fields = dict(fields)
+                        fields["text_ref"] = self.text_store.append(fields.pop("text_content"))
+
+                    # Reference the page in the uploaded bundle; the single-page
+                    # PDF is produced lazily by CVStore when it is requested
+                    resumes.append(Resume(**fields, cv_path=CVStore.make_ref(pdf_path, page_num)))
+
+            elapsed = time.perf_counter() - start_time
+            pages_per_second = page_count / elapsed if elapsed > 0 else 0.0
+
+            self.last_extraction_stats = {
+                "pages": page_count,
+                "resumes": len(resumes),
+                "workers": max(1, workers),
+                "cache_hits": cached_pages,
+                "seconds": elapsed,
+                "pages_per_second": pages_per_second
+            }
+
+            print(
+                f"📄 Extracted {len(resumes)} resumes from {page_count} pages "
+                f"in {elapsed:.2f}s ({pages_per_second:.1f} pages/sec, {max(1, workers)} worker(s), "
+                f"{cached_pages} cached)"
+            )
 
         except Exception as e:
             print(f"Error extracting resumes: {e}")
@@ -46,97 +243,186 @@ class ResumeParser:
 
         return resumes
 
+    def _extract_pages(
+        self,
+        pdf_path: str,
+        page_nums: List[int],
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> Dict[int, Optional[Dict[str, Any]]]:
+        """Extract resume fields from the given pages - runs in a worker process"""
+        parsed = {}
+
+        with fitz.open(pdf_path) as doc:
+            for i, page_num in enumerate(page_nums, 1):
+                parsed[page_num] = self.parse_page_text(self.extract_page_text(doc[page_num]))
+
+                if progress_callback:
+                    progress_callback(i, len(page_nums))
+
+        return parsed
+
+    def extract_page_text(self, page: fitz.Page) -> str:
+        """Get a page's text using the configured extraction profile"""
+        profile = EXTRACTION_PROFILES[self.extraction_profile]
+
+        if profile["option"] == "blocks":
+            blocks = page.get_text("blocks", flags=profile["flags"], sort=profile["sort"])
+            # Block type 0 is text, 1 is an image; text blocks end in a newline
+            return "".join(block[4] for block in blocks if block[6] == 0)
+
+        return page.get_text(profile["option"], flags=profile["flags"], sort=profile["sort"])
+
+    def page_cache_key(self, page: fitz.Page, object_digests: Optional[Dict[int, bytes]] = None) -> str:
+        """
+        Content hash identifying a page for the parsed-resume cache
+
+        The content stream alone isn't enough: pages merged from other PDFs
+        (show_pdf_page and most merge tools) all draw "/fzFrm0 Do", with the
+        actual text in a Form XObject. So the page's resources - the fonts
+        and XObjects it uses, and whatever they reference - are hashed too.
+        object_digests memoises object hashes across the pages of a document.
+        """
+        doc = page.parent
+        digest = hashlib.sha256()
+        digest.update(
+            f"{PARSER_CACHE_VERSION}:{get_skill_matcher().version}:{self.extraction_profile}:{page.rect}".encode()
+        )
+        # The content stream holds every glyph and position drawn on the page
+        digest.update(page.read_contents())
+
+        # Resources may be inherited from an ancestor in the page tree
+        xref = page.xref
+        kind, resources = doc.xref_get_key(xref, "Resources")
+        while kind == "null":
+            kind, parent = doc.xref_get_key(xref, "Parent")
+            if kind != "xref":
+                resources = ""
+                break
+            xref = int(parent.split()[0])
+            kind, resources = doc.xref_get_key(xref, "Resources")
+
+        digest.update(self._source_digest(doc, resources, {} if object_digests is None else object_digests, set()))
+
+        return digest.hexdigest()
+
+    def _source_digest(self, doc: fitz.Document, source: str, memo: Dict[int, bytes], active: set) -> bytes:
+        """Hash of PDF object source with each reference replaced by the referenced object's hash"""
+        digest = hashlib.sha256()
+        position = 0
+
+        for match in OBJECT_REFERENCE.finditer(source):
+            digest.update(source[position:match.start()].encode())
+            digest.update(self._object_digest(doc, int(match.group(1)), memo, active))
+            position = match.end()
+        digest.update(source[position:].encode())
+
+        return digest.digest()
+
+    def _object_digest(self, doc: fitz.Document, xref: int, memo: Dict[int, bytes], active: set) -> bytes:
+        if xref in memo:
+            return memo[xref]
+        # A reference back into the page tree or a cycle adds nothing about this page
+        if xref in active or not 0 < xref < doc.xref_length():
+            return b"ref"
+        if doc.xref_get_key(xref, "Type")[1] in ("/Page", "/Pages"):
+            return b"page"
+
+        active.add(xref)
+        digest = hashlib.sha256(self._source_digest(doc, doc.xref_object(xref, compressed=True), memo, active))
+        if doc.xref_is_stream(xref):
+            digest.update(doc.xref_stream_raw(xref))
+        active.discard(xref)
+
+        memo[xref] = digest.digest()
+        return memo[xref]
+
     def parse_resume_text(self, text: str, cv_path: str) -> Optional[Resume]:
         """Parse resume text and extract structured information"""
 
+        fields = self.parse_page_text(text)
+        if not fields:
+            return None
+
+        return Resume(**fields, cv_path=cv_path)
+
+    def parse_page_text(self, text: str) -> Optional[Dict[str, Any]]:
+        """Parse one page of text into Resume fields (everything but cv_path)"""
+
         if not text or len(text.strip()) < 50:  # Skip empty or too short pages
             return None
 
-        # Extract name (usually at the top, all caps or title case)
-        name = self.extract_name(text)
+        fields = self.extract_fields(text)
+        fields["features"] = self.build_features(text, fields)
+        fields["text_content"] = text
 
-        # Extract email
-        email = self.extract_email(text)
+        return fields
 
-        # Extract skills
-        skills = self.extract_skills(text)
+    def build_features(self, text: str, fields: Dict[str, Any]) -> Dict[str, Any]:
+        """Features (see ResumeFeatures) the scorers reuse instead of re-normalising fields"""
+        normalized_text = " ".join(text.lower().split())
 
-        # Extract experience (in years)
-        experience = self.extract_experience(text)
+        return {
+            "skill_ids": get_skill_matcher().skill_ids(fields["skills"]),
+            "experience": fields["experience"],
+            "fingerprint": hashlib.blake2b(normalized_text.encode("utf-8"), digest_size=8).hexdigest()
+        }
 
-        return Resume(
-            name=name,
-            email=email,
-            skills=skills,
-            experience=experience,
-            cv_path=cv_path,
-            text_content=text
-        )
+    def extract_fields(self, text: str) -> Dict[str, Any]:
+        """Extract name, email, skills and experience from one page of text"""
+
+        # Normalise once and share the buffer between the extractors
+        text_lower = text.lower()
+
+        return {
+            # Name is usually at the top, all caps or title case
+            "name": self.extract_name(text),
+            "email": self.extract_email(text),
+            "skills": get_skill_matcher().find_skills_lower(text_lower),
+            # Experience in years
+            "experience": self._extract_experience_lower(text_lower)
+        }
 
     def extract_name(self, text: str) -> str:
         """Extract candidate name from resume text"""
-        lines = text.split('\n')
 
-        # Usually name is in first few lines
-        for line in lines[:5]:
+        # Usually name is in first few lines - don't split the whole page
+        for line in text.split('\n', NAME_SEARCH_LINES)[:NAME_SEARCH_LINES]:
             line = line.strip()
             # Look for lines that are likely names (2-4 words, capitalized)
             if line and len(line.split()) <= 4 and line[0].isupper():
                 # Avoid common headers
-                if not any(keyword in line.lower() for keyword in ['resume', 'cv', 'curriculum', 'vitae', 'page']):
+                line_lower = line.lower()
+                if not any(keyword in line_lower for keyword in NAME_HEADER_KEYWORDS):
                     return line
 
         return "Unknown"
 
     def extract_email(self, text: str) -> Optional[str]:
         """Extract email address from text"""
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        matches = re.findall(email_pattern, text)
+        match = EMAIL_PATTERN.search(text)
 
-        if matches:
-            return matches[0]
+        if match:
+            return match.group(0)
 
         return None
 
     def extract_skills(self, text: str) -> List[str]:
         """Extract skills from resume text"""
 
-        # Common tech skills to look for
-        common_skills = [
-            'Python', 'Java', 'JavaScript', 'TypeScript', 'C++', 'C#', 'Ruby', 'PHP', 'Go', 'Rust',
-            'React', 'Angular', 'Vue', 'Node.js', 'Django', 'Flask', 'FastAPI', 'Spring', 'Express',
-            'SQL', 'MySQL', 'PostgreSQL', 'MongoDB', 'Redis', 'Cassandra', 'Oracle',
-            'AWS', 'Azure', 'GCP', 'Docker', 'Kubernetes', 'Jenkins', 'Git', 'CI/CD',
-            'Machine Learning', 'Deep Learning', 'TensorFlow', 'PyTorch', 'NLP', 'Computer Vision',
-            'Data Analysis', 'Data Science', 'Pandas', 'NumPy', 'Scikit-learn',
-            'HTML', 'CSS', 'REST API', 'GraphQL', 'Microservices', 'Agile', 'Scrum',
-            'Linux', 'Windows', 'MacOS', 'Bash', 'Shell Scripting',
-            'Frontend Development', 'Backend Development', 'Full Stack',
-            'UI/UX', 'Testing', 'QA', 'Selenium', 'Jest', 'Pytest'
-        ]
-
-        found_skills = []
-        text_lower = text.lower()
-
-        for skill in common_skills:
-            if skill.lower() in text_lower:
-                found_skills.append(skill)
-
-        return found_skills
+        # One pass over the text with the compiled taxonomy (see skills.txt)
+        return get_skill_matcher().find_skills(text)
 
     def extract_experience(self, text: str) -> Optional[int]:
         """Extract years of experience from resume text"""
+        return self._extract_experience_lower(text.lower())
+
+    def _extract_experience_lower(self, text_lower: str) -> Optional[int]:
+        """Extract years of experience from already-lowercased text"""
 
-        # Look for patterns like "5 years", "5+ years", "5 yrs"
-        patterns = [
-            r'(\d+)\+?\s*years?\s+(?:of\s+)?experience',
-            r'experience[:\s]+(\d+)\+?\s*years?',
-            r'(\d+)\+?\s*yrs?\s+(?:of\s+)?experience',
-        ]
-
-        for pattern in patterns:
-            matches = re.findall(pattern, text.lower())
-            if matches:
-                return int(matches[0])
+        # Patterns are tried in priority order, first match wins
+        for pattern in EXPERIENCE_PATTERNS:
+            match = pattern.search(text_lower)
+            if match:
+                return int(match.group(1))
 
         return None
@@ -0,0 +1,249 @@
+import os
+import re
+import math
+import zlib
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from skill_matcher import get_skill_matcher
+
+# Everything but letters, digits, "+" and "#" separates words
+_SEPARATORS = re.compile(r"[^a-z0-9+#]+")
+
+# Per-position multipliers for the n-gram hash (odd, so no byte is ignored)
+_NGRAM_MULTIPLIERS = np.array([0x01000193, 0x9E3779B1, 0x85EBCA77, 0xC2B2AE3D, 0x27D4EB2F], dtype=np.uint32)
+
+
+class HashedNgramEncoder:
+    """
+    Offline text encoder: hashed character n-grams plus canonical skills
+
+    Character 3-5-grams of the normalised text are hashed (with a random
+    sign) into a fixed number of dimensions, so "Postgres" and "PostgreSQL"
+    share most of their features. Skills the taxonomy recognises, including
+    aliases such as "k8s", add a second, equally weighted part keyed by the
+    canonical skill. Hashes are fixed functions of the bytes, so vectors are
+    identical across processes and runs.
+    """
+
+    def __init__(self, dim: int = 256, ngram_sizes: Tuple[int, ...] = (3, 4, 5), skill_share: float = 0.5):
+        self.dim = dim
+        self.ngram_sizes = ngram_sizes
+        self.skill_share = skill_share
+
+        matcher = get_skill_matcher()
+        self._matcher = matcher
+        self._skill_buckets = np.array(
+            [zlib.crc32(f"skill:{key}".encode("utf-8")) % dim for key in matcher.skill_keys], dtype=np.int64
+        )
+
+    def encode(self, text: str) -> np.ndarray:
+        """Unit-length float32 vector of a text"""
+        text_lower = text.lower()
+        normalized = " " + _SEPARATORS.sub(" ", text_lower).strip() + " "
+        data = np.frombuffer(normalized.encode("utf-8"), dtype=np.uint8).astype(np.uint32)
+
+        # Polynomial hashes of the n-grams, extended one byte at a time:
+        # the n-gram hash at i is the (n-1)-gram hash at i plus byte i+n-1
+        # times the n-th multiplier. uint32 arithmetic wraps.
+        hashes = data * _NGRAM_MULTIPLIERS[0]
+        buckets = []
+        for n in range(2, max(self.ngram_sizes) + 1):
+            hashes = hashes[:-1] + data[n - 1:] * _NGRAM_MULTIPLIERS[n - 1]
+            if n in self.ngram_sizes:
+                buckets.append((hashes ^ np.uint32(n)) * np.uint32(0x9E3779B1))
+
+        mixed = np.concatenate(buckets)
+        # The top bit gives each n-gram a sign, so collisions tend to cancel
+        signs = 1.0 - 2.0 * (mixed >> np.uint32(31))
+        ngrams = np.bincount(mixed % np.uint32(self.dim), weights=signs, minlength=self.dim)
+
+        skills = np.zeros(self.dim, dtype=np.float64)
+        skill_ids = self._matcher.skill_ids(self._matcher.find_skills_lower(text_lower))
+        if skill_ids:
+            np.add.at(skills, self._skill_buckets[skill_ids], 1.0)
+
+        vector = (1 - self.skill_share) * _unit(ngrams) + self.skill_share * _unit(skills)
+        return _unit(vector).astype(np.float32)
+
+    def encode_many(self, texts: List[str]) -> np.ndarray:
+        """(len(texts), dim) matrix of encode()"""
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            vectors[i] = self.encode(text)
+        return vectors
+
+
+class SemanticIndex:
+    """
+    Approximate nearest-neighbour index over a job's resume vectors
+
+    An inverted file: the vectors are clustered (spherical k-means, about
+    sqrt(n) clusters) and a query only scans the clusters whose centroids
+    are closest to it, then ranks those resumes by exact cosine similarity.
+    Resumes are identified by their position in the pool (upload order) and
+    appended to the nearest existing cluster; the clusters are retrained
+    once the pool has doubled since they were trained, so the total
+    training cost stays proportional to the pool size. Pools smaller than
+    min_train_size are scanned exactly.
+    """
+
+    def __init__(self, dim: int = 256, probes: int = 24, min_train_size: int = 2000, seed: int = 0):
+        self.dim = dim
+        self.probes = probes
+        self.min_train_size = min_train_size
+        self.seed = seed
+
+        self._vectors = np.zeros((0, dim), dtype=np.float32)
+        self.size = 0
+        self.centroids: Optional[np.ndarray] = None
+        self.trained_size = 0
+        self.assignments = np.zeros(0, dtype=np.int64)
+        self.clusters: List[array] = []
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def vectors(self) -> np.ndarray:
+        return self._vectors[:self.size]
+
+    def add(self, vectors: np.ndarray):
+        """Append unit vectors (one row per resume); ids continue from the current size"""
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        start, end = self.size, self.size + len(vectors)
+
+        # Grow the buffer geometrically so appending batches stays linear
+        if end > len(self._vectors):
+            grown = np.zeros((max(end, 2 * len(self._vectors)), self.dim), dtype=np.float32)
+            grown[:start] = self._vectors[:start]
+            self._vectors = grown
+        self._vectors[start:end] = vectors
+        self.size = end
+
+        if end >= self.min_train_size and end >= 2 * self.trained_size:
+            self.train()
+        elif self.centroids is not None:
+            assignments = self._nearest_centroids(vectors)
+            self.assignments = np.concatenate([self.assignments, assignments])
+            for resume_id, cluster in enumerate(assignments.tolist(), start):
+                self.clusters[cluster].append(resume_id)
+
+    def train(self, iterations: int = 8):
+        """Cluster the current vectors and assign every resume to a cluster"""
+        vectors = self.vectors
+        cluster_count = max(1, int(math.sqrt(len(vectors))))
+        rng = np.random.default_rng(self.seed)
+
+        # A sample of up to 64 vectors per cluster is plenty to place centroids
+        sample = vectors[rng.choice(len(vectors), min(len(vectors), 64 * cluster_count), replace=False)]
+        centroids = sample[rng.choice(len(sample), cluster_count, replace=False)].copy()
+
+        for _ in range(iterations):
+            nearest = np.argmax(sample @ centroids.T, axis=1)
+            order = np.argsort(nearest, kind="stable")
+            filled, starts = np.unique(nearest[order], return_index=True)
+            sums = np.add.reduceat(sample[order], starts, axis=0)
+            norms = np.linalg.norm(sums, axis=1)
+
+            # Empty clusters keep their previous centroid
+            nonzero = norms > 0
+            centroids[filled[nonzero]] = sums[nonzero] / norms[nonzero, None]
+
+        self.centroids = centroids
+        self.trained_size = len(vectors)
+        self.assignments = self._nearest_centroids(vectors)
+        self.clusters = self._clusters_of(self.assignments, cluster_count)
+
+    def _nearest_centroids(self, vectors: np.ndarray, chunk_size: int = 16384) -> np.ndarray:
+        return np.concatenate([
+            np.argmax(vectors[i:i + chunk_size] @ self.centroids.T, axis=1)
+            for i in range(0, len(vectors), chunk_size)
+        ] or [np.zeros(0, dtype=np.int64)]).astype(np.int64)
+
+    @staticmethod
+    def _clusters_of(assignments: np.ndarray, cluster_count: int) -> List[array]:
+        """Ascending resume ids per cluster"""
+        order = np.argsort(assignments, kind="stable")
+        bounds = np.searchsorted(assignments[order], np.arange(cluster_count + 1))
+        return [array("q", order[bounds[c]:bounds[c + 1]].tobytes()) for c in range(cluster_count)]
+
+    def candidates(self, vector: np.ndarray) -> np.ndarray:
+        """Ids of the resumes in the clusters nearest to a query vector"""
+        if self.centroids is None:
+            return np.arange(self.size, dtype=np.int64)
+
+        closeness = self.centroids @ vector
+        probes = min(self.probes, len(closeness))
+        nearest = np.argpartition(-closeness, probes - 1)[:probes]
+        return np.concatenate([np.frombuffer(self.clusters[c], dtype=np.int64) for c in nearest])
+
+    def query(self, vector: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Approximate k nearest resumes (ids, cosine similarities), best first"""
+        ids = self.candidates(vector)
+        return self._best(ids, self._vectors[ids] @ np.asarray(vector, dtype=np.float32), k)
+
+    def exact(self, vector: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """The true k nearest resumes, by scanning the whole pool"""
+        return self._best(np.arange(self.size, dtype=np.int64), self.vectors @ np.asarray(vector, dtype=np.float32), k)
+
+    @staticmethod
+    def _best(ids: np.ndarray, scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        if k <= 0:
+            return ids[:0], scores[:0]
+
+        if len(ids) > k:
+            keep = np.argpartition(-scores, k - 1)[:k]
+            ids, scores = ids[keep], scores[keep]
+
+        # Best first; ties keep upload order
+        order = np.lexsort((ids, -scores))
+        return ids[order], scores[order]
+
+    def snapshot(self) -> Dict[str, np.ndarray]:
+        """
+        The arrays save() writes; later adds don't modify them, so they can
+        be written from another thread
+        """
+        return {
+            "vectors": self.vectors.copy(),
+            "centroids": self.centroids if self.centroids is not None else np.zeros((0, self.dim), dtype=np.float32),
+            "assignments": self.assignments,
+            "settings": np.array([self.dim, self.probes, self.min_train_size, self.seed, self.trained_size])
+        }
+
+    def save(self, path: str, snapshot: Optional[Dict[str, np.ndarray]] = None):
+        """Write the index to path (.npz), replacing any previous file atomically"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as f:
+            np.savez(f, **(snapshot or self.snapshot()))
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "SemanticIndex":
+        """Read an index written by save()"""
+        with np.load(path) as data:
+            dim, probes, min_train_size, seed, trained_size = data["settings"].tolist()
+            index = cls(dim, probes, min_train_size, seed)
+
+            index._vectors = data["vectors"]
+            index.size = len(index._vectors)
+            index.trained_size = trained_size
+
+            if len(data["centroids"]):
+                index.centroids = data["centroids"]
+                index.assignments = data["assignments"]
+                index.clusters = cls._clusters_of(index.assignments, len(index.centroids))
+
+        return index
+
+
+def _unit(vector: np.ndarray) -> np.ndarray:
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm > 0 else vector
@@ -94,8 +94,24 @@ class SimpleUploader:
                 )
                 response.raise_for_status()
                 result = response.json()
-                print(f"✅ Uploaded! Processed {result['total_resumes']} resumes")
-                return True
+
+            # The server extracts resumes in the background - wait for it
+            print("   Extracting resumes...")
+            while True:
+                response = requests.get(
+                    f"{API_BASE}/jobs/{self.job_id}/ingestions/{result['ingestion_id']}"
+                )
+                response.raise_for_status()
+                ingestion = response.json()
+
+                if ingestion['status'] == 'completed':
+                    print(f"✅ Uploaded! Processed {ingestion['total_resumes']} resumes")
+                    return True
+                elif ingestion['status'] == 'error':
+                    print(f"❌ Error: {ingestion['error']}")
+                    return False
+
+                time.sleep(1)
         except Exception as e:
             print(f"❌ Error: {e}")
             return False
@@ -0,0 +1,140 @@
+import os
+import re
+import hashlib
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "skills.txt")
+
+# A skill must not be glued to other word characters ("Go" in "good",
+# "Java" in "JavaScript"); "+" and "#" also count on the right so that
+# "C" never matches the start of "C++" or "C#".
+_LEFT_BOUNDARY = r"(?<![A-Za-z0-9_])"
+_RIGHT_BOUNDARY = r"(?![A-Za-z0-9_+#])"
+
+
+def _normalize(alias: str) -> str:
+    """Lowercase and collapse whitespace so aliases and matches compare equal"""
+    return " ".join(alias.lower().split())
+
+
+def _trie_pattern(node: Dict[str, dict]) -> str:
+    """Turn a character trie into a regex that shares common prefixes"""
+    ends_here = "" in node
+    branches = []
+
+    for char in sorted(k for k in node if k):
+        token = r"\s+" if char == " " else re.escape(char)
+        branches.append(token + _trie_pattern(node[char]))
+
+    if not branches:
+        return ""
+
+    if len(branches) == 1 and not ends_here:
+        return branches[0]
+
+    pattern = "(?:" + "|".join(branches) + ")"
+    return pattern + "?" if ends_here else pattern
+
+
+def load_taxonomy(path: str) -> List[Tuple[str, List[str]]]:
+    """Load (canonical name, aliases) pairs from a taxonomy file"""
+    taxonomy = []
+
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+
+            names = [name.strip() for name in line.split("|") if name.strip()]
+            taxonomy.append((names[0], names[1:]))
+
+    return taxonomy
+
+
+class SkillMatcher:
+    """
+    Single-pass skill matcher
+
+    All skill names and aliases are compiled into one regex built from a
+    character trie, so every skill in a text is found in one scan with
+    whole-word boundaries, regardless of the taxonomy size.
+    """
+
+    def __init__(self, taxonomy: List[Tuple[str, List[str]]]):
+        # Identifies the taxonomy, so results cached with another one are not reused
+        self.version = hashlib.sha1(repr(taxonomy).encode("utf-8")).hexdigest()[:12]
+        self.skills: List[str] = []
+        # Skill ids are positions in the taxonomy, so they are the same in
+        # every process that loads it; skill_keys holds their lowercased names
+        self.skill_keys: List[str] = []
+        self.key_ids: Dict[str, int] = {}
+        self._canonical: Dict[str, str] = {}
+        self._order: Dict[str, int] = {}
+
+        trie: Dict[str, dict] = {}
+
+        for canonical, aliases in taxonomy:
+            if canonical not in self._order:
+                self._order[canonical] = len(self.skills)
+                self.key_ids.setdefault(canonical.lower(), len(self.skills))
+                self.skills.append(canonical)
+                self.skill_keys.append(canonical.lower())
+
+            for alias in [canonical] + aliases:
+                key = _normalize(alias)
+                if not key or key in self._canonical:
+                    continue
+                self._canonical[key] = canonical
+
+                node = trie
+                for char in key:
+                    node = node.setdefault(char, {})
+                node[""] = {}
+
+        # The trie holds lowercased names; matching a lowercased text with a
+        # case-sensitive pattern is noticeably faster than re.IGNORECASE
+        self.pattern = re.compile(
+            _LEFT_BOUNDARY + "(" + _trie_pattern(trie) + ")" + _RIGHT_BOUNDARY
+        )
+
+    @classmethod
+    def from_file(cls, path: str) -> "SkillMatcher":
+        """Build a matcher from a taxonomy file"""
+        return cls(load_taxonomy(path))
+
+    def find_skills(self, text: str) -> List[str]:
+        """Return the canonical skills found in text, in taxonomy order"""
+        return self.find_skills_lower(text.lower())
+
+    def find_skills_lower(self, text_lower: str) -> List[str]:
+        """Same as find_skills, for text that is already lowercased"""
+        found = set()
+
+        for match in self.pattern.finditer(text_lower):
+            canonical = self._canonical.get(_normalize(match.group(1)))
+            if canonical:
+                found.add(canonical)
+
+        return sorted(found, key=self._order.__getitem__)
+
+    def skill_ids(self, skills: List[str]) -> List[int]:
+        """Ids of canonical skill names (as returned by find_skills), ascending"""
+        return sorted({self._order[skill] for skill in skills if skill in self._order})
+
+    def normalized_skills(self, skills: List[str], skill_ids: Optional[List[int]] = None) -> List[str]:
+        """
+        Lowercased skill names; with precomputed skill_ids the shared names
+        in skill_keys are reused instead of lowercasing each skill again
+        """
+        if skill_ids is not None:
+            return [self.skill_keys[skill_id] for skill_id in skill_ids]
+
+        return [skill.lower() for skill in skills]
+
+
+@lru_cache(maxsize=None)
+def get_skill_matcher(path: Optional[str] = None) -> SkillMatcher:
+    """Get the process-wide matcher, built once from the configured taxonomy"""
+    return SkillMatcher.from_file(path or os.getenv("SKILL_TAXONOMY_PATH", DEFAULT_TAXONOMY_PATH))
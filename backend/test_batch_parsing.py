@@ -0,0 +1,70 @@
+"""
+Check how verdicts in a batched Phase 2 response are matched to candidates
+
+A batched review asks the model to number its verdicts 1..N. Models
+sometimes count from 0, repeat a number or drop a candidate. Numbers are
+only trusted when they are exactly 1..N; otherwise a response with one
+verdict per candidate is matched by position, and anything else sends
+every candidate to a single review.
+
+Run directly:
+    python test_batch_parsing.py
+"""
+
+import json
+
+from phase2_shortlister import Phase2Shortlister
+
+
+def verdict(candidate, reasoning):
+    return {"candidate": candidate, "is_suitable": True, "confidence": 0.9, "reasoning": reasoning}
+
+
+def matched(entries, count=3):
+    """Reasoning of the verdict matched to each candidate, None where missing"""
+    shortlister = Phase2Shortlister("http://localhost:11434", "test-model")
+    verdicts = shortlister.parse_batch_response(json.dumps({"candidates": entries}), count)
+    return [entry["reasoning"] if entry else None for entry in verdicts]
+
+
+CASES = {
+    "numbered out of order": (
+        [verdict(3, "c"), verdict(1, "a"), verdict(2, "b")],
+        ["a", "b", "c"]
+    ),
+    "numbered from 0": (
+        [verdict(0, "a"), verdict(1, "b"), verdict(2, "c")],
+        ["a", "b", "c"]
+    ),
+    "duplicate numbers": (
+        [verdict(1, "a"), verdict(1, "b"), verdict(3, "c")],
+        ["a", "b", "c"]
+    ),
+    "partial numbering": (
+        [verdict(1, "a"), verdict(None, "b"), verdict(3, "c")],
+        ["a", "b", "c"]
+    ),
+    "missing candidate": (
+        [verdict(1, "a"), verdict(3, "c")],
+        [None, None, None]
+    ),
+    "duplicate and missing": (
+        [verdict(1, "a"), verdict(1, "b")],
+        [None, None, None]
+    ),
+}
+
+
+def test_numbers_are_trusted_only_when_they_are_one_to_n():
+    for name, (entries, expected) in CASES.items():
+        assert matched(entries) == expected, name
+
+
+if __name__ == "__main__":
+    failures = 0
+    for name, (entries, expected) in CASES.items():
+        result = matched(entries)
+        failures += result != expected
+        print(f"{'✅' if result == expected else '❌'} {name}: {result}")
+
+    print("✅ Batched verdicts matched correctly" if not failures else f"❌ {failures} case(s) mismatched")
@@ -0,0 +1,120 @@
+"""
+Check that /status stays responsive while a large PDF is being ingested
+
+Uploads a large bundle (the sample resumes replicated) through the app on
+the current event loop, then polls the job status endpoint while parsing
+runs in the ingestion pool and reports the status call latencies.
+
+Run directly:
+    python test_ingestion_latency.py --pages 1500
+"""
+
+import os
+import time
+import asyncio
+import argparse
+import tempfile
+import statistics
+
+import fitz  # PyMuPDF
+import httpx
+
+SAMPLE_PDF = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "full_stack_resumes.pdf")
+
+# Status calls must stay well under this while ingestion is running
+MAX_P95_LATENCY_MS = 100
+
+
+def build_bundle(path: str, pages: int) -> str:
+    """Replicate the sample resumes into a bundle of the given page count"""
+    with fitz.open(SAMPLE_PDF) as sample:
+        bundle = fitz.open()
+        while len(bundle) < pages:
+            bundle.insert_pdf(sample, to_page=min(len(sample), pages - len(bundle)) - 1)
+        bundle.save(path)
+        bundle.close()
+
+    return path
+
+
+async def measure_status_latency(pages: int) -> dict:
+    """Start an ingest and time /status calls until it finishes"""
+    work_dir = tempfile.mkdtemp()
+    os.environ["UPLOAD_DIR"] = os.path.join(work_dir, "uploads")
+    os.environ["RESUME_DIR"] = os.path.join(work_dir, "resumes")
+    os.environ["TEXT_STORE_PATH"] = os.path.join(work_dir, "resume_texts.dat")
+    # No parse or review cache: runs must not share results, nor leave ./cache behind
+    os.environ["PARSE_CACHE_PATH"] = ""
+    os.environ["REVIEW_CACHE_PATH"] = ""
+
+    import main
+
+    pdf_path = build_bundle(os.path.join(work_dir, "bundle.pdf"), pages)
+    transport = httpx.ASGITransport(app=main.app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+        job_id = (await client.post("/api/jobs/create", json={
+            "job_title": "Latency Test",
+            "description": "Large ingest",
+            "required_tech_stack": ["Python", "React"],
+            "minimum_experience": 0,
+            "hiring_slots": 1,
+            "phase1_shortlist_count": 5,
+            "phase2_shortlist_count": 1
+        })).json()["job_id"]
+
+        start = time.perf_counter()
+        with open(pdf_path, "rb") as f:
+            upload = await client.post(
+                f"/api/jobs/{job_id}/upload-resumes",
+                files={"file": ("bundle.pdf", f, "application/pdf")}
+            )
+        upload_ms = (time.perf_counter() - start) * 1000
+        ingestion_id = upload.json()["ingestion_id"]
+
+        latencies = []
+        while True:
+            start = time.perf_counter()
+            status = (await client.get(f"/api/jobs/{job_id}/status")).json()
+            latencies.append((time.perf_counter() - start) * 1000)
+
+            if not status["ingestions_in_progress"]:
+                break
+            await asyncio.sleep(0.01)
+
+        ingestion = (await client.get(f"/api/jobs/{job_id}/ingestions/{ingestion_id}")).json()
+
+    latencies.sort()
+    return {
+        "upload_status_code": upload.status_code,
+        "upload_ms": upload_ms,
+        "ingestion": ingestion,
+        "status_calls": len(latencies),
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] if len(latencies) > 1 else latencies[0],
+        "max_ms": latencies[-1]
+    }
+
+
+def test_status_stays_fast_during_ingestion():
+    result = asyncio.run(measure_status_latency(pages=800))
+
+    assert result["upload_status_code"] == 202
+    assert result["ingestion"]["status"] == "completed"
+    assert result["status_calls"] > 1
+    assert result["p95_ms"] < MAX_P95_LATENCY_MS, result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure /status latency during a large ingest")
+    parser.add_argument("--pages", type=int, default=1500, help="Pages in the generated bundle")
+    args = parser.parse_args()
+
+    result = asyncio.run(measure_status_latency(args.pages))
+    ingestion = result["ingestion"]
+
+    print(f"Upload returned HTTP {result['upload_status_code']} in {result['upload_ms']:.0f} ms")
+    print(f"Ingested {ingestion['pages_done']}/{ingestion['pages_total']} pages "
+          f"({ingestion['pages_per_second']} pages/sec), status: {ingestion['status']}")
+    print(f"{result['status_calls']} status calls during ingest: "
+          f"p50 {result['p50_ms']:.1f} ms, p95 {result['p95_ms']:.1f} ms, max {result['max_ms']:.1f} ms")
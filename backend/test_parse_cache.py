@@ -0,0 +1,82 @@
+"""
+Check that the parsed-resume cache tells apart pages that only differ in
+their resources
+
+Merge tools (and PyMuPDF's show_pdf_page) put each source page in a Form
+XObject, so every page of the bundle has the same content stream
+("/fzFrm0 Do"). A cache keyed on the content stream alone would serve the
+first page's resume for all of them on the next upload.
+
+Run directly:
+    python test_parse_cache.py
+"""
+
+import os
+import tempfile
+
+import fitz  # PyMuPDF
+
+from resume_cache import ParsedResumeCache
+from resume_parser import ResumeParser
+
+CANDIDATES = [
+    ("Alice Smith", "alice.smith@example.com", "Python, Django, PostgreSQL"),
+    ("Bob Jones", "bob.jones@example.com", "JavaScript, React, Node.js"),
+]
+
+
+def build_xobject_bundle(path: str) -> str:
+    """One page per candidate, each drawn into the bundle as a Form XObject"""
+    bundle = fitz.open()
+
+    for name, email, skills in CANDIDATES:
+        source = fitz.open()
+        page = source.new_page()
+        page.insert_text(
+            (72, 72),
+            f"{name}\n{email}\n5 years of experience\nTECHNICAL SKILLS\n{skills}",
+            fontsize=11
+        )
+
+        target = bundle.new_page(width=page.rect.width, height=page.rect.height)
+        target.show_pdf_page(target.rect, source, 0)
+        source.close()
+
+    bundle.save(path)
+    bundle.close()
+
+    return path
+
+
+def parse_twice(work_dir: str):
+    pdf_path = build_xobject_bundle(os.path.join(work_dir, "bundle.pdf"))
+    cache = ParsedResumeCache(os.path.join(work_dir, "parsed.sqlite"))
+    parser = ResumeParser(os.path.join(work_dir, "uploads"), os.path.join(work_dir, "resumes"), cache=cache)
+
+    with fitz.open(pdf_path) as doc:
+        keys = [parser.page_cache_key(page) for page in doc]
+
+    cold = [resume.name for resume in parser.extract_resumes_from_pdf(pdf_path)]
+    warm = [resume.name for resume in parser.extract_resumes_from_pdf(pdf_path)]
+
+    return keys, cold, warm
+
+
+def test_xobject_pages_get_their_own_cache_entries():
+    with tempfile.TemporaryDirectory() as work_dir:
+        keys, cold, warm = parse_twice(work_dir)
+
+    expected = [name for name, _, _ in CANDIDATES]
+    assert len(set(keys)) == len(keys), keys
+    assert cold == expected
+    assert warm == expected
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as work_dir:
+        keys, cold, warm = parse_twice(work_dir)
+
+    print(f"Page keys: {len(set(keys))} distinct of {len(keys)}")
+    print(f"Cold: {', '.join(cold)}")
+    print(f"Warm: {', '.join(warm)}")
+    print("✅ Cached pages keep their own resumes" if cold == warm else "❌ Cache served the wrong resumes")
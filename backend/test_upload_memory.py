@@ -0,0 +1,262 @@
+"""
+Check that resume uploads are streamed to disk with bounded memory
+
+Generates a large PDF (sample resume pages plus a big incompressible
+attachment), streams it into the FastAPI app in a fresh process and
+reports how much the peak RSS grew during the upload. The request body is
+fed to the app chunk by chunk, so only server-side memory is measured.
+Also checks that an upload over MAX_UPLOAD_SIZE_MB is refused before the
+app reads its body.
+
+Run directly:
+    python test_upload_memory.py --size-mb 400
+"""
+
+import os
+import sys
+import json
+import uuid
+import asyncio
+import argparse
+import resource
+import subprocess
+import tempfile
+from typing import Optional
+
+import fitz  # PyMuPDF
+
+SAMPLE_PDF = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "full_stack_resumes.pdf")
+
+# Peak RSS may grow by this much at most, whatever the upload size
+MAX_RSS_GROWTH_MB = 64
+
+
+def build_large_pdf(path: str, size_mb: int) -> str:
+    """Write the sample resumes plus a random attachment of about size_mb"""
+    with fitz.open(SAMPLE_PDF) as sample:
+        doc = fitz.open()
+        doc.insert_pdf(sample)
+        doc.embfile_add("padding.bin", os.urandom(size_mb * 1024 * 1024))
+        doc.save(path)
+        doc.close()
+
+    return path
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process (ru_maxrss is in KB on Linux)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def stream_multipart_upload(
+    app,
+    path: str,
+    pdf_path: str,
+    chunk_size: int = 1024 * 1024,
+    send_length: bool = True,
+    progress: Optional[dict] = None
+) -> int:
+    """
+    POST pdf_path as multipart/form-data straight into the ASGI app, chunk
+    by chunk; progress["bytes_read"] counts the body bytes the app read
+    """
+    boundary = uuid.uuid4().hex
+    head = (
+        f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="large.pdf"\r\n'
+        f'Content-Type: application/pdf\r\n\r\n'
+    ).encode()
+    tail = f'\r\n--{boundary}--\r\n'.encode()
+    content_length = len(head) + os.path.getsize(pdf_path) + len(tail)
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [
+            (b"host", b"testserver"),
+            (b"content-type", f"multipart/form-data; boundary={boundary}".encode()),
+        ] + ([(b"content-length", str(content_length).encode())] if send_length else []),
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+
+    def body_chunks():
+        yield head
+        with open(pdf_path, "rb") as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        yield tail
+
+    chunks = body_chunks()
+    pending = next(chunks)
+    status = {}
+    progress = progress if progress is not None else {}
+    progress["bytes_read"] = 0
+
+    async def receive():
+        nonlocal pending
+        if pending is None:
+            return {"type": "http.disconnect"}
+        body, pending = pending, next(chunks, None)
+        progress["bytes_read"] += len(body)
+        return {"type": "http.request", "body": body, "more_body": pending is not None}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status["code"] = message["status"]
+
+    await app(scope, receive, send)
+    return status.get("code", 0)
+
+
+def upload_in_this_process(pdf_path: str) -> dict:
+    """Upload pdf_path through the app and report peak RSS before and after"""
+    work_dir = tempfile.mkdtemp()
+    os.environ["UPLOAD_DIR"] = os.path.join(work_dir, "uploads")
+    os.environ["RESUME_DIR"] = os.path.join(work_dir, "resumes")
+    os.environ["TEXT_STORE_PATH"] = os.path.join(work_dir, "resume_texts.dat")
+    # No parse or review cache: runs must not share results, nor leave ./cache behind
+    os.environ["PARSE_CACHE_PATH"] = ""
+    os.environ["REVIEW_CACHE_PATH"] = ""
+    os.environ.setdefault("MAX_UPLOAD_SIZE_MB", "2048")
+
+    from fastapi.testclient import TestClient
+    import main
+
+    client = TestClient(main.app)
+    job_id = client.post("/api/jobs/create", json={
+        "job_title": "Memory Test",
+        "description": "Large upload",
+        "required_tech_stack": ["Python"],
+        "minimum_experience": 0,
+        "hiring_slots": 1,
+        "phase1_shortlist_count": 1,
+        "phase2_shortlist_count": 1
+    }).json()["job_id"]
+
+    before = peak_rss_mb()
+    status_code = asyncio.run(
+        stream_multipart_upload(main.app, f"/api/jobs/{job_id}/upload-resumes", pdf_path)
+    )
+    after = peak_rss_mb()
+
+    return {
+        "status_code": status_code,
+        "file_mb": os.path.getsize(pdf_path) / (1024 * 1024),
+        "peak_rss_before_mb": before,
+        "peak_rss_after_mb": after,
+        "peak_rss_growth_mb": after - before
+    }
+
+
+def reject_in_this_process(pdf_path: str) -> dict:
+    """Upload pdf_path with a 1 MB limit, with and without a Content-Length"""
+    work_dir = tempfile.mkdtemp()
+    os.environ["UPLOAD_DIR"] = os.path.join(work_dir, "uploads")
+    os.environ["RESUME_DIR"] = os.path.join(work_dir, "resumes")
+    os.environ["TEXT_STORE_PATH"] = os.path.join(work_dir, "resume_texts.dat")
+    # No parse or review cache: runs must not share results, nor leave ./cache behind
+    os.environ["PARSE_CACHE_PATH"] = ""
+    os.environ["REVIEW_CACHE_PATH"] = ""
+    os.environ["MAX_UPLOAD_SIZE_MB"] = "1"
+
+    from fastapi.testclient import TestClient
+    import main
+
+    client = TestClient(main.app)
+    job_id = client.post("/api/jobs/create", json={
+        "job_title": "Limit Test",
+        "description": "Oversized upload",
+        "required_tech_stack": ["Python"],
+        "minimum_experience": 0,
+        "hiring_slots": 1,
+        "phase1_shortlist_count": 1,
+        "phase2_shortlist_count": 1
+    }).json()["job_id"]
+
+    result = {}
+    for label, send_length in (("with_length", True), ("chunked", False)):
+        progress = {}
+        status_code = asyncio.run(stream_multipart_upload(
+            main.app, f"/api/jobs/{job_id}/upload-resumes", pdf_path, send_length=send_length, progress=progress
+        ))
+        result[label] = {"status_code": status_code, "mb_read": progress["bytes_read"] / (1024 * 1024)}
+
+    result["uploads_left"] = os.listdir(os.environ["UPLOAD_DIR"])
+    return result
+
+
+def measure_upload(size_mb: int, mode: str = "--child") -> dict:
+    """Build a PDF and upload it, each in a fresh interpreter so peak RSS is not shared"""
+    script = os.path.abspath(__file__)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = os.path.join(tmp, "large.pdf")
+        subprocess.run([sys.executable, script, "--build", pdf_path, "--size-mb", str(size_mb)], check=True)
+        output = subprocess.run(
+            [sys.executable, script, mode, pdf_path],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(script)
+        ).stdout
+
+    # Background ingestion may log after the result line
+    result_line = [line for line in output.splitlines() if line.startswith("{")][-1]
+    return json.loads(result_line)
+
+
+def test_upload_memory_is_bounded():
+    result = measure_upload(size_mb=150)
+
+    assert result["status_code"] == 202
+    assert result["peak_rss_growth_mb"] < MAX_RSS_GROWTH_MB, result
+
+
+def test_oversized_upload_is_rejected_before_it_is_read():
+    result = measure_upload(size_mb=20, mode="--reject")
+
+    # Over the limit by Content-Length: nothing is read
+    assert result["with_length"] == {"status_code": 413, "mb_read": 0}, result
+    # No Content-Length: reading stops once the limit is passed
+    assert result["chunked"]["status_code"] == 413, result
+    assert result["chunked"]["mb_read"] < 4, result
+    assert result["uploads_left"] == [], result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure peak RSS of a large upload")
+    parser.add_argument("--size-mb", type=int, default=400, help="Size of the generated PDF")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--reject", help=argparse.SUPPRESS)
+    parser.add_argument("--build", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.build:
+        build_large_pdf(args.build, args.size_mb)
+        sys.exit(0)
+
+    if args.child:
+        print(json.dumps(upload_in_this_process(args.child)))
+        sys.exit(0)
+
+    if args.reject:
+        print(json.dumps(reject_in_this_process(args.reject)))
+        sys.exit(0)
+
+    result = measure_upload(args.size_mb)
+    print(f"Uploaded {result['file_mb']:.0f} MB PDF -> HTTP {result['status_code']}")
+    print(f"Peak RSS: {result['peak_rss_before_mb']:.0f} MB -> {result['peak_rss_after_mb']:.0f} MB "
+          f"(+{result['peak_rss_growth_mb']:.0f} MB)")
+
+    if result["peak_rss_growth_mb"] < MAX_RSS_GROWTH_MB:
+        print("✅ Upload memory stays bounded")
+    else:
+        print(f"❌ Peak RSS grew by more than {MAX_RSS_GROWTH_MB} MB")
@@ -0,0 +1,81 @@
+import os
+import threading
+from typing import Optional, Tuple
+
+
+class ResumeTextStore:
+    """
+    Append-only on-disk store for resume page text
+
+    Resumes keep a small text_ref handle ("<offset>:<length>" in bytes)
+    instead of their full text, which keeps the text off the Python heap.
+    Text is read back lazily, only by the code paths that need it.
+    """
+
+    def __init__(self, path: str, truncate: bool = False):
+        self.path = path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._file = open(path, "w+b" if truncate else "a+b")
+        self._file.seek(0, os.SEEK_END)
+        self._size = self._file.tell()
+
+    def append(self, text: str) -> str:
+        """Store text and return its handle"""
+        data = text.encode("utf-8")
+
+        with self._lock:
+            offset = self._size
+            self._file.seek(offset)
+            self._file.write(data)
+            self._file.flush()
+            self._size += len(data)
+
+        return f"{offset}:{len(data)}"
+
+    @staticmethod
+    def _parse_ref(text_ref: str) -> Tuple[int, int]:
+        offset, _, length = text_ref.partition(":")
+        return int(offset), int(length)
+
+    def read(self, text_ref: str, max_chars: Optional[int] = None) -> str:
+        """Load the text behind a handle, optionally only its first max_chars"""
+        offset, length = self._parse_ref(text_ref)
+
+        # A UTF-8 character is at most 4 bytes
+        if max_chars is not None:
+            length = min(length, max_chars * 4)
+
+        with self._lock:
+            self._file.seek(offset)
+            data = self._file.read(length)
+
+        text = data.decode("utf-8", errors="ignore")
+        return text[:max_chars] if max_chars is not None else text
+
+    def get_text(self, resume, max_chars: Optional[int] = None) -> str:
+        """Text of a Resume (or resume dict), whether it is inline or stored here"""
+        if isinstance(resume, dict):
+            text_content, text_ref = resume.get("text_content"), resume.get("text_ref")
+        else:
+            text_content, text_ref = resume.text_content, resume.text_ref
+
+        if text_content is not None:
+            return text_content[:max_chars] if max_chars is not None else text_content
+
+        if text_ref:
+            return self.read(text_ref, max_chars)
+
+        return ""
+
+    @property
+    def size(self) -> int:
+        """Bytes of text stored"""
+        return self._size
+
+    def close(self):
+        self._file.close()
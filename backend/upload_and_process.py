@@ -78,12 +78,69 @@ class ResumeProcessor:
                 )
                 response.raise_for_status()
                 result = response.json()
-                print(f"✅ Uploaded and processed {result['total_resumes']} resumes!")
-                return True
+
+            return self.wait_for_ingestion(result['ingestion_id'])
         except Exception as e:
             print(f"❌ Error uploading resumes: {e}")
             return False
 
+    def upload_batch(self, paths):
+        """Upload several PDFs (or ZIPs of PDFs) in a single request"""
+        print(f"\n📤 Uploading {len(paths)} files in one batch...")
+
+        handles = []
+        try:
+            files = []
+            for path in paths:
+                f = open(path, 'rb')
+                handles.append(f)
+                content_type = 'application/zip' if path.lower().endswith('.zip') else 'application/pdf'
+                files.append(('files', (os.path.basename(path), f, content_type)))
+
+            response = requests.post(
+                f"{self.api_base}/jobs/{self.job_id}/upload-resumes/batch",
+                files=files
+            )
+            response.raise_for_status()
+            result = response.json()
+        except Exception as e:
+            print(f"❌ Error uploading resumes: {e}")
+            return False
+        finally:
+            for f in handles:
+                f.close()
+
+        if not self.wait_for_ingestion(result['ingestion_id']):
+            return False
+
+        # Per-file breakdown
+        response = requests.get(f"{self.api_base}/jobs/{self.job_id}/ingestions/{result['ingestion_id']}")
+        for entry in response.json().get('files', []):
+            marker = '✅' if entry['status'] == 'completed' else '❌'
+            print(f"   {marker} {entry['filename']}: {entry['pages_total']} pages, "
+                  f"{entry['resumes']} resumes in {entry['seconds']:.2f}s")
+        return True
+
+    def wait_for_ingestion(self, ingestion_id):
+        """Wait until the server has extracted the resumes from an upload"""
+        print("   Extracting resumes...")
+
+        while True:
+            response = requests.get(f"{self.api_base}/jobs/{self.job_id}/ingestions/{ingestion_id}")
+            response.raise_for_status()
+            ingestion = response.json()
+
+            if ingestion['status'] == 'completed':
+                print(f"✅ Uploaded and processed {ingestion['resumes_added']} resumes "
+                      f"({ingestion['total_resumes']} total)!")
+                return True
+            elif ingestion['status'] == 'error':
+                print(f"❌ Error extracting resumes: {ingestion['error']}")
+                return False
+
+            print(f"   Pages: {ingestion['pages_done']}/{ingestion['pages_total']}", end='\r')
+            time.sleep(1)
+
     def start_shortlisting(self):
         """Start the shortlisting process"""
         print("\n🚀 Starting shortlisting process...")
@@ -270,13 +327,16 @@ Examples:
     
     # Quick mode with defaults
     python upload_and_process.py --pdf "resumes.pdf"
+
+    # Several PDFs and/or ZIP archives in one batch
+    python upload_and_process.py --pdf "batch1.pdf" "batch2.pdf" "more_resumes.zip"
         """
     )
 
     parser.add_argument('--interactive', '-i', action='store_true',
                       help='Run in interactive mode')
-    parser.add_argument('--pdf', type=str,
-                      help='Path to PDF file containing resumes')
+    parser.add_argument('--pdf', type=str, nargs='+',
+                      help='Path(s) to PDF files (or ZIPs of PDFs) containing resumes')
     parser.add_argument('--job-title', type=str, default='Software Engineer',
                       help='Job title (default: Software Engineer)')
     parser.add_argument('--description', type=str, default='',
@@ -312,7 +372,7 @@ Examples:
         config = interactive_mode()
         if not config:
             return 1
-        pdf_path = config['pdf_path']
+        pdf_paths = [config['pdf_path']]
         job_data = config['job_data']
     else:
         if not args.pdf:
@@ -320,24 +380,28 @@ Examples:
             parser.print_help()
             return 1
 
-        # Check PDF path
-        pdf_path = None
-        locations_to_check = [
-            args.pdf,
-            os.path.join("data", args.pdf),
-            os.path.join("..", "data", args.pdf),
-            os.path.join("backend", "data", args.pdf),
-        ]
-
-        for location in locations_to_check:
-            if os.path.exists(location):
-                pdf_path = location
-                break
-
-        if not pdf_path:
-            print(f"\n❌ PDF file not found: {args.pdf}")
-            print(f"   Tried locations: {locations_to_check}")
-            return 1
+        # Check PDF paths
+        pdf_paths = []
+        for pdf in args.pdf:
+            pdf_path = None
+            locations_to_check = [
+                pdf,
+                os.path.join("data", pdf),
+                os.path.join("..", "data", pdf),
+                os.path.join("backend", "data", pdf),
+            ]
+
+            for location in locations_to_check:
+                if os.path.exists(location):
+                    pdf_path = location
+                    break
+
+            if not pdf_path:
+                print(f"\n❌ PDF file not found: {pdf}")
+                print(f"   Tried locations: {locations_to_check}")
+                return 1
+
+            pdf_paths.append(pdf_path)
 
         job_data = {
             'job_title': args.job_title,
@@ -359,7 +423,12 @@ Examples:
         return 1
 
     # Step 2: Upload resumes
-    if not processor.upload_resumes(pdf_path):
+    if len(pdf_paths) == 1 and not pdf_paths[0].lower().endswith('.zip'):
+        uploaded = processor.upload_resumes(pdf_paths[0])
+    else:
+        uploaded = processor.upload_batch(pdf_paths)
+
+    if not uploaded:
         return 1
 
     # Step 3: Start shortlisting
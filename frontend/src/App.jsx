@@ -113,7 +113,23 @@ function App() {
   const handleResumeUpload = async (file) => {
     try {
       setMessage({ text: '⏳ Uploading and processing PDF...', type: 'info' });
-      const result = await api.uploadResumes(currentJobId, file);
+      const upload = await api.uploadResumes(currentJobId, file);
+
+      // Resumes are extracted in the background - poll until done
+      let result = await api.getIngestion(currentJobId, upload.ingestion_id);
+      while (result.status === 'queued' || result.status === 'running') {
+        setMessage({
+          text: `⏳ Extracting resumes... ${result.pages_done}/${result.pages_total} pages`,
+          type: 'info'
+        });
+        await new Promise((resolve) => setTimeout(resolve, 1000));
+        result = await api.getIngestion(currentJobId, upload.ingestion_id);
+      }
+
+      if (result.status === 'error') {
+        throw new Error(result.error);
+      }
+
       setMessage({
         text: `✅ Successfully uploaded! Processed ${result.total_resumes} resumes from PDF.`,
         type: 'success'
@@ -26,6 +26,12 @@ export const api = {
     return response.data;
   },
 
+  // Get the progress of a resume upload
+  getIngestion: async (jobId, ingestionId) => {
+    const response = await axios.get(`${API_BASE_URL}/jobs/${jobId}/ingestions/${ingestionId}`);
+    return response.data;
+  },
+
   // Start the shortlisting process
   startShortlisting: async (jobId) => {
     const response = await axios.post(`${API_BASE_URL}/jobs/${jobId}/start-shortlisting`);